@@ -0,0 +1,47 @@
+from pricing import FEE_RATE
+from order_db import get_ticker_stats
+
+STATS_COLUMNS = [
+    "ticker",
+    "placed_count",
+    "filled_count",
+    "cancelled_count",
+    "buy_volume",
+    "buy_notional",
+    "sell_volume",
+    "sell_notional",
+    "fill_seconds",
+    "updated_at",
+]
+
+
+def summarize(stats_row, fee_rate=FEE_RATE):
+    """ticker_stats 한 행으로 체결률, 평균 체결 시간, 실현 손익을 계산합니다.
+
+    실현 손익은 매도/매수 중 적은 체결 수량만큼을 평균 매도가와 평균 매수가의
+    차이로 계산하고, 전체 체결 금액의 수수료를 뺀 값입니다.
+    """
+    stats = dict(zip(STATS_COLUMNS, stats_row))
+    placed, filled = stats["placed_count"], stats["filled_count"]
+    buy_volume, sell_volume = stats["buy_volume"], stats["sell_volume"]
+    avg_buy = stats["buy_notional"] / buy_volume if buy_volume else 0.0
+    avg_sell = stats["sell_notional"] / sell_volume if sell_volume else 0.0
+    matched = min(buy_volume, sell_volume)
+    fees = (stats["buy_notional"] + stats["sell_notional"]) * fee_rate
+    return {
+        "ticker": stats["ticker"],
+        "placed": placed,
+        "filled": filled,
+        "cancelled": stats["cancelled_count"],
+        "fill_rate": filled / placed if placed else 0.0,
+        "avg_fill_minutes": stats["fill_seconds"] / filled / 60 if filled else 0.0,
+        "avg_buy_price": avg_buy,
+        "avg_sell_price": avg_sell,
+        "realized_pnl": matched * (avg_sell - avg_buy) - fees,
+        "updated_at": stats["updated_at"],
+    }
+
+
+def load_ticker_summary(fee_rate=FEE_RATE):
+    """누적 집계 테이블만 읽어 티커별 요약을 반환합니다 (주문 이력 크기와 무관)."""
+    return [summarize(row, fee_rate) for row in get_ticker_stats()]
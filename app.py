@@ -3,18 +3,34 @@ import time
 import threading
 import queue
 import pandas as pd
-import traceback
+import requests
 from dotenv import load_dotenv
-import pyupbit
 
-from utils.common_utils import get_env
+from utils.common_utils import get_env, load_config
+from utils.log_buffer import LEVELS, LogBuffer
+from utils.metrics import REGISTRY
 from upbit_api import UpbitAPI
+from daemon_client import DaemonClient
+from market_data import POLL_INTERVAL, MarketDataHub
+from events import Event, EventLog, fan_out
+from utils.rate_limiter import PRIORITY_UI
 from order_db import (
+    count_orders,
+    get_order_tickers,
+    get_orders_page,
+    get_orders_version,
     init_order_db,
-    save_order,
-    get_recent_orders,
-    get_pending_orders,
-    update_order_status,
+)
+from analytics import load_ticker_summary
+from planner import plan_rebalance
+from pricing import PRICING_ATR, PRICING_FIXED, PRICING_MODES
+from rebalance_engine import (
+    INTENT_GRACE_SECONDS,
+    RebalanceConfig,
+    RebalanceEngine,
+    place_rebalance_pair,
+    reconcile_intents,
+    sync_pending_orders,
 )
 
 # ==============================================================================
@@ -23,6 +39,32 @@ from order_db import (
 REBALANCE_RATIO_OPTIONS = [5, 10, 15, 20]
 REBALANCE_PRICE_OPTIONS = [3, 5, 10, 15, 20]
 TERM_MIN, TERM_MAX, TERM_DEFAULT = 1, 24, 1
+LOG_DISPLAY_OPTIONS = [200, 1000, 5000]
+ORDER_PAGE_SIZE_OPTIONS = [20, 50, 100]
+ORDER_STATUS_OPTIONS = ["requested", "wait", "done", "cancel"]
+ALL_OPTION = "전체"
+AUTO_REFRESH_SECONDS = 5
+# 첫 잔고/현재가를 기다리는 동안의 갱신 주기(초)
+LOADING_REFRESH_SECONDS = 1
+PRESET_LIMIT = 5
+PRESET_CACHE_SECONDS = 60
+# 잔고/티커 목록 스냅샷이 이 시간(초)보다 오래되면 화면을 그린 뒤 백그라운드에서 갱신
+ACCOUNT_REFRESH_SECONDS = 10
+LOADING_TEXT = "불러오는 중..."
+PRICING_LABELS = {PRICING_FIXED: "고정 비율", PRICING_ATR: "ATR (변동성)"}
+ORDER_HISTORY_COLUMNS = ["티커", "타입", "UUID", "가격", "수량", "상태", "생성시각"]
+ANALYTICS_COLUMNS = {
+    "ticker": "티커",
+    "placed": "주문 수",
+    "filled": "체결 수",
+    "cancelled": "취소 수",
+    "fill_rate": "체결률",
+    "avg_fill_minutes": "평균 체결 시간(분)",
+    "avg_buy_price": "평균 매수가",
+    "avg_sell_price": "평균 매도가",
+    "realized_pnl": "실현 손익(KRW)",
+    "updated_at": "갱신 시각",
+}
 
 
 # ==============================================================================
@@ -40,12 +82,18 @@ class AppState:
             "log_queue": queue.Queue(),
             "rebalance_thread": None,
             "stop_event": threading.Event(),
-            "orders": [],
-            "orders_refresh_needed": True,
+            "order_view": None,
+            "sync_job": None,
+            "live_key": None,
         }
         for key, value in defaults.items():
             if key not in st.session_state:
                 st.session_state[key] = value
+        if "log_buffer" not in st.session_state:
+            config = get_app_config()
+            st.session_state.log_buffer = LogBuffer(
+                config["log_buffer_capacity"], config["log_spill_path"]
+            )
 
     @property
     def tickers(self):
@@ -96,20 +144,37 @@ class AppState:
         return st.session_state.stop_event
 
     @property
-    def orders(self):
-        return st.session_state.orders
+    def live_key(self):
+        """자동 갱신 중 전체 화면을 다시 그릴지 판단하는 (변경 번호, 실행 상태) 값"""
+        return st.session_state.live_key
+
+    @live_key.setter
+    def live_key(self, value):
+        st.session_state.live_key = value
+
+    @property
+    def order_view(self):
+        """마지막으로 그린 주문 이력 (조회 조건/변경 번호 key, DataFrame, 전체 건수)"""
+        return st.session_state.order_view
 
-    @orders.setter
-    def orders(self, value):
-        st.session_state.orders = value
+    @order_view.setter
+    def order_view(self, value):
+        st.session_state.order_view = value
 
     @property
-    def orders_refresh_needed(self):
-        return st.session_state.orders_refresh_needed
+    def sync_job(self):
+        return st.session_state.sync_job
+
+    @sync_job.setter
+    def sync_job(self, value):
+        st.session_state.sync_job = value
 
-    @orders_refresh_needed.setter
-    def orders_refresh_needed(self, value: bool):
-        st.session_state.orders_refresh_needed = value
+    def is_sync_running(self):
+        return bool(self.sync_job and self.sync_job.is_running())
+
+    @property
+    def log_buffer(self) -> LogBuffer:
+        return st.session_state.log_buffer
 
     def is_thread_alive(self):
         return bool(self.rebalance_thread and self.rebalance_thread.is_alive())
@@ -121,6 +186,12 @@ class AppState:
 # ==============================================================================
 # API 및 DB 초기화 (API & DB Initialization)
 # ==============================================================================
+@st.cache_resource
+def get_app_config():
+    """config.yaml 설정을 읽어 캐시합니다."""
+    return load_config()
+
+
 @st.cache_resource
 def get_upbit_api():
     """UpbitAPI 인스턴스를 생성하고 캐시합니다."""
@@ -130,81 +201,149 @@ def get_upbit_api():
     if not access_key or not secret_key:
         st.error("Upbit API 키가 설정되지 않았습니다. .env 파일을 확인하세요.")
         st.stop()
+    # async_api 가 켜져 있으면 aiohttp 연결 풀을 쓰는 동기 어댑터를 사용
+    if get_app_config().get("async_api"):
+        # aiohttp 는 가져오는 데 시간이 걸리므로 설정된 경우에만 import
+        from async_upbit_api import SyncUpbitAPI
+
+        return SyncUpbitAPI(access_key, secret_key)
     return UpbitAPI(access_key, secret_key)
 
 
+@st.cache_resource
+def get_account_view():
+    """모든 세션이 공유하는 잔고/티커 목록 스냅샷을 생성하고 캐시합니다."""
+    return AccountView(get_upbit_api(), log=get_event_log().append)
+
+
+@st.cache_resource
+def get_market_data():
+    """모든 세션과 리밸런싱 스레드가 공유하는 현재가 허브를 시작하고 캐시합니다."""
+    interval = get_app_config().get("market_data_interval", POLL_INTERVAL)
+    return MarketDataHub(
+        get_upbit_api().fetch_current_prices, interval, log=get_event_log().append
+    ).start()
+
+
+@st.cache_resource
+def get_daemon_client():
+    """config.yaml 에 데몬 주소가 설정되어 있으면 DaemonClient 를 생성하고 캐시합니다."""
+    url = get_app_config().get("daemon", {}).get("url")
+    return DaemonClient(url) if url else None
+
+
+@st.cache_resource
+def get_event_log():
+    """리밸런싱 이벤트를 기록하는 EventLog 를 생성하고 캐시합니다."""
+    return EventLog(get_app_config()["event_log_path"])
+
+
+@st.cache_data(ttl=PRESET_CACHE_SECONDS)
+def get_presets(ticker):
+    """optimizer.py 가 저장한 티커의 상위 설정을 읽어 캐시합니다."""
+    # 백테스트 모듈(pandas, 프로세스 풀)은 프리셋을 처음 읽을 때 import
+    from optimizer import DEFAULT_CONFIG, load_presets
+
+    db_path = (
+        get_app_config().get("optimizer", {}).get("db_path", DEFAULT_CONFIG["db_path"])
+    )
+    return load_presets(db_path, ticker, PRESET_LIMIT)
+
+
+@st.cache_resource
 def initialize_app():
-    """앱 처음 실행 시 필요한 DB 등을 초기화합니다."""
+    """프로세스에서 처음 실행할 때 한 번만 DB 스키마 등을 초기화합니다."""
     init_order_db()
 
 
 # ==============================================================================
 # 비즈니스 로직 (Business Logic)
 # ==============================================================================
-def sync_all_pending_orders(api: UpbitAPI, state: AppState):
-    """DB의 모든 미체결 주문 상태를 Upbit과 동기화합니다."""
-    pending_orders = get_pending_orders()
-    state.log(f"[주문 동기화] 미체결 주문 {len(pending_orders)}건 상태 확인 시작")
-    changed = False
-    for order in pending_orders:
-        try:
-            uuid = order[2]
-            if not uuid or not isinstance(uuid, str):
-                state.log(f"[경고] 유효하지 않은 UUID: {order}")
-                continue
-
-            status = api.check_order_status(uuid)
-            state.log(f"[주문 상태 갱신] UUID: {uuid}, 상태: {status}")
-            if status != order[5]:  # 상태가 변경된 경우
-                update_order_status(uuid, status)
-                changed = True
-        except Exception as e:
-            state.log(f"[오류] 주문 상태 동기화 실패: {e}, 주문: {order}")
-            state.log(traceback.format_exc())
-    return changed
+class BackgroundSync:
+    """주문 상태 동기화를 화면 스레드와 분리해 실행하고 진행률을 보관하는 작업"""
 
+    def __init__(self, api: UpbitAPI, log, reconcile=False):
+        self.done = 0
+        self.total = 0
+        self.reconcile = reconcile
+        self._thread = threading.Thread(target=self._run, args=(api, log), daemon=True)
 
-def place_new_orders(api: UpbitAPI, state: AppState, ticker, ratio, price_ratio):
-    """새로운 리밸런싱 매수/매도 주문을 제출합니다."""
-    try:
-        current_price = pyupbit.get_current_price(ticker)
-        state.log(f"[{ticker}] 현재가: {current_price}")
-        balance = api.get_balance(ticker)
-        state.log(f"[{ticker}] 보유 수량: {balance}")
+    def start(self):
+        self._thread.start()
+        return self
 
-        amount = round(balance * ratio, 8)
-        state.log(f"[{ticker}] 주문 수량: {amount}")
+    def _run(self, api, log):
+        # 첫 동기화 전에는 기록되지 못한 주문 의도부터 복구하되, 다른 세션/엔진이
+        # 아직 제출 중일 수 있는 최근 의도는 유예 시간이 지날 때까지 남겨 둠
+        if self.reconcile:
+            reconcile_intents(api, log, INTENT_GRACE_SECONDS)
+        sync_pending_orders(api, log, progress=self._update)
 
-        order_info = api.rebalancing_orders(ticker, current_price, amount, price_ratio)
+    def _update(self, done, total):
+        self.done, self.total = done, total
 
-        if not (
-            order_info and order_info.get("sell_uuid") and order_info.get("buy_uuid")
-        ):
-            state.log(
-                "[오류] 주문 정보가 비어있거나 UUID가 없습니다. 주문 저장을 건너뜁니다."
-            )
-            state.log(f"[진단] 전체 주문 정보: {order_info}")
-            state.log(
-                f"[진단] 주문 수량: {amount}, 최소 주문 금액: {current_price * amount}"
-            )
+    def is_running(self):
+        return self._thread.is_alive()
+
+    @property
+    def fraction(self):
+        return self.done / self.total if self.total else 0.0
+
+
+class AccountView:
+    """잔고와 티커 목록의 마지막 조회 결과를 보관하고 백그라운드에서 갱신하는 스냅샷
+
+    화면은 항상 마지막 값으로 바로 그리고, 값이 오래되었으면 갱신만 요청합니다.
+    아직 한 번도 조회하지 못했으면 balances/tickers 는 None 입니다.
+    조회 오류는 log 에 account_refresh_failed 이벤트로 남깁니다.
+    """
+
+    def __init__(self, api: UpbitAPI, max_age=ACCOUNT_REFRESH_SECONDS, log=None):
+        self.api = api
+        self.max_age = max_age
+        self.log = log or (lambda event: None)
+        self.balances = None
+        self.tickers = None
+        self.version = 0
+        self._updated_at = float("-inf")
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def refresh_async(self, force=False):
+        with self._lock:
+            if self.is_loading():
+                return
+            if not force and time.monotonic() - self._updated_at < self.max_age:
+                return
+            self._thread = threading.Thread(target=self._refresh, daemon=True)
+            self._thread.start()
+
+    def _refresh(self):
+        try:
+            with self.api.request_priority(PRIORITY_UI):
+                tickers = self.tickers or self.api.get_tickers()
+                balances = self.api.get_balances_by_currency()
+        except Exception as e:
+            self.log(Event("account_refresh_failed", exc=e))
             return
+        finally:
+            self._updated_at = time.monotonic()
+        self.tickers, self.balances = tickers, balances
+        self.version += 1
+
+    def is_loading(self):
+        return bool(self._thread and self._thread.is_alive())
 
-        # 주문 정보 DB에 저장
-        for side in ["sell", "buy"]:
-            save_order(
-                ticker=ticker,
-                order_type=side,
-                uuid=order_info[f"{side}_uuid"],
-                price=float(order_info[f"{side}_price"]),
-                amount=float(amount),
-                status="requested",
-            )
-        state.log(f"[매도 주문] 가격: {order_info['sell_price']:.2f}, 수량: {amount}")
-        state.log(f"[매수 주문] 가격: {order_info['buy_price']:.2f}, 수량: {amount}")
 
+def place_new_orders(api: UpbitAPI, state: AppState, ticker, ratio, price_ratio):
+    """새로운 리밸런싱 매수/매도 주문을 제출합니다."""
+    try:
+        current_price = get_market_data().get_current_price(ticker)
+        balance = api.get_balance(ticker)
+        config = RebalanceConfig(ticker, ratio, price_ratio, TERM_DEFAULT)
+        place_rebalance_pair(api, state.log, config, current_price, balance)
     except Exception as e:
-        state.log(f"[오류] 신규 주문 발주 중 예외 발생: {e}")
-        state.log(traceback.format_exc())
+        state.log(Event("order_error", ticker, exc=e))
 
 
 def rebalance_loop(
@@ -215,87 +354,22 @@ def rebalance_loop(
     ratio,
     price_ratio,
     term_hour,
+    use_stream=False,
+    pricing=PRICING_FIXED,
 ):
-    """리밸런싱 로직을 주기적으로 실행하는 메인 루프 (Thread-safe 객체만 사용)"""
-    log_queue.put("[리밸런싱 루프 시작]")
-    while not stop_event.is_set():
-        try:
-            # 주문 동기화
-            pending_orders = get_pending_orders()
-            log_queue.put(
-                f"[주문 동기화] 미체결 주문 {len(pending_orders)}건 상태 확인 시작"
-            )
-            for order in pending_orders:
-                try:
-                    uuid = order[2]
-                    if not uuid or not isinstance(uuid, str):
-                        log_queue.put(f"[경고] 유효하지 않은 UUID: {order}")
-                        continue
-                    status = api.check_order_status(uuid)
-                    log_queue.put(f"[주문 상태 갱신] UUID: {uuid}, 상태: {status}")
-                    if status != order[5]:
-                        update_order_status(uuid, status)
-                except Exception as e:
-                    log_queue.put(f"[오류] 주문 상태 동기화 실패: {e}, 주문: {order}")
-                    log_queue.put(traceback.format_exc())
-            log_queue.put(f"[미체결 주문 확인] {len(pending_orders)}건")
-            if not pending_orders:
-                log_queue.put(
-                    "[상태] 모든 주문 체결 완료. 신규 리밸런싱 주문을 시작합니다."
-                )
-                # 신규 주문 발주
-                try:
-                    current_price = pyupbit.get_current_price(ticker)
-                    log_queue.put(f"[{ticker}] 현재가: {current_price}")
-                    balance = api.get_balance(ticker)
-                    log_queue.put(f"[{ticker}] 보유 수량: {balance}")
-                    amount = round(balance * ratio, 8)
-                    log_queue.put(f"[{ticker}] 주문 수량: {amount}")
-                    order_info = api.rebalancing_orders(
-                        ticker, current_price, amount, price_ratio
-                    )
-                    if not (
-                        order_info
-                        and order_info.get("sell_uuid")
-                        and order_info.get("buy_uuid")
-                    ):
-                        log_queue.put(
-                            "[오류] 주문 정보가 비어있거나 UUID가 없습니다. 주문 저장을 건너뜁니다."
-                        )
-                        log_queue.put(f"[진단] 전체 주문 정보: {order_info}")
-                        log_queue.put(
-                            f"[진단] 주문 수량: {amount}, 최소 주문 금액: {current_price * amount}"
-                        )
-                        continue
-                    for side in ["sell", "buy"]:
-                        save_order(
-                            ticker=ticker,
-                            order_type=side,
-                            uuid=order_info[f"{side}_uuid"],
-                            price=float(order_info[f"{side}_price"]),
-                            amount=float(amount),
-                            status="requested",
-                        )
-                    log_queue.put(
-                        f"[매도 주문] 가격: {order_info['sell_price']:.2f}, 수량: {amount}"
-                    )
-                    log_queue.put(
-                        f"[매수 주문] 가격: {order_info['buy_price']:.2f}, 수량: {amount}"
-                    )
-                except Exception as e:
-                    log_queue.put(f"[오류] 신규 주문 발주 중 예외 발생: {e}")
-                    log_queue.put(traceback.format_exc())
-            else:
-                log_queue.put(
-                    f"[상태] 미체결 주문이 남아있어 대기합니다. ({len(pending_orders)}건)"
-                )
-            log_queue.put(f"[대기] {term_hour}시간 후 다음 확인을 시작합니다.")
-            stop_event.wait(term_hour * 3600)
-        except Exception as e:
-            log_queue.put(f"[오류] 리밸런싱 루프 중 예외 발생: {e}")
-            log_queue.put(traceback.format_exc())
-            stop_event.wait(60)
-    log_queue.put("[리밸런싱 루프 종료]")
+    """리밸런싱 로직을 주기적으로 실행하는 메인 루프 (Thread-safe 객체만 사용)
+
+    use_stream 이 True 이면 WebSocket 으로 체결을 감지해 즉시 다음 주문을 내고,
+    term_hour 주기의 REST 동기화는 누락 이벤트를 보정하는 용도로만 사용합니다.
+    """
+    engine = RebalanceEngine(
+        api,
+        [RebalanceConfig(ticker, ratio, price_ratio, term_hour, pricing)],
+        log=fan_out(log_queue.put, get_event_log().append),
+        use_stream=use_stream,
+        market_data=get_market_data(),
+    )
+    engine.run(stop_event)
 
 
 # ==============================================================================
@@ -305,54 +379,131 @@ def render_sidebar(api: UpbitAPI, state: AppState):
     """사이드바 UI 구성"""
     st.sidebar.title("⚙️ 리밸런싱 설정")
 
-    # Ticker 선택
-    if not state.tickers:
-        state.tickers = api.get_tickers()
-    state.selected_ticker = st.sidebar.selectbox(
-        "코인 선택", state.tickers, key="ticker_select"
-    )
+    # 잔고/티커 목록/현재가는 마지막 스냅샷으로 바로 그리고 갱신은 백그라운드에서 진행
+    account = get_account_view()
+    account.refresh_async()
+
+    # Ticker 선택 (목록을 받기 전에는 빈 선택값이 위젯 상태에 남지 않도록 임시 위젯 표시)
+    if not state.tickers and account.tickers:
+        state.tickers = account.tickers
+    if state.tickers:
+        state.selected_ticker = st.sidebar.selectbox(
+            "코인 선택", state.tickers, key="ticker_select"
+        )
+    else:
+        st.sidebar.selectbox("코인 선택", [], placeholder=LOADING_TEXT, disabled=True)
+        state.selected_ticker = None
 
     if state.selected_ticker:
-        state.balance = api.get_balance(state.selected_ticker)
-        state.current_price = pyupbit.get_current_price(state.selected_ticker)
-        st.sidebar.metric("현재가", f"{state.current_price:,.0f} KRW")
+        currency = state.selected_ticker.split("-")[1]
+        market_data = get_market_data()
+        price = market_data.snapshot().prices.get(state.selected_ticker)
+        if price is None:
+            market_data.subscribe([state.selected_ticker])
+        state.current_price = price or 0
+        state.balance = (account.balances or {}).get(currency, 0)
+        st.sidebar.metric(
+            "현재가", f"{price:,.0f} KRW" if price is not None else LOADING_TEXT
+        )
         st.sidebar.metric(
             "보유수량",
-            f"{state.balance:,.4f} {state.selected_ticker.replace('KRW-', '')}",
+            (
+                f"{state.balance:,.4f} {currency}"
+                if account.balances is not None
+                else LOADING_TEXT
+            ),
+        )
+
+    # 최적화 결과가 있으면 백테스트 상위 설정을 기본값으로 고를 수 있게 함
+    presets = get_presets(state.selected_ticker) if state.selected_ticker else []
+    preset = None
+    if presets:
+        preset = st.sidebar.selectbox(
+            "추천 설정 (백테스트 상위)",
+            [None, *presets],
+            format_func=format_preset,
         )
 
     # 리밸런싱 설정
-    ratio = st.sidebar.selectbox("리밸런싱 비율(%)", REBALANCE_RATIO_OPTIONS, index=0)
+    ratio_options, ratio_index = _preset_options(
+        REBALANCE_RATIO_OPTIONS, preset and preset["ratio"]
+    )
+    ratio = st.sidebar.selectbox("리밸런싱 비율(%)", ratio_options, index=ratio_index)
+    price_options, price_index = _preset_options(
+        REBALANCE_PRICE_OPTIONS, preset and preset["price_ratio"]
+    )
     price_ratio = st.sidebar.selectbox(
-        "리밸런싱 가격(%)", REBALANCE_PRICE_OPTIONS, index=0
+        "리밸런싱 가격(%)", price_options, index=price_index
+    )
+    term_default = (
+        min(max(round(preset["term_hour"]), TERM_MIN), TERM_MAX)
+        if preset
+        else TERM_DEFAULT
     )
     term_hour = st.sidebar.number_input(
         "주문 상태 확인 주기(시간)",
         min_value=TERM_MIN,
         max_value=TERM_MAX,
-        value=TERM_DEFAULT,
+        value=term_default,
+    )
+    use_stream = st.sidebar.checkbox(
+        "실시간 체결 감지 (WebSocket)",
+        value=True,
+        help="체결 즉시 다음 주문을 내고, 위 주기는 상태 보정용으로만 사용합니다.",
+    )
+    pricing = st.sidebar.selectbox(
+        "주문 가격 방식",
+        PRICING_MODES,
+        format_func=PRICING_LABELS.get,
+        help="ATR 은 저장된 1시간 캔들의 평균 변동폭을 가격 차이로 사용합니다.",
+    )
+    return ratio / 100, price_ratio / 100, term_hour, use_stream, pricing
+
+
+def format_preset(preset):
+    if preset is None:
+        return "직접 선택"
+    return (
+        f"{preset['rank']}위: 비율 {preset['ratio'] * 100:g}% · "
+        f"가격 {preset['price_ratio'] * 100:g}% · {preset['term_hour']:g}시간 "
+        f"(손익 {preset['pnl']:+,.0f})"
     )
-    return ratio / 100, price_ratio / 100, term_hour
+
+
+def _preset_options(options, fraction):
+    """프리셋 값(비율)을 % 로 바꿔 선택지에 더하고 (선택지, 선택 index)를 반환합니다."""
+    if fraction is None:
+        return options, 0
+    value = round(fraction * 100, 4)
+    options = sorted({*options, value})
+    return options, options.index(value)
 
 
 def render_control_buttons(api: UpbitAPI, state: AppState, config):
     """START/STOP 버튼 UI 구성"""
     st.sidebar.write("---")
-    ratio_val, price_ratio_val, term_hour = config
-    rebalance_amount = state.balance * ratio_val if state.balance else 0
-    buy_price = (
-        state.current_price * (1 - price_ratio_val) if state.current_price else 0
+    ratio_val, price_ratio_val, term_hour, use_stream, pricing = config
+    balances = get_account_view().balances
+    my_krw = balances.get("KRW", 0) if balances is not None else None
+    st.sidebar.metric(
+        "내 KRW 잔액", f"{my_krw:,.0f} KRW" if my_krw is not None else LOADING_TEXT
     )
-    min_krw_required = buy_price * rebalance_amount
-    my_krw = api.get_krw_balance()
-    st.sidebar.metric("내 KRW 잔액", f"{my_krw:,.0f} KRW")
-    is_krw_insufficient = my_krw < min_krw_required
-    if is_krw_insufficient:
-        st.sidebar.warning(
-            f"매수에 필요한 KRW가 부족합니다. (필요: {min_krw_required:,.0f} KRW)"
+    # 엔진과 같은 계획 로직으로 첫 주문 쌍의 최소 주문 금액/필요 KRW 를 미리 확인
+    ticker = state.selected_ticker
+    skipped = None
+    if ticker and my_krw is not None:
+        plan = plan_rebalance(
+            [RebalanceConfig(ticker, ratio_val, price_ratio_val, term_hour, pricing)],
+            {ticker.split("-")[1]: state.balance, "KRW": my_krw},
+            {ticker: state.current_price},
         )
+        skipped = plan.skipped.get(ticker)
+    is_krw_insufficient = bool(skipped and skipped.type == "krw_budget_exceeded")
+    if skipped and skipped.type != "price_missing":
+        st.sidebar.warning(str(skipped))
     col1, col2 = st.sidebar.columns(2)
-    start_disabled = is_krw_insufficient or state.is_thread_alive()
+    # 잔고를 아직 모르면 필요 KRW 를 확인할 수 없으므로 시작하지 않음
+    start_disabled = is_krw_insufficient or my_krw is None or state.is_thread_alive()
     if col1.button("START", disabled=start_disabled, use_container_width=True):
         state.stop_event.clear()
         thread = threading.Thread(
@@ -365,6 +516,8 @@ def render_control_buttons(api: UpbitAPI, state: AppState, config):
                 ratio_val,
                 price_ratio_val,
                 term_hour,
+                use_stream,
+                pricing,
             ),
             daemon=True,
         )
@@ -381,45 +534,88 @@ def render_control_buttons(api: UpbitAPI, state: AppState, config):
 
 
 def render_order_history(api: UpbitAPI, state: AppState):
-    """주문 이력 UI 구성"""
-    st.header("📋 주문 이력")
-    if st.button("새로고침", key="refresh_orders_btn"):
-        state.orders_refresh_needed = True
-        sync_all_pending_orders(api, state)
+    """주문 이력 UI 구성
 
-    if state.orders_refresh_needed:
-        state.orders = get_recent_orders(20)
-        state.orders_refresh_needed = False
+    DB 변경 번호와 조회 조건이 그대로이면 이전에 만든 DataFrame 을 다시 사용합니다.
+    """
+    st.header("📋 주문 이력")
+    col1, col2, col3, col4 = st.columns(4)
+    ticker = col1.selectbox(
+        "티커", [ALL_OPTION, *get_order_tickers()], key="order_ticker_filter"
+    )
+    status = col2.selectbox(
+        "상태", [ALL_OPTION, *ORDER_STATUS_OPTIONS], key="order_status_filter"
+    )
+    page_size = col3.selectbox("페이지 크기", ORDER_PAGE_SIZE_OPTIONS, key="order_size")
+    page = col4.number_input("페이지", min_value=1, value=1, key="order_page")
+
+    if st.button(
+        "새로고침", key="refresh_orders_btn", disabled=state.is_sync_running()
+    ):
+        state.sync_job = BackgroundSync(api, state.log_queue.put).start()
+    if state.is_sync_running():
+        job = state.sync_job
+        st.progress(job.fraction, f"주문 상태 동기화 중... ({job.done}/{job.total})")
+
+    filters = (
+        None if ticker == ALL_OPTION else ticker,
+        None if status == ALL_OPTION else status,
+    )
+    key = (get_orders_version(), *filters, page, page_size)
+    if state.order_view is None or state.order_view["key"] != key:
+        rows = get_orders_page((page - 1) * page_size, page_size, *filters)
+        state.order_view = {
+            "key": key,
+            "frame": pd.DataFrame(rows, columns=ORDER_HISTORY_COLUMNS),
+            "total": count_orders(*filters),
+        }
 
-    if not state.orders:
+    view = state.order_view
+    if not view["total"]:
         st.info("주문 이력이 없습니다.")
         return
+    st.dataframe(view["frame"], hide_index=True, use_container_width=True)
+    st.caption(
+        f"전체 {view['total']:,}건 중 {(page - 1) * page_size + 1:,}"
+        f"~{(page - 1) * page_size + len(view['frame']):,}건"
+    )
 
-    df = pd.DataFrame(
-        state.orders,
-        columns=["티커", "타입", "UUID", "가격", "수량", "상태", "생성시각"],
+
+def render_analytics(summary):
+    """티커별 체결률, 평균 체결 시간, 실현 손익 UI 구성 (누적 집계만 읽음)"""
+    st.header("📊 체결 분석")
+    if not summary:
+        st.info("집계된 주문이 없습니다.")
+        return
+    df = pd.DataFrame(summary).rename(columns=ANALYTICS_COLUMNS)
+    st.dataframe(
+        df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "체결률": st.column_config.ProgressColumn(min_value=0, max_value=1),
+            "실현 손익(KRW)": st.column_config.NumberColumn(format="%.0f"),
+        },
     )
-    st.dataframe(df, hide_index=True, use_container_width=True)
 
 
 def render_logs(state: AppState):
     """실시간 로그 UI 구성"""
     st.header("📜 실시간 로그")
+    col1, col2 = st.columns(2)
+    level_name = col1.selectbox("심각도", list(LEVELS), key="log_level")
+    limit = col2.selectbox("표시 건수", LOG_DISPLAY_OPTIONS, key="log_limit")
     log_container = st.container(height=300)
 
+    REGISTRY.gauge("log_queue_depth").set(state.log_queue.qsize())
     log_messages = []
     while not state.log_queue.empty():
         log_messages.append(state.log_queue.get())
-
     if log_messages:
-        # Append new logs to a persistent log history in session state
-        if "log_history" not in st.session_state:
-            st.session_state.log_history = []
-        st.session_state.log_history.extend(log_messages)
+        state.log_buffer.extend(log_messages)
 
-    # Display logs
-    for msg in reversed(st.session_state.get("log_history", [])):
-        log_container.text(msg)
+    # 최근 로그만 하나의 텍스트 블록으로 그려 재실행 비용을 일정하게 유지
+    log_container.text(state.log_buffer.render_text(limit, LEVELS[level_name]))
 
 
 def render_main_content(api: UpbitAPI, state: AppState):
@@ -429,7 +625,131 @@ def render_main_content(api: UpbitAPI, state: AppState):
 
     render_order_history(api, state)
     st.markdown("---")
+    render_analytics(load_ticker_summary())
+    st.markdown("---")
+    # 실행/동기화/첫 조회 중에는 로그만 주기적으로 다시 그리고, 나머지는 바뀐 경우에만 다시 그림
+    loading = is_data_loading(state)
+    live = state.is_thread_alive() or state.is_sync_running() or loading
+    refresh = LOADING_REFRESH_SECONDS if loading else AUTO_REFRESH_SECONDS
+    refresh = refresh if live else None
+    st.fragment(render_live_updates, run_every=refresh)(state)
+    render_metrics()
+
+
+def render_live_updates(state: AppState):
+    """로그를 갱신하고, 주문 DB 나 실행 상태가 바뀌었으면 전체 화면을 다시 그립니다."""
     render_logs(state)
+    live_key = (
+        get_orders_version(),
+        state.is_thread_alive(),
+        state.is_sync_running(),
+        get_account_view().version,
+        is_data_loading(state),
+    )
+    changed = state.live_key is not None and state.live_key != live_key
+    state.live_key = live_key
+    if changed:
+        st.rerun()
+
+
+def is_data_loading(state: AppState):
+    """사이드바가 아직 잔고나 선택한 티커의 현재가 없이 그려졌으면 True"""
+    if get_account_view().balances is None:
+        return True
+    ticker = state.selected_ticker
+    return bool(ticker) and ticker not in get_market_data().snapshot().prices
+
+
+def render_metrics():
+    """API/DB 호출 지연 시간과 루프 지표 UI 구성"""
+    with st.expander("⏱️ 성능 지표"):
+        rows = REGISTRY.snapshot()
+        if not rows:
+            st.info("수집된 지표가 없습니다.")
+            return
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+
+def render_daemon_view(client: DaemonClient):
+    """헤드리스 데몬의 상태, 주문 이력, 로그를 읽기 전용으로 보여줍니다.
+
+    데몬 조회는 fragment 안에서만 주기적으로 다시 실행해 전체 화면을 다시 그리지 않습니다.
+    """
+    st.title("📈 Upbit 자동 리밸런싱 봇")
+    st.sidebar.title("🛰️ 데몬 상태")
+    with st.sidebar:
+        st.fragment(render_daemon_status, run_every=AUTO_REFRESH_SECONDS)(client)
+    st.fragment(render_daemon_content, run_every=AUTO_REFRESH_SECONDS)(client)
+
+
+def render_daemon_status(client: DaemonClient):
+    try:
+        status = client.get_status()
+    except requests.RequestException as e:
+        st.error(f"데몬에 연결할 수 없습니다: {e}")
+        return
+    if status["running"]:
+        st.success("리밸런싱 데몬이 실행 중입니다...")
+    else:
+        st.warning("리밸런싱 데몬의 엔진이 멈춰 있습니다.")
+    st.caption(f"시작 시각: {status['started_at']}")
+    st.dataframe(
+        pd.DataFrame(status["configs"]), hide_index=True, use_container_width=True
+    )
+
+
+def render_daemon_content(client: DaemonClient):
+    st.markdown("---")
+    st.header("📋 주문 이력")
+    col1, col2, col3, col4 = st.columns(4)
+    # 티커 목록은 직전 조회 결과로 채우고, 첫 화면에서는 전체만 표시
+    tickers = st.session_state.get("daemon_order_tickers", [])
+    ticker = col1.selectbox(
+        "티커", [ALL_OPTION, *tickers], key="daemon_order_ticker_filter"
+    )
+    status = col2.selectbox(
+        "상태", [ALL_OPTION, *ORDER_STATUS_OPTIONS], key="daemon_order_status_filter"
+    )
+    page_size = col3.selectbox(
+        "페이지 크기", ORDER_PAGE_SIZE_OPTIONS, key="daemon_order_size"
+    )
+    page = col4.number_input("페이지", min_value=1, value=1, key="daemon_order_page")
+    try:
+        orders = client.get_orders_page(
+            (page - 1) * page_size,
+            page_size,
+            None if ticker == ALL_OPTION else ticker,
+            None if status == ALL_OPTION else status,
+        )
+        summary = client.get_analytics()
+        logs = client.get_logs(
+            st.session_state.get("log_limit", LOG_DISPLAY_OPTIONS[0]),
+            st.session_state.get("log_level", next(iter(LEVELS))),
+        )
+    except requests.RequestException as e:
+        st.error(f"데몬에 연결할 수 없습니다: {e}")
+        return
+    st.session_state.daemon_order_tickers = orders["tickers"]
+
+    if orders["total"]:
+        df = pd.DataFrame(orders["rows"], columns=ORDER_HISTORY_COLUMNS)
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        st.caption(
+            f"전체 {orders['total']:,}건 중 {(page - 1) * page_size + 1:,}"
+            f"~{(page - 1) * page_size + len(df):,}건"
+        )
+    else:
+        st.info("주문 이력이 없습니다.")
+    st.markdown("---")
+    render_analytics(summary)
+    st.markdown("---")
+
+    st.header("📜 실시간 로그")
+    col1, col2 = st.columns(2)
+    col1.selectbox("심각도", list(LEVELS), key="log_level")
+    col2.selectbox("표시 건수", LOG_DISPLAY_OPTIONS, key="log_limit")
+    log_container = st.container(height=300)
+    log_container.text("\n".join(logs))
 
 
 # ==============================================================================
@@ -439,23 +759,28 @@ def main():
     """Streamlit 애플리케이션의 메인 함수"""
     st.set_page_config(layout="wide", page_title="Upbit 리밸런싱 봇")
 
+    # 데몬이 엔진을 실행 중이면 이 앱은 읽기 전용 화면만 그림
+    daemon_client = get_daemon_client()
+    if daemon_client:
+        render_daemon_view(daemon_client)
+        return
+
     initialize_app()
     api = get_upbit_api()
     state = AppState()
 
-    # 최초 실행 시 주문 상태 동기화
+    # 최초 실행 시 기록되지 못한 주문 복구와 주문 상태 동기화를 화면과 분리해 실행
     if "initial_sync_done" not in st.session_state:
-        sync_all_pending_orders(api, state)
+        state.sync_job = BackgroundSync(
+            api, state.log_queue.put, reconcile=True
+        ).start()
         st.session_state.initial_sync_done = True
 
-    config = render_sidebar(api, state)
-    render_control_buttons(api, state, config)
-    render_main_content(api, state)
-
-    # UI 자동 갱신을 위한 코드
-    if state.is_thread_alive():
-        time.sleep(5)
-        st.rerun()
+    # 화면 갱신용 조회는 주문/루프 요청보다 나중에 처리되도록 낮은 우선순위로 요청
+    with api.request_priority(PRIORITY_UI):
+        config = render_sidebar(api, state)
+        render_control_buttons(api, state, config)
+        render_main_content(api, state)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,459 @@
+import asyncio
+import base64
+import contextvars
+import hashlib
+import hmac
+import json
+import threading
+import uuid as uuid_lib
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+import aiohttp
+
+from pricing import leg_prices
+from upbit_api import (
+    API_URL,
+    BALANCES_CACHE_KEY,
+    CLOSED_ORDER_MAX_PAGES,
+    DEFAULT_CACHE_TTL,
+    EXCHANGE_GROUP,
+    ORDER_DEADLINE_SECONDS,
+    ORDER_GROUP,
+    ORDER_PAGE_LIMIT,
+    PRICE_CACHE_KEY,
+    QUOTATION_GROUP,
+    RATE_LIMIT_RETRIES,
+    REQUEST_TIMEOUT,
+    SIDE_TO_UPBIT,
+    create_request_scheduler,
+    parse_remaining_req,
+)
+from utils.metrics import timed
+from utils.rate_limiter import PRIORITY_ORDER, PRIORITY_QUERY
+from utils.ttl_cache import TTLCache
+
+# 동시에 진행할 수 있는 최대 요청 수 (연결 풀 크기와 같음)
+DEFAULT_MAX_CONCURRENCY = 8
+# 사용하지 않는 keep-alive 연결을 유지하는 시간(초)
+KEEPALIVE_SECONDS = 30
+# 실패로 보고 None/"unknown" 을 반환하는 요청 오류 (UpbitAPI 의 requests.RequestException 에 해당)
+REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+# 현재 요청의 우선순위 (동기 어댑터가 호출 스레드의 값을 넘겨줌)
+_priority = contextvars.ContextVar("upbit_priority", default=PRIORITY_QUERY)
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class JWTSigner:
+    """Upbit 인증용 HS256 JWT 를 요청마다 바뀌는 부분만 인코딩해 만드는 서명기
+
+    헤더와 access_key 부분의 base64 는 미리 계산해 두고, HMAC 도 키를 적용한
+    객체를 복사해 쓰므로 요청마다 nonce/query_hash 만 인코딩합니다.
+    """
+
+    def __init__(self, access_key: str, secret_key: str):
+        header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        prefix = "{" + f'"access_key": {json.dumps(access_key)},'
+        # base64 는 3바이트 단위로 인코딩되므로 공백으로 길이를 맞추면 뒷부분과 이어 붙일 수 있음
+        prefix += " " * (-len(prefix.encode()) % 3)
+        self._signing_prefix = f"{header}.{_b64(prefix.encode())}"
+        self._mac = hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+
+    def token(self, query=None) -> str:
+        claims = {"nonce": str(uuid_lib.uuid4())}
+        if query:
+            query_string = urlencode(query, doseq=True).replace("%5B%5D=", "[]=")
+            claims["query_hash"] = hashlib.sha512(query_string.encode()).hexdigest()
+            claims["query_hash_alg"] = "SHA512"
+        signing_input = self._signing_prefix + _b64(json.dumps(claims)[1:].encode())
+        mac = self._mac.copy()
+        mac.update(signing_input.encode())
+        return f"{signing_input}.{_b64(mac.digest())}"
+
+    def headers(self, query=None):
+        return {"Authorization": f"Bearer {self.token(query)}"}
+
+
+class AsyncUpbitAPI:
+    """하나의 keep-alive 연결 풀(aiohttp)로 Upbit REST API 를 호출하는 asyncio 클라이언트
+
+    UpbitAPI 와 같은 메서드를 코루틴으로 제공하며, 요청 수 제한 스케줄러와
+    잔고/현재가 캐시도 같은 방식으로 사용합니다. 동시에 진행되는 요청 수는
+    max_concurrency 로 제한됩니다.
+    """
+
+    def __init__(
+        self,
+        access_key,
+        secret_key,
+        cache_ttl=DEFAULT_CACHE_TTL,
+        scheduler=None,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        base_url=API_URL,
+    ):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.base_url = base_url.rstrip("/")
+        self.signer = JWTSigner(access_key, secret_key)
+        self.cache = TTLCache(cache_ttl)
+        self.scheduler = scheduler or create_request_scheduler()
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+        # 마감 시간 이후 접수된 주문의 취소 작업이 가비지 컬렉션되지 않도록 보관
+        self._background = set()
+
+    async def _get_session(self):
+        # 세션과 세마포어는 실행 중인 이벤트 루프에 묶이므로 처음 요청할 때 생성
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_concurrency, keepalive_timeout=KEEPALIVE_SECONDS
+                ),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    async def _acquire(self, group, priority):
+        # 기다리는 요청이 없고 토큰이 남아 있으면 스레드 전환 없이 바로 통과
+        if self.scheduler.try_acquire(group):
+            return
+        await asyncio.to_thread(self.scheduler.acquire, group, priority)
+
+    async def _request(
+        self, group, method, path, params=None, body=None, auth=True, priority=None
+    ):
+        """요청 한도를 지키며 API 를 호출하고 JSON 응답을 반환합니다.
+
+        GET/DELETE 는 params 를 쿼리 문자열로, POST 는 body 를 JSON 으로 보냅니다.
+        """
+        if priority is None:
+            priority = _priority.get()
+        session = await self._get_session()
+        url = f"{self.base_url}{path}"
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await self._acquire(group, priority)
+            headers = self.signer.headers(params or body) if auth else {}
+            async with self._semaphore:
+                with timed("upbit_request_seconds", method=f"{method} {path}"):
+                    async with session.request(
+                        method, url, params=params, json=body, headers=headers
+                    ) as response:
+                        remaining_req = response.headers.get("Remaining-Req")
+                        if response.status == 429:
+                            self.scheduler.drain(group)
+                            if attempt == RATE_LIMIT_RETRIES:
+                                response.raise_for_status()
+                            continue
+                        response.raise_for_status()
+                        result = await response.json()
+            self.scheduler.sync_remaining(group, parse_remaining_req(remaining_req))
+            return result
+
+    async def _get_balances(self):
+        return await self.cache.get_or_load_async(
+            BALANCES_CACHE_KEY,
+            lambda: self._request(EXCHANGE_GROUP, "GET", "/v1/accounts"),
+        )
+
+    def invalidate_balances(self):
+        self.cache.invalidate(BALANCES_CACHE_KEY)
+
+    async def get_balances_by_currency(self):
+        balances = await self._get_balances()
+        return {b["currency"]: float(b["balance"]) for b in balances}
+
+    async def get_krw_balance(self):
+        return (await self.get_balances_by_currency()).get("KRW", 0)
+
+    async def get_balance(self, ticker):
+        currency = ticker.split("-")[1]
+        return (await self.get_balances_by_currency()).get(currency, 0)
+
+    async def get_tickers(self):
+        balances = await self._get_balances()
+        return [f"KRW-{b['currency']}" for b in balances if b["currency"] != "KRW"]
+
+    async def get_current_price(self, ticker):
+        return (await self.get_current_prices([ticker])).get(ticker)
+
+    async def get_current_prices(self, tickers):
+        """캐시에 없는 티커만 모아 한 번의 요청으로 현재가를 조회합니다."""
+        prices = {}
+        missing = []
+        for ticker in tickers:
+            price = self.cache.get((PRICE_CACHE_KEY, ticker), None)
+            if price is None:
+                missing.append(ticker)
+            else:
+                prices[ticker] = price
+        if missing:
+            prices.update(await self.fetch_current_prices(missing))
+        return prices
+
+    async def fetch_current_prices(self, tickers):
+        """캐시를 거치지 않고 tickers 의 현재가를 한 번의 요청으로 조회합니다 (결과는 캐시에 넣음)."""
+        result = await self._request(
+            QUOTATION_GROUP,
+            "GET",
+            "/v1/ticker",
+            params={"markets": ",".join(tickers)},
+            auth=False,
+        )
+        prices = {}
+        for item in result:
+            self.cache.set((PRICE_CACHE_KEY, item["market"]), item["trade_price"])
+            prices[item["market"]] = item["trade_price"]
+        return prices
+
+    async def get_orderbook(self, ticker):
+        result = await self._request(
+            QUOTATION_GROUP,
+            "GET",
+            "/v1/orderbook",
+            params={"markets": ticker},
+            auth=False,
+        )
+        return result[0] if result else None
+
+    async def place_limit_order(self, ticker, side, price, amount):
+        """지정가 주문 하나를 제출하고 주문 응답(dict) 또는 실패 시 None 을 반환합니다."""
+        body = {
+            "market": ticker,
+            "side": SIDE_TO_UPBIT[side],
+            "volume": str(amount),
+            "price": str(price),
+            "ord_type": "limit",
+        }
+        try:
+            order = await self._request(
+                ORDER_GROUP, "POST", "/v1/orders", body=body, priority=PRIORITY_ORDER
+            )
+        except REQUEST_ERRORS:
+            order = None
+        self.invalidate_balances()
+        return order
+
+    async def cancel_order(self, uuid):
+        try:
+            result = await self._request(
+                ORDER_GROUP,
+                "DELETE",
+                "/v1/order",
+                params={"uuid": uuid},
+                priority=PRIORITY_ORDER,
+            )
+        except REQUEST_ERRORS:
+            result = None
+        self.invalidate_balances()
+        return isinstance(result, dict) and bool(result.get("uuid"))
+
+    async def rebalancing_orders(self, ticker, price, amount, ratio, prices=None):
+        """매도/매수 주문을 동시에 제출하고 공통 마감 시간까지 응답을 기다립니다.
+
+        마감 시간 안에 응답하지 않았거나 실패한 주문은 uuid 가 None 으로 반환되며
+        (재시도/취소와 기록은 호출자가 담당), 마감 후 접수된 주문은 자동으로 취소됩니다.
+        """
+        if prices is None:
+            prices = leg_prices(price, ratio)
+        tasks = {
+            side: asyncio.create_task(
+                self.place_limit_order(ticker, side, leg_price, amount)
+            )
+            for side, leg_price in prices.items()
+        }
+        await asyncio.wait(tasks.values(), timeout=ORDER_DEADLINE_SECONDS)
+
+        result = {}
+        for side, task in tasks.items():
+            order = None
+            if not task.done():
+                self._background.add(task)
+                task.add_done_callback(self._cancel_late_order)
+            elif task.exception() is None:
+                order = task.result()
+            result[f"{side}_price"] = prices[side]
+            result[f"{side}_uuid"] = (
+                order.get("uuid") if isinstance(order, dict) else None
+            )
+            result[f"{side}_order_raw"] = order
+        return result
+
+    def _cancel_late_order(self, task):
+        self._background.discard(task)
+        if task.exception() is None and isinstance(task.result(), dict):
+            uuid = task.result().get("uuid")
+            if uuid:
+                cancel = asyncio.create_task(self.cancel_order(uuid))
+                self._background.add(cancel)
+                cancel.add_done_callback(self._background.discard)
+
+    async def check_order_status(self, uuid):
+        if not uuid:
+            return "unknown"
+        try:
+            order = await self._request(
+                EXCHANGE_GROUP, "GET", "/v1/order", params={"uuid": uuid}
+            )
+        except REQUEST_ERRORS:
+            return "unknown"
+        if isinstance(order, dict):
+            return order.get("state", "unknown")
+        return "unknown"
+
+    async def check_order_statuses(self, orders):
+        """여러 주문의 상태를 티커별 주문 목록 조회로 한 번에 확인합니다.
+
+        티커별 조회는 동시에 진행하며, 목록에서 찾지 못한 주문만 개별 조회합니다.
+        """
+        remaining_by_ticker = defaultdict(set)
+        for ticker, uuid in orders:
+            if uuid:
+                remaining_by_ticker[ticker].add(uuid)
+
+        statuses = {}
+        await asyncio.gather(
+            *(
+                self._match_ticker_orders(ticker, remaining, statuses)
+                for ticker, remaining in remaining_by_ticker.items()
+            )
+        )
+        return statuses
+
+    async def _match_ticker_orders(self, ticker, remaining, statuses):
+        for state in ("wait", "done", "cancel"):
+            max_pages = None if state == "wait" else CLOSED_ORDER_MAX_PAGES
+            async for page in self._iter_order_pages(ticker, state, max_pages):
+                for order in page:
+                    uuid = order.get("uuid")
+                    if uuid in remaining:
+                        statuses[uuid] = order.get("state", "unknown")
+                        remaining.discard(uuid)
+                if not remaining:
+                    return
+        missing = list(remaining)
+        for uuid, status in zip(
+            missing,
+            await asyncio.gather(*(self.check_order_status(u) for u in missing)),
+        ):
+            statuses[uuid] = status
+
+    async def get_orders(self, ticker, state="wait", max_pages=None):
+        """티커의 state 상태 주문 목록을 최신순으로 최대 max_pages 페이지까지 조회합니다."""
+        return [
+            order
+            async for page in self._iter_order_pages(ticker, state, max_pages)
+            for order in page
+        ]
+
+    async def _iter_order_pages(self, ticker, state, max_pages):
+        page = 1
+        while max_pages is None or page <= max_pages:
+            result = await self._request(
+                EXCHANGE_GROUP,
+                "GET",
+                "/v1/orders",
+                params={
+                    "market": ticker,
+                    "state": state,
+                    "page": page,
+                    "limit": ORDER_PAGE_LIMIT,
+                    "order_by": "desc",
+                },
+            )
+            if not isinstance(result, list):
+                return
+            yield result
+            if len(result) < ORDER_PAGE_LIMIT:
+                return
+            page += 1
+
+
+# SyncUpbitAPI 가 동기 메서드로 감싸 제공하는 AsyncUpbitAPI 코루틴 목록
+SYNC_METHODS = (
+    "get_balances_by_currency",
+    "get_krw_balance",
+    "get_balance",
+    "get_tickers",
+    "get_current_price",
+    "get_current_prices",
+    "fetch_current_prices",
+    "get_orderbook",
+    "place_limit_order",
+    "cancel_order",
+    "rebalancing_orders",
+    "check_order_status",
+    "check_order_statuses",
+    "get_orders",
+)
+
+
+class SyncUpbitAPI:
+    """AsyncUpbitAPI 를 UpbitAPI 와 같은 동기 인터페이스로 쓰기 위한 어댑터
+
+    전용 스레드에서 이벤트 루프 하나를 계속 실행하고, 여러 스레드의 호출을
+    그 루프로 넘기므로 연결 풀과 keep-alive 연결을 모든 호출부가 공유합니다.
+    """
+
+    def __init__(self, access_key, secret_key, **kwargs):
+        self.client = AsyncUpbitAPI(access_key, secret_key, **kwargs)
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.cache = self.client.cache
+        self.scheduler = self.client.scheduler
+        self._local = threading.local()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="upbit-async", daemon=True
+        )
+        self._thread.start()
+
+    @contextmanager
+    def request_priority(self, priority):
+        """현재 스레드에서 호출하는 조회 요청의 우선순위를 지정합니다."""
+        previous = getattr(self._local, "priority", PRIORITY_QUERY)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def invalidate_balances(self):
+        self.client.invalidate_balances()
+
+    def _run(self, coro):
+        priority = getattr(self._local, "priority", PRIORITY_QUERY)
+
+        async def with_priority():
+            _priority.set(priority)
+            return await coro
+
+        return asyncio.run_coroutine_threadsafe(with_priority(), self._loop).result()
+
+    def close(self):
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def _sync_method(name):
+    def method(self, *args, **kwargs):
+        return self._run(getattr(self.client, name)(*args, **kwargs))
+
+    method.__name__ = name
+    method.__doc__ = getattr(AsyncUpbitAPI, name).__doc__
+    return method
+
+
+for _name in SYNC_METHODS:
+    setattr(SyncUpbitAPI, _name, _sync_method(_name))
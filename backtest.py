@@ -0,0 +1,218 @@
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from pricing import FEE_RATE
+
+# 체결 지점을 찾을 때 처음 검사하는 캔들 수 (찾지 못하면 두 배씩 늘림)
+SEARCH_WINDOW = 256
+
+
+@dataclass
+class FillSchedule:
+    """price_ratio, term 조합 하나에 대한 주문 쌍별 체결 시점 (캔들 인덱스 배열)
+
+    arm_idx 에서 주문 쌍을 내고, sell_idx/buy_idx 에서 각 주문이 체결되며,
+    봇이 두 주문의 체결을 확인하고 다음 쌍을 내는 시점이 다음 arm_idx 입니다.
+    마지막 쌍은 미완료일 수 있으며, 체결되지 않은 주문의 인덱스는 -1 입니다.
+    """
+
+    arm_idx: np.ndarray
+    arm_price: np.ndarray
+    sell_idx: np.ndarray
+    buy_idx: np.ndarray
+    price_ratio: float
+
+
+def load_candles(path):
+    """CSV, Parquet 또는 캔들 저장소의 Arrow 파일에서 OHLCV 캔들을 읽어 시간순으로 반환합니다.
+
+    첫 번째 열(또는 인덱스)은 시각이며, open/high/low/close/volume 열이 있어야 합니다.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    elif path.endswith(".arrow"):
+        df = pd.read_feather(path).set_index("timestamp")
+    else:
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+    return df.sort_index()
+
+
+def candle_minutes(df):
+    """캔들 간격(분)을 인덱스 간격의 중앙값으로 추정합니다."""
+    deltas = np.diff(df.index.values).astype("timedelta64[s]").astype(np.int64)
+    return max(float(np.median(deltas)) / 60, 1.0)
+
+
+def _first_cross(values, start, threshold, above):
+    """start 이후 처음으로 threshold 이상(above) 또는 이하가 되는 인덱스, 없으면 -1"""
+    n = len(values)
+    size = SEARCH_WINDOW
+    i = start
+    while i < n:
+        window = values[i : i + size]
+        hits = window >= threshold if above else window <= threshold
+        if hits.any():
+            return i + int(hits.argmax())
+        i += size
+        size *= 2
+    return -1
+
+
+def simulate_fills(high, low, close, price_ratio, term_steps):
+    """가격 경로만으로 결정되는 주문 쌍별 체결 시점을 계산합니다.
+
+    캔들마다가 아닌 주문 쌍마다 한 번씩 반복하며, 체결 지점은 NumPy 로 구간 단위 탐색합니다.
+    체결 시점은 수량(ratio)과 무관하므로 같은 schedule 로 여러 ratio 를 평가할 수 있습니다.
+    """
+    term_steps = max(int(term_steps), 1)
+    arms, arm_prices, sells, buys = [], [], [], []
+    arm = 0
+    n = len(close)
+    while arm < n - 1:
+        price = close[arm]
+        sell_idx = _first_cross(high, arm + 1, price * (1 + price_ratio), True)
+        buy_idx = _first_cross(low, arm + 1, price * (1 - price_ratio), False)
+        arms.append(arm)
+        arm_prices.append(price)
+        sells.append(sell_idx)
+        buys.append(buy_idx)
+        if sell_idx < 0 or buy_idx < 0:
+            break
+        # 봇은 term 주기의 점검 시점에만 체결을 확인
+        filled = max(sell_idx, buy_idx)
+        arm += -(-(filled - arm) // term_steps) * term_steps
+    return FillSchedule(
+        arm_idx=np.asarray(arms, dtype=np.int64),
+        arm_price=np.asarray(arm_prices, dtype=np.float64),
+        sell_idx=np.asarray(sells, dtype=np.int64),
+        buy_idx=np.asarray(buys, dtype=np.int64),
+        price_ratio=price_ratio,
+    )
+
+
+def evaluate(schedule, ratio, last_price, coin=1.0, krw=0.0, fee_rate=FEE_RATE):
+    """체결 시점과 주문 비율로 손익, 체결 횟수, 수수료를 계산합니다.
+
+    매도/매수 수량이 같으므로 주문 수량은 시작 보유 수량 * ratio 로 고정되고,
+    모든 주문 쌍의 손익을 배열 연산 한 번으로 합산합니다.
+    """
+    amount = coin * ratio
+    sell_prices = schedule.arm_price * (1 + schedule.price_ratio)
+    buy_prices = schedule.arm_price * (1 - schedule.price_ratio)
+    sell_filled = schedule.sell_idx >= 0
+    buy_filled = schedule.buy_idx >= 0
+
+    sell_value = float((sell_prices * sell_filled).sum() * amount)
+    buy_value = float((buy_prices * buy_filled).sum() * amount)
+    fees = (sell_value + buy_value) * fee_rate
+    final_coin = coin + amount * (int(buy_filled.sum()) - int(sell_filled.sum()))
+    final_krw = krw + sell_value - buy_value - fees
+    start_value = krw + coin * (schedule.arm_price[0] if len(schedule.arm_price) else 0)
+    final_value = final_krw + final_coin * last_price
+    hold_value = krw + coin * last_price
+    return {
+        "ratio": ratio,
+        "price_ratio": schedule.price_ratio,
+        "cycles": int((sell_filled & buy_filled).sum()),
+        "sell_fills": int(sell_filled.sum()),
+        "buy_fills": int(buy_filled.sum()),
+        "fees": fees,
+        "pnl": float(final_value - start_value),
+        "excess_pnl": float(final_value - hold_value),
+        "final_coin": final_coin,
+        "final_krw": final_krw,
+    }
+
+
+def backtest(df, ratio, price_ratio, term_hour, fee_rate=FEE_RATE):
+    """설정 하나로 캔들 데이터프레임에 대한 백테스트 결과를 반환합니다."""
+    term_steps = term_hour * 60 / candle_minutes(df)
+    schedule = simulate_fills(
+        df["high"].to_numpy(np.float64),
+        df["low"].to_numpy(np.float64),
+        df["close"].to_numpy(np.float64),
+        price_ratio,
+        term_steps,
+    )
+    result = evaluate(schedule, ratio, float(df["close"].iloc[-1]), fee_rate=fee_rate)
+    result["term_hour"] = term_hour
+    return result
+
+
+# 프로세스 풀의 각 워커가 한 번만 읽어 두는 캔들 배열
+_worker_candles = None
+
+
+def _init_worker(path):
+    global _worker_candles
+    df = load_candles(path)
+    _worker_candles = (
+        df["high"].to_numpy(np.float64),
+        df["low"].to_numpy(np.float64),
+        df["close"].to_numpy(np.float64),
+        candle_minutes(df),
+    )
+
+
+def _run_price_term(price_ratio, term_hour, ratios, fee_rate):
+    high, low, close, minutes = _worker_candles
+    schedule = simulate_fills(high, low, close, price_ratio, term_hour * 60 / minutes)
+    results = []
+    for ratio in ratios:
+        result = evaluate(schedule, ratio, float(close[-1]), fee_rate=fee_rate)
+        result["term_hour"] = term_hour
+        results.append(result)
+    return results
+
+
+def sweep(path, ratios, price_ratios, term_hours, fee_rate=FEE_RATE, max_workers=None):
+    """ratio x price_ratio x term 조합 전체를 프로세스 풀로 나누어 백테스트합니다.
+
+    체결 시점은 (price_ratio, term) 조합마다 한 번만 계산하고 모든 ratio 에 재사용합니다.
+    결과는 pnl 내림차순으로 정렬된 데이터프레임입니다.
+    """
+    ratios = list(ratios)
+    with ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(path,),
+    ) as executor:
+        futures = [
+            executor.submit(_run_price_term, price_ratio, term_hour, ratios, fee_rate)
+            for price_ratio, term_hour in itertools.product(price_ratios, term_hours)
+        ]
+        rows = [row for future in futures for row in future.result()]
+    return pd.DataFrame(rows).sort_values("pnl", ascending=False, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리밸런싱 전략 백테스트")
+    parser.add_argument("path", help="OHLCV 캔들 CSV 또는 Parquet 파일")
+    parser.add_argument("--ratios", type=float, nargs="+", default=[5, 10, 15, 20])
+    parser.add_argument(
+        "--price-ratios", type=float, nargs="+", default=[3, 5, 10, 15, 20]
+    )
+    parser.add_argument("--terms", type=float, nargs="+", default=list(range(1, 25)))
+    parser.add_argument("--fee-rate", type=float, default=FEE_RATE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    results = sweep(
+        args.path,
+        [r / 100 for r in args.ratios],
+        [p / 100 for p in args.price_ratios],
+        args.terms,
+        fee_rate=args.fee_rate,
+        max_workers=args.workers,
+    )
+    print(results.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
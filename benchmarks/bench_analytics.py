@@ -0,0 +1,86 @@
+"""체결 분석 화면 로드 시간: 누적 집계 테이블 vs 전체 이력 pandas 집계
+
+주문 이력을 수만 건에서 수백만 건까지 늘려 가며, 화면이 읽는 load_ticker_summary()
+(ticker_stats 만 조회)와 매번 전체 orders 를 읽어 pandas 로 집계하는 방식의 시간을 비교합니다.
+상태 변경 시 집계를 갱신하는 비용(미체결 100건 체결 처리)도 함께 측정합니다.
+합성 이력은 기존 스키마로 만든 뒤 OrderStore.init_schema() 마이그레이션으로 집계를 채웁니다.
+
+    python -m benchmarks.bench_analytics --history 10000 100000 1000000 3000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from analytics import load_ticker_summary
+from benchmarks.bench_order_schema import create_legacy_orders
+from order_db import OrderStore, set_order_store
+
+
+def pandas_summary(store):
+    """집계 테이블이 없을 때의 방식: 전체 이력을 DataFrame 으로 읽어 티커별로 집계"""
+    df = store._cursor().execute("SELECT * FROM orders").df()
+    df["notional"] = df["price"] * df["amount"]
+    done = df[df["status"] == "done"]
+    summary = df.groupby("ticker").agg(
+        placed=("uuid", "size"),
+        cancelled=("status", lambda s: (s == "cancel").sum()),
+    )
+    fills = done.pivot_table(
+        index="ticker",
+        columns="order_type",
+        values=["amount", "notional"],
+        aggfunc="sum",
+    )
+    fills.columns = [f"{side}_{value}" for value, side in fills.columns]
+    return summary.join(fills, how="left")
+
+
+def _ms(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--history",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000, 3_000_000],
+    )
+    parser.add_argument("--open", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'history':>10} {'summary ms':>11} {'pandas ms':>10} "
+        f"{'fill 100 ms':>12} {'tickers':>8}"
+    )
+    for history in args.history:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "orders.duckdb")
+            create_legacy_orders(path, history, args.open)
+            store = OrderStore(path)
+            store.init_schema()
+            set_order_store(store)
+
+            summary = _ms(load_ticker_summary, args.repeat)
+            pandas = _ms(lambda: pandas_summary(store), max(args.repeat // 10, 1))
+            pending = [row[2] for row in store.get_pending_orders()]
+            started = time.perf_counter()
+            store.update_statuses(dict.fromkeys(pending, "done"))
+            fill = (time.perf_counter() - started) * 1e3
+            tickers = len(load_ticker_summary())
+            store.close()
+        print(
+            f"{history:>10,} {summary:>11.3f} {pandas:>10.1f} "
+            f"{fill:>12.2f} {tickers:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Upbit 클라이언트별 호출 지연 시간: UpbitAPI(requests) vs SyncUpbitAPI/AsyncUpbitAPI(aiohttp)
+
+로컬 모의 거래소(MockUpbitServer)를 스텁 서버로 두고, 같은 호출을 각 클라이언트로 반복해
+호출당 지연 시간(p50/p95)과 여러 호출을 동시에 낼 때의 초당 처리량을 측정합니다.
+동시 호출은 UpbitAPI/SyncUpbitAPI 는 스레드 풀, AsyncUpbitAPI 는 asyncio.gather 로 냅니다.
+요청 수 제한은 끄고 클라이언트 자체의 왕복 비용만 측정합니다.
+
+    python -m benchmarks.bench_api_clients --calls 500 --concurrency 16 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from async_upbit_api import AsyncUpbitAPI, SyncUpbitAPI
+from mock_exchange import MockUpbitServer, connect, flat_candles, unlimited_scheduler
+from paper_exchange import PaperExchange
+from upbit_api import UpbitAPI
+
+TICKERS = ["KRW-BTC", "KRW-ETH"]
+
+
+def _operations(order_uuid):
+    return {
+        "current_price": lambda api: api.get_current_price("KRW-BTC"),
+        "order_status": lambda api: api.check_order_status(order_uuid),
+        "balances": lambda api: (
+            api.invalidate_balances(),
+            api.get_balances_by_currency(),
+        ),
+    }
+
+
+def _latency(api, call, calls):
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        call(api)
+        samples.append((time.perf_counter() - started) * 1e3)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def _threaded_rate(api, call, calls, concurrency):
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        list(pool.map(lambda _: call(api), range(calls)))
+        return calls / (time.perf_counter() - started)
+
+
+def _gather_rate(server, order_uuid, calls, concurrency):
+    async def run():
+        api = connect(
+            server,
+            api_class=AsyncUpbitAPI,
+            cache_ttl=0,
+            scheduler=unlimited_scheduler(),
+            max_concurrency=concurrency,
+        )
+        try:
+            await api.check_order_status(order_uuid)
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(api.check_order_status(order_uuid) for _ in range(calls))
+            )
+            return calls / (time.perf_counter() - started)
+        finally:
+            await api.close()
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--latency", type=float, default=0.002, help="요청당 서버 지연(초)"
+    )
+    args = parser.parse_args()
+
+    exchange = PaperExchange(flat_candles(TICKERS), krw=1e9, coins={"BTC": 1e3})
+    order_uuid = exchange.place_limit_order("KRW-BTC", "sell", 10_500.0, 1.0)["uuid"]
+    operations = _operations(order_uuid)
+    with MockUpbitServer(
+        exchange, latency=args.latency, enforce_limits=False
+    ) as server:
+        clients = {
+            "UpbitAPI": connect(server, cache_ttl=0, scheduler=unlimited_scheduler()),
+            "SyncUpbitAPI": connect(
+                server,
+                api_class=SyncUpbitAPI,
+                cache_ttl=0,
+                scheduler=unlimited_scheduler(),
+                max_concurrency=args.concurrency,
+            ),
+        }
+        print(f"{'client':>13} {'operation':>14} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, api in clients.items():
+            for operation, call in operations.items():
+                call(api)
+                p50, p95 = _latency(api, call, args.calls)
+                print(f"{name:>13} {operation:>14} {p50:>8.2f} {p95:>8.2f}")
+
+        print(f"\norder_status {args.calls}건, 동시 {args.concurrency}개")
+        print(f"{'client':>13} {'calls/s':>10}")
+        for name, api in clients.items():
+            rate = _threaded_rate(
+                api, operations["order_status"], args.calls, args.concurrency
+            )
+            print(f"{name:>13} {rate:>10,.0f}")
+        rate = _gather_rate(server, order_uuid, args.calls, args.concurrency)
+        print(f"{'AsyncUpbitAPI':>13} {rate:>10,.0f}")
+
+        clients["UpbitAPI"]._order_pool.shutdown()
+        clients["SyncUpbitAPI"].close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Streamlit 화면의 첫 표시 시간과 재실행(rerun)당 비용 (거래소는 로컬 모의 서버)
+
+AppTest 로 app.py 를 실행하며, UpbitAPI 는 MockUpbitServer 에 연결된 인스턴스로,
+config.yaml 은 로컬 엔진 모드(daemon.url 비움)와 임시 이벤트 로그 경로로 바꿔 둡니다.
+주문 이력은 합성 이력을 만든 임시 DuckDB 를 씁니다.
+캐시가 빈 프로세스의 첫 표시(cold), 캐시가 채워진 뒤 새 세션의 첫 표시(warm),
+같은 세션의 재실행 시간(p50/p95)과 재실행당 모의 서버 요청 수를 측정합니다.
+
+    python -m benchmarks.bench_app --tickers 50 --history 100000 --reruns 30 --latency 0.05
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import upbit_api
+import utils.common_utils
+from benchmarks.bench_order_schema import create_legacy_orders
+from mock_exchange import MockUpbitServer, connect, flat_candles
+from order_db import OrderStore, set_order_store
+from paper_exchange import PaperExchange
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app.py")
+
+
+def _patch(server, event_log_path):
+    load_config = utils.common_utils.load_config
+
+    def local_config(conf_file="config.yaml"):
+        config = load_config(conf_file)
+        return {**config, "event_log_path": event_log_path, "daemon": {}}
+
+    # app.py 는 재실행마다 모듈에서 다시 import 하므로 모듈 속성만 바꾸면 됨
+    upbit_api.UpbitAPI = lambda access_key, secret_key: connect(server)
+    utils.common_utils.load_config = local_config
+    os.environ.setdefault("ACCESS_KEY", "bench")
+    os.environ.setdefault("SECRET_KEY", "bench")
+
+
+def _requests(server):
+    return sum(server.calls.values())
+
+
+def _first_paint(timeout):
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    started = time.perf_counter()
+    app.run()
+    elapsed = (time.perf_counter() - started) * 1e3
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return app, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=50, help="보유 티커 수")
+    parser.add_argument("--history", type=int, default=100_000, help="주문 이력 건수")
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="요청당 서버 지연(초)"
+    )
+    parser.add_argument(
+        "--settle", type=float, default=2, help="첫 조회가 끝나길 기다리는 시간(초)"
+    )
+    args = parser.parse_args()
+
+    tickers = [f"KRW-C{i:03d}" for i in range(args.tickers)]
+    exchange = PaperExchange(
+        flat_candles(tickers),
+        krw=1e9,
+        coins={ticker.split("-")[1]: 100.0 for ticker in tickers},
+    )
+    with tempfile.TemporaryDirectory() as directory, MockUpbitServer(
+        exchange, latency=args.latency
+    ) as server:
+        path = os.path.join(directory, "orders.duckdb")
+        create_legacy_orders(path, args.history, 0)
+        store = OrderStore(path)
+        store.init_schema()
+        set_order_store(store)
+        _patch(server, os.path.join(directory, "events.jsonl"))
+        timeout = 60 + args.latency * 100
+
+        st.cache_resource.clear()
+        _, cold = _first_paint(timeout)
+        time.sleep(args.settle)
+        app, warm = _first_paint(timeout)
+        time.sleep(args.settle)
+
+        server.reset_counts()
+        samples = []
+        for _ in range(args.reruns):
+            started = time.perf_counter()
+            app.run()
+            samples.append((time.perf_counter() - started) * 1e3)
+        requests = _requests(server)
+        samples.sort()
+
+        print(
+            f"티커 {args.tickers}개, 주문 이력 {args.history:,}건, "
+            f"서버 지연 {args.latency * 1e3:.0f}ms"
+        )
+        print(f"첫 표시 (cold): {cold:8.1f} ms")
+        print(f"첫 표시 (warm): {warm:8.1f} ms")
+        print(
+            f"재실행 {args.reruns}회: p50 {statistics.median(samples):.1f} ms, "
+            f"p95 {samples[int(len(samples) * 0.95) - 1]:.1f} ms, "
+            f"요청 {requests / args.reruns:.2f}건/회"
+        )
+        st.cache_resource.clear()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""다중 티커 리밸런싱 처리량: 티커별 루프 vs RebalanceEngine 한 번의 점검
+
+로컬 모의 거래소(MockUpbitServer)에 티커를 100개 이상 올려 두고, 티커마다 따로
+점검하는 기존 방식(티커별 잔고/현재가/주문 상태 조회, 순차 주문)과 엔진이 전체 티커를
+한 번에 점검하는 방식(공유 조회, 워커 풀 주문)의 HTTP 요청 수와 소요 시간을 비교합니다.
+첫 주기는 모든 티커가 새 주문 쌍을 내고, 둘째 주기는 미체결 주문만 확인합니다.
+기본값은 서버와 클라이언트 모두 Upbit 요청 수 제한을 지키며(주문 초당 8건),
+--no-limits 를 주면 제한 없이 왕복 비용만 측정합니다.
+--metrics both 를 주면 지표 기록(utils.metrics.timed)을 끈 실행도 함께 측정해 계측 비용을 비교합니다.
+
+    python -m benchmarks.bench_engine --tickers 100 200 --latency 0.005
+    python -m benchmarks.bench_engine --tickers 200 --latency 0 --no-limits --metrics both
+"""
+
+import argparse
+import time
+from contextlib import contextmanager
+
+from mock_exchange import MockUpbitServer, connect, flat_candles, unlimited_scheduler
+from order_db import OrderStore, get_pending_orders, set_order_store
+from paper_exchange import PaperExchange
+from rebalance_engine import RebalanceConfig, RebalanceEngine
+from utils.metrics import MetricsRegistry, timed
+
+TIMED_CALLS = 100_000
+
+
+def per_ticker(engine, tickers):
+    """기존 방식: 티커마다 따로 점검 (세션/스레드별 루프를 순차로 실행한 것과 같은 요청 수)"""
+    for ticker in tickers:
+        engine.run_once([ticker])
+
+
+def shared(engine, tickers):
+    engine.run_once(tickers)
+
+
+@contextmanager
+def metrics_enabled(enabled):
+    """enabled 가 False 이면 with 블록 동안 timed 가 시각 측정과 기록을 하지 않습니다."""
+    if enabled:
+        yield
+        return
+    enter, exit_ = timed.__enter__, timed.__exit__
+    timed.__enter__ = lambda self: self
+    timed.__exit__ = lambda self, *exc: False
+    try:
+        yield
+    finally:
+        timed.__enter__, timed.__exit__ = enter, exit_
+
+
+def timed_overhead_us():
+    """빈 함수를 timed 로 감쌌을 때 호출 1회에 더해지는 시간(마이크로초)"""
+
+    def noop():
+        pass
+
+    wrapped = timed("bench_seconds", registry=MetricsRegistry())(noop)
+    started = time.perf_counter()
+    for _ in range(TIMED_CALLS):
+        noop()
+    bare = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(TIMED_CALLS):
+        wrapped()
+    return (time.perf_counter() - started - bare) / TIMED_CALLS * 1e6
+
+
+def _run(mode, tickers, args):
+    exchange = PaperExchange(
+        flat_candles(tickers),
+        krw=1e12,
+        coins={ticker.split("-")[1]: 100.0 for ticker in tickers},
+    )
+    store = OrderStore(":memory:")
+    store.init_schema()
+    set_order_store(store)
+    configs = [RebalanceConfig(ticker, 0.1, 0.05, 1) for ticker in tickers]
+    check, workers = (per_ticker, 1) if mode == "per-ticker" else (shared, args.workers)
+    results = []
+    with MockUpbitServer(
+        exchange, latency=args.latency, enforce_limits=not args.no_limits
+    ) as server:
+        scheduler = unlimited_scheduler() if args.no_limits else None
+        api = connect(server, scheduler=scheduler, cache_ttl=0)
+        engine = RebalanceEngine(
+            api, configs, log=lambda event: None, max_workers=workers
+        )
+        try:
+            with engine.workers():
+                for _ in ("place", "check"):
+                    server.reset_counts()
+                    started = time.perf_counter()
+                    check(engine, tickers)
+                    results.append(
+                        (sum(server.calls.values()), time.perf_counter() - started)
+                    )
+        finally:
+            api._order_pool.shutdown()
+    assert len(get_pending_orders()) == 2 * len(tickers)
+    store.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="요청당 서버 지연(초)"
+    )
+    parser.add_argument("--no-limits", action="store_true")
+    parser.add_argument(
+        "--metrics",
+        choices=("on", "off", "both"),
+        default="on",
+        help="지표 기록 여부 (both 는 켠 경우와 끈 경우를 모두 측정)",
+    )
+    args = parser.parse_args()
+
+    print(f"timed 호출당 오버헤드: {timed_overhead_us():.2f} us")
+    states = {"on": (True,), "off": (False,), "both": (True, False)}[args.metrics]
+    print(
+        f"{'tickers':>8} {'mode':>11} {'metrics':>8} {'cycle':>6} {'requests':>9} "
+        f"{'seconds':>8} {'tickers/s':>10}"
+    )
+    for count in args.tickers:
+        tickers = [f"KRW-C{i}" for i in range(count)]
+        for mode in ("per-ticker", "engine"):
+            for enabled in states:
+                with metrics_enabled(enabled):
+                    results = _run(mode, tickers, args)
+                for cycle, (requests, elapsed) in zip(("place", "check"), results):
+                    print(
+                        f"{count:>8} {mode:>11} {'on' if enabled else 'off':>8} "
+                        f"{cycle:>6} {requests:>9} {elapsed:>8.2f} "
+                        f"{count / elapsed:>10.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
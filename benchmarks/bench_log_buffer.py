@@ -0,0 +1,96 @@
+"""로그가 쌓인 뒤 로그 화면 한 번을 그리는 시간: LogBuffer 링 버퍼 vs 전체 이력 리스트
+
+재실행마다 큐에서 --batch 건씩 꺼내 버퍼에 넣는 것처럼 로그를 --lines 건까지 쌓은 뒤,
+render_logs 가 하는 일(새 로그 추가 + 심각도 필터 + 최근 limit 건 텍스트 합치기)의
+시간을 측정합니다. 비교 대상은 모든 로그를 리스트에 두고 매번 전체를 필터링하는 방식입니다.
+LogBuffer 에서 밀려난 로그는 임시 디렉터리의 회전 로그 파일에 기록됩니다.
+
+    python -m benchmarks.bench_log_buffer --lines 1000 10000 100000 --capacity 5000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from utils.log_buffer import LogBuffer, infer_level
+
+
+def _lines(count):
+    markers = ("", "", "", "[경고] ", "[오류] ")
+    return [f"{markers[i % 5]}[KRW-BTC] 로그 {i}" for i in range(count)]
+
+
+class ListHistory:
+    """상한 없이 모든 로그를 보관하고 그릴 때마다 전체를 필터링하는 방식"""
+
+    def __init__(self):
+        self.entries = []
+
+    def extend(self, messages):
+        self.entries.extend((infer_level(m), m) for m in messages)
+
+    def render_text(self, limit, min_level):
+        shown = [m for level, m in self.entries if level >= min_level]
+        return "\n".join(reversed(shown[-limit:]))
+
+
+def _fill(log, lines, batch):
+    for start in range(0, len(lines), batch):
+        log.extend(lines[start : start + batch])
+
+
+def _rerun_ms(log, batch, limit, min_level, repeat):
+    """재실행 한 번: batch 건 추가(밀려난 로그 기록 포함) 시간과 화면용 텍스트 생성 시간"""
+    messages = _lines(batch)
+    extend = render = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        log.extend(messages)
+        extended = time.perf_counter()
+        log.render_text(limit, min_level)
+        extend += extended - started
+        render += time.perf_counter() - extended
+    return extend / repeat * 1e3, render / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--lines", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--capacity", type=int, default=5_000)
+    parser.add_argument("--batch", type=int, default=100, help="재실행당 새 로그 수")
+    parser.add_argument("--limit", type=int, default=200, help="화면에 표시할 건수")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'lines':>8} {'level':>6} {'buffer add ms':>14} {'buffer render ms':>17} "
+        f"{'list add ms':>12} {'list render ms':>15}"
+    )
+    for count in args.lines:
+        lines = _lines(count)
+        with tempfile.TemporaryDirectory() as directory:
+            spill = os.path.join(directory, "spill.log")
+            buffer = LogBuffer(args.capacity, spill)
+            _fill(buffer, lines, args.batch)
+            history = ListHistory()
+            _fill(history, lines, args.batch)
+            for name in ("INFO", "ERROR"):
+                level = logging.getLevelName(name)
+                buffer_ms = _rerun_ms(
+                    buffer, args.batch, args.limit, level, args.repeat
+                )
+                list_ms = _rerun_ms(history, args.batch, args.limit, level, args.repeat)
+                print(
+                    f"{count:>8,} {name:>6} {buffer_ms[0]:>14.3f} {buffer_ms[1]:>17.3f} "
+                    f"{list_ms[0]:>12.3f} {list_ms[1]:>15.3f}"
+                )
+            for handler in logging.getLogger(f"log_buffer.{spill}").handlers:
+                handler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""세션 수 × 티커 수에 따른 현재가 조회 비용: 세션별 UpbitAPI 조회 vs MarketDataHub 공유 스냅샷
+
+Streamlit 세션마다 스레드 하나를 두고, 각 세션이 rerun 간격마다 자기 티커 목록의 현재가를
+읽습니다. api 모드는 공유 UpbitAPI.get_current_prices(3초 캐시)를, hub 모드는
+MarketDataHub.subscribe() 후 get_current_prices()(1초 폴링 스냅샷)를 호출합니다.
+모의 서버에 응답 지연을 줘서 느린 조회 중에도 세션의 읽기/구독이 막히지 않는지와,
+서버로 나간 /v1/ticker 요청 수를 비교합니다.
+
+    python -m benchmarks.bench_market_data --sessions 50 --tickers 100 --latency 0.2
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from market_data import MarketDataHub
+from mock_exchange import MockUpbitServer, connect, flat_candles
+from paper_exchange import PaperExchange
+from upbit_api import DEFAULT_CACHE_TTL
+
+
+def _session(read, tickers, stop, rerun, samples):
+    while not stop.is_set():
+        started = time.perf_counter()
+        read(tickers)
+        samples.append((time.perf_counter() - started) * 1e3)
+        stop.wait(rerun)
+
+
+def _run(server, mode, watchlists, args):
+    api = connect(server, cache_ttl=DEFAULT_CACHE_TTL)
+    hub = None
+    if mode == "hub":
+        hub = MarketDataHub(api.fetch_current_prices).start()
+
+        def read(tickers):
+            hub.subscribe(tickers)
+            return hub.get_current_prices(tickers)
+
+    else:
+        read = api.get_current_prices
+
+    server.reset_counts()
+    stop = threading.Event()
+    samples = []
+    threads = [
+        threading.Thread(
+            target=_session, args=(read, tickers, stop, args.rerun, samples)
+        )
+        for tickers in watchlists
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    if hub:
+        hub.stop()
+    api._order_pool.shutdown()
+
+    samples.sort()
+    return {
+        "requests": server.calls[("GET", "/v1/ticker")],
+        "rejected": server.rejected["ticker"],
+        "reads": len(samples),
+        "p50": statistics.median(samples),
+        "p95": samples[int(len(samples) * 0.95) - 1],
+        "max": samples[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--tickers", type=int, default=100, help="세션당 티커 수")
+    parser.add_argument(
+        "--universe", type=int, default=200, help="세션들이 고르는 전체 티커 수"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10, help="모드별 측정 시간(초)"
+    )
+    parser.add_argument("--rerun", type=float, default=0.5, help="세션 rerun 간격(초)")
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="요청당 서버 지연(초)"
+    )
+    args = parser.parse_args()
+
+    universe = [f"KRW-C{i:03d}" for i in range(args.universe)]
+    rng = random.Random(0)
+    watchlists = [
+        sorted(rng.sample(universe, min(args.tickers, len(universe))))
+        for _ in range(args.sessions)
+    ]
+    exchange = PaperExchange(flat_candles(universe))
+
+    print(
+        f"세션 {args.sessions}개 × 티커 {args.tickers}개, {args.duration:.0f}초, "
+        f"서버 지연 {args.latency * 1e3:.0f}ms"
+    )
+    print(
+        f"{'mode':>5} {'requests':>9} {'rejected':>9} {'reads':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"
+    )
+    with MockUpbitServer(exchange, latency=args.latency) as server:
+        for mode in ("api", "hub"):
+            result = _run(server, mode, watchlists, args)
+            print(
+                f"{mode:>5} {result['requests']:>9,} {result['rejected']:>9,} "
+                f"{result['reads']:>7,} {result['p50']:>8.2f} {result['p95']:>8.2f} "
+                f"{result['max']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
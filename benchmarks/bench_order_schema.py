@@ -0,0 +1,132 @@
+"""주문 이력 100만 건에서 미체결 주문 조회/상태 갱신: 기존 스키마 vs 마이그레이션 후 스키마
+
+기존 스키마는 기본키와 인덱스 없이 orders 전체를 훑어 미체결 주문을 찾고 uuid 로 갱신합니다.
+같은 데이터를 OrderStore.init_schema() 로 마이그레이션한 뒤(uuid 기본키, ticker 인덱스,
+open_orders 테이블) 같은 작업의 시간을 잽니다. 메모리 캐시를 거치지 않도록 SQL 을 직접 실행합니다.
+
+    python -m benchmarks.bench_order_schema --history 1000000 --open 100
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import duckdb
+
+from order_db import (
+    DELETE_OPEN_ORDER_SQL,
+    PENDING_ORDERS_SQL,
+    UPDATE_STATUS_SQL,
+    OrderStore,
+)
+
+LEGACY_PENDING_SQL = (
+    "SELECT * FROM orders WHERE status NOT IN ('done', 'cancel') "
+    "ORDER BY created_at ASC"
+)
+
+
+def create_legacy_orders(path, history, open_count):
+    """기본키/인덱스 없는 기존 스키마의 orders 에 50개 티커의 합성 이력을 만듭니다."""
+    con = duckdb.connect(path)
+    con.execute(
+        """
+        CREATE TABLE orders (
+            ticker VARCHAR, order_type VARCHAR, uuid VARCHAR, price DOUBLE,
+            amount DOUBLE, status VARCHAR,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    # 마지막 open_count 건만 미체결, 나머지는 체결/취소된 이력
+    con.execute(
+        """
+        INSERT INTO orders
+        SELECT
+            'KRW-C' || (i % 50),
+            CASE WHEN i % 2 = 0 THEN 'buy' ELSE 'sell' END,
+            'uuid-' || i,
+            10000 + i % 1000,
+            1.0,
+            CASE WHEN i >= ? THEN 'wait' WHEN i % 10 = 0 THEN 'cancel' ELSE 'done' END,
+            TIMESTAMP '2020-01-01' + to_seconds(i)
+        FROM range(?) t(i)
+        """,
+        (history - open_count, history),
+    )
+    con.close()
+
+
+def _time(fn, repeat):
+    started = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - started) / repeat * 1e3
+
+
+def measure(cursor, pending_sql, open_uuids, on_close, repeat):
+    pending = _time(lambda i: cursor.execute(pending_sql).fetchall(), repeat)
+    assert len(cursor.execute(pending_sql).fetchall()) == len(open_uuids)
+    # 상태가 바뀌지 않는 갱신(wait -> wait)으로 반복해도 데이터가 그대로 유지되게 함
+    update = _time(
+        lambda i: cursor.execute(
+            UPDATE_STATUS_SQL, ("wait", open_uuids[i % len(open_uuids)])
+        ),
+        repeat,
+    )
+    started = time.perf_counter()
+    on_close(cursor, open_uuids[0])
+    close = (time.perf_counter() - started) * 1e3
+    return pending, update, close
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=1_000_000)
+    parser.add_argument("--open", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    open_uuids = [f"uuid-{i}" for i in range(args.history - args.open, args.history)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, "legacy.duckdb")
+        create_legacy_orders(legacy_path, args.history, args.open)
+        con = duckdb.connect(legacy_path)
+        before = measure(
+            con.cursor(),
+            LEGACY_PENDING_SQL,
+            open_uuids,
+            lambda cursor, uuid: cursor.execute(UPDATE_STATUS_SQL, ("done", uuid)),
+            args.repeat,
+        )
+        con.close()
+
+        migrated_path = os.path.join(directory, "migrated.duckdb")
+        create_legacy_orders(migrated_path, args.history, args.open)
+        store = OrderStore(migrated_path)
+        started = time.perf_counter()
+        store.init_schema()
+        migration = time.perf_counter() - started
+
+        def close_order(cursor, uuid):
+            cursor.execute(UPDATE_STATUS_SQL, ("done", uuid))
+            cursor.execute(DELETE_OPEN_ORDER_SQL, (uuid,))
+
+        after = measure(
+            store._cursor(), PENDING_ORDERS_SQL, open_uuids, close_order, args.repeat
+        )
+        store.close()
+
+    print(
+        f"이력 {args.history:,}건, 미체결 {args.open}건, 마이그레이션 {migration:.1f}초"
+    )
+    print(f"{'operation':>22} {'legacy ms':>10} {'migrated ms':>12}")
+    for name, old, new in zip(
+        ("pending lookup", "status update by uuid", "close one order"), before, after
+    ):
+        print(f"{name:>22} {old:>10.3f} {new:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""주문 DB 호출당 지연 시간: 호출마다 연결을 여는 방식 vs OrderStore 의 공유 연결
+
+임시 파일 DuckDB 에 같은 작업을 반복하며 호출 1회당 평균 시간을 비교합니다.
+"연결 매번" 은 기존 order_db.py 처럼 호출마다 duckdb.connect/close 를 하고,
+"OrderStore" 는 한 연결과 스레드별 커서, 일괄 저장/갱신을 사용합니다.
+
+    python -m benchmarks.bench_order_store --calls 200 --history 10000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import duckdb
+
+from order_db import OrderStore
+
+CREATE_SQL = """
+    CREATE TABLE IF NOT EXISTS orders (
+        ticker VARCHAR, order_type VARCHAR, uuid VARCHAR, price DOUBLE,
+        amount DOUBLE, status VARCHAR, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+INSERT_SQL = (
+    "INSERT INTO orders (ticker, order_type, uuid, price, amount, status) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+class ConnectPerCall:
+    """호출마다 연결을 열고 닫는 기존 방식"""
+
+    def __init__(self, path):
+        self.path = path
+        self._run(CREATE_SQL)
+
+    def _run(self, sql, params=(), fetch=False):
+        con = duckdb.connect(self.path)
+        try:
+            result = con.execute(sql, params)
+            return result.fetchall() if fetch else None
+        finally:
+            con.close()
+
+    def save_order(self, *order):
+        self._run(INSERT_SQL, order)
+
+    def save_orders(self, orders):
+        for order in orders:
+            self.save_order(*order)
+
+    def get_pending_orders(self):
+        return self._run(
+            "SELECT * FROM orders WHERE status NOT IN ('done', 'cancel') "
+            "ORDER BY created_at ASC",
+            fetch=True,
+        )
+
+    def update_order_status(self, uuid, status):
+        self._run("UPDATE orders SET status=? WHERE uuid=?", (status, uuid))
+
+    def update_statuses(self, statuses):
+        for uuid, status in statuses.items():
+            self.update_order_status(uuid, status)
+
+    def get_recent_orders(self, limit=20):
+        return self._run(
+            "SELECT * FROM orders ORDER BY created_at DESC LIMIT ?", (limit,), True
+        )
+
+    def seed(self, orders):
+        con = duckdb.connect(self.path)
+        try:
+            con.executemany(INSERT_SQL, orders)
+        finally:
+            con.close()
+
+
+def _orders(start, count, status="wait"):
+    return [
+        ("KRW-BTC", "sell" if i % 2 else "buy", f"uuid-{i}", 10_000.0 + i, 1.0, status)
+        for i in range(start, start + count)
+    ]
+
+
+def _per_call(fn, calls):
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - started) / calls * 1e3
+
+
+def run(store, calls, history):
+    # 종료된 주문 이력을 채워 조회가 이력 크기의 영향을 받는지 확인
+    seed = getattr(store, "seed", store.save_orders)
+    seed(_orders(0, history, "done"))
+    base = history
+    results = {
+        "save_order": _per_call(
+            lambda i: store.save_order(*_orders(base + i, 1)[0]), calls
+        ),
+        "get_pending_orders": _per_call(lambda i: store.get_pending_orders(), calls),
+        "update_order_status": _per_call(
+            lambda i: store.update_order_status(f"uuid-{base + i}", "wait"), calls
+        ),
+        "get_recent_orders": _per_call(lambda i: store.get_recent_orders(20), calls),
+    }
+    batch = _orders(base + calls, calls)
+    started = time.perf_counter()
+    store.save_orders(batch)
+    results[f"save_orders({calls})"] = (time.perf_counter() - started) * 1e3
+    statuses = {order[2]: "done" for order in batch}
+    started = time.perf_counter()
+    store.update_statuses(statuses)
+    results[f"update_statuses({calls})"] = (time.perf_counter() - started) * 1e3
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--history", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        before = ConnectPerCall(os.path.join(directory, "before.duckdb"))
+        before = run(before, args.calls, args.history)
+        store = OrderStore(os.path.join(directory, "after.duckdb"))
+        store.init_schema()
+        after = run(store, args.calls, args.history)
+        store.close()
+
+    print(f"{'operation':>24} {'connect/call ms':>16} {'OrderStore ms':>14}")
+    for name in before:
+        print(f"{name:>24} {before[name]:>16.3f} {after[name]:>14.3f}")
+    print("(save_orders/update_statuses 는 전체 묶음 1회의 시간)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""미체결 주문 상태 동기화: 주문별 조회 vs 티커별 주문 목록 일괄 조회
+
+로컬 모의 거래소(MockUpbitServer)에 미체결 주문을 쌓아 두고, 주문 수를 늘려 가며
+HTTP 왕복 횟수와 소요 시간을 비교합니다. 절반은 체결된 상태로 만들어 DB 갱신도 포함합니다.
+기본값은 서버와 클라이언트 모두 Upbit 요청 수 제한(조회 초당 30건)을 지키며,
+--no-limits 를 주면 제한 없이 왕복 비용만 측정합니다.
+
+    python -m benchmarks.bench_order_sync --counts 10 100 500 --latency 0.005
+"""
+
+import argparse
+import time
+
+from mock_exchange import MockUpbitServer, connect, flat_candles, unlimited_scheduler
+from order_db import OrderStore, set_order_store
+from paper_exchange import PaperExchange
+from rebalance_engine import sync_pending_orders
+
+
+def _setup(count, tickers):
+    exchange = PaperExchange(
+        flat_candles(tickers),
+        krw=1e12,
+        coins={ticker.split("-")[1]: 1e6 for ticker in tickers},
+    )
+    store = OrderStore(":memory:")
+    store.init_schema()
+    rows = []
+    for i in range(count):
+        ticker = tickers[i % len(tickers)]
+        side = "sell" if i % 2 else "buy"
+        price = 11_000 + i if side == "sell" else 9_000 - i % 1_000
+        order = exchange.place_limit_order(ticker, side, price, 1.0)
+        rows.append((ticker, side, order["uuid"], price, 1.0, "wait"))
+        if i % 2:
+            # 절반은 체결된 것으로 만들어 상태 변경을 DB 에 반영하게 함
+            exchange._fill(exchange.orders[order["uuid"]])
+    store.save_orders(rows)
+    return exchange, store
+
+
+def per_order(api, store):
+    """기존 방식: 미체결 주문마다 개별 조회하고 한 건씩 갱신"""
+    for ticker, _, uuid, *_, status, _ in store.get_pending_orders():
+        new_status = api.check_order_status(uuid)
+        if new_status != status:
+            store.update_order_status(uuid, new_status)
+
+
+def batched(api, store):
+    sync_pending_orders(api, lambda event: None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--tickers", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="요청당 서버 지연(초)"
+    )
+    parser.add_argument("--no-limits", action="store_true")
+    args = parser.parse_args()
+    tickers = [f"KRW-C{i}" for i in range(args.tickers)]
+
+    print(f"{'pending':>8} {'mode':>10} {'requests':>9} {'seconds':>8}")
+    for count in args.counts:
+        for name, sync in (("per-order", per_order), ("batched", batched)):
+            exchange, store = _setup(count, tickers)
+            set_order_store(store)
+            with MockUpbitServer(
+                exchange, latency=args.latency, enforce_limits=not args.no_limits
+            ) as server:
+                scheduler = unlimited_scheduler() if args.no_limits else None
+                api = connect(server, scheduler=scheduler)
+                started = time.perf_counter()
+                sync(api, store)
+                elapsed = time.perf_counter() - started
+                requests = sum(server.calls.values())
+            assert len(store.get_pending_orders()) == count - count // 2
+            print(f"{count:>8} {name:>10} {requests:>9} {elapsed:>8.3f}")
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""주문 가격 계산 처리량: 고정 비율, 일괄 호가 맞춤, 저장된 캔들 기반 ATR
+
+티커 수를 늘려 가며 티커마다 leg_prices 를 호출할 때, snap_prices 로 전체 가격 배열을
+한 번에 호가 단위에 맞출 때, LegPricer 가 메모리 매핑된 1시간 캔들 파일에서 ATR 을
+계산할 때의 초당 처리 티커 수를 측정합니다. ATR 은 캔들 갱신을 한 번 마친 뒤 측정합니다.
+
+    python -m benchmarks.bench_pricing --tickers 1000 5000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pricing import PRICING_ATR, LegPricer, leg_prices, snap_prices
+from rebalance_engine import RebalanceConfig
+from utils.candle_store import CANDLE_COLUMNS, CandleStore, now_kst
+
+
+class RandomWalkSource:
+    """티커마다 다른 무작위 1시간 캔들을 한 번만 돌려주는 소스"""
+
+    def __init__(self, hours=48, seed=0):
+        self.hours = hours
+        self.rng = np.random.default_rng(seed)
+
+    def fetch(self, ticker, interval, to, count):
+        if to is not None:
+            return pd.DataFrame(columns=CANDLE_COLUMNS)
+        index = pd.date_range(end=now_kst().floor("h"), periods=self.hours, freq="h")
+        close = 10_000 * np.exp(np.cumsum(self.rng.normal(0, 0.01, self.hours)))
+        spread = close * self.rng.uniform(0.001, 0.02, self.hours)
+        return pd.DataFrame(
+            {
+                "open": close,
+                "high": close + spread,
+                "low": close - spread,
+                "close": close,
+                "volume": close,
+            },
+            index=index,
+        )
+
+
+class OfflineSource:
+    def fetch(self, ticker, interval, to, count):
+        return pd.DataFrame(columns=CANDLE_COLUMNS)
+
+
+def _rate(fn, count):
+    started = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'tickers':>8} {'mode':>14} {'tickers/s':>12}")
+    for count in args.tickers:
+        tickers = [f"KRW-C{i}" for i in range(count)]
+        prices = 10 ** rng.uniform(0, 7, count)
+        with tempfile.TemporaryDirectory() as directory:
+            writer = CandleStore(directory, RandomWalkSource())
+            for ticker in tickers:
+                writer.update(ticker, "minute60", days_ago=2)
+            pricer = LegPricer(CandleStore(directory, OfflineSource()))
+            configs = [
+                RebalanceConfig(ticker, 0.1, 0.05, 1, pricing=PRICING_ATR)
+                for ticker in tickers
+            ]
+            for config, price in zip(configs, prices):
+                pricer.quote(None, config, price)
+
+            rows = {
+                "fixed loop": lambda: [leg_prices(p, 0.05) for p in prices],
+                "batched snap": lambda: (
+                    snap_prices(prices * 1.05, "sell"),
+                    snap_prices(prices * 0.95, "buy"),
+                ),
+                "atr": lambda: [
+                    pricer.quote(None, c, p) for c, p in zip(configs, prices)
+                ],
+            }
+            for name, fn in rows.items():
+                print(f"{count:>8} {name:>14} {_rate(fn, count):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
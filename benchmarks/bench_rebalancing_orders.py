@@ -0,0 +1,86 @@
+"""주문 쌍 제출 지연 시간: 순차 제출 vs 동시 제출, 한쪽 실패 시 재시도 포함
+
+로컬 모의 거래소(MockUpbitServer)에 요청당 지연을 주고, 매도/매수 주문 한 쌍을
+하나씩 차례로 낼 때와 rebalancing_orders 로 동시에 낼 때의 쌍당 지연 시간을 비교합니다.
+retry 는 매수 주문에 서버 오류(500)를 한 번 주입해 place_rebalance_pair 의
+재시도 경로와 주문 의도/주문 DB(메모리) 기록까지 포함한 시간입니다. 요청 수 제한은 끄고 왕복 지연만 측정합니다.
+
+    python -m benchmarks.bench_rebalancing_orders --latencies 0 0.01 0.05 --pairs 50
+"""
+
+import argparse
+import statistics
+import time
+
+from mock_exchange import MockUpbitServer, connect, flat_candles, unlimited_scheduler
+from order_db import OrderStore, set_order_store
+from paper_exchange import PaperExchange
+from rebalance_engine import RebalanceConfig, place_rebalance_pair
+
+TICKER = "KRW-BTC"
+LEGS = {"sell": 10_500.0, "buy": 9_500.0}
+AMOUNT = 1.0
+
+
+def sequential(api, server):
+    for side, price in LEGS.items():
+        api.place_limit_order(TICKER, side, price, AMOUNT)
+
+
+def concurrent(api, server):
+    api.rebalancing_orders(TICKER, 10_000.0, AMOUNT, 0.05, prices=LEGS)
+
+
+def retry(api, server):
+    server.inject("POST", "/v1/orders", status=500, side="buy")
+    config = RebalanceConfig(TICKER, 0.01, 0.05, 1)
+    assert place_rebalance_pair(
+        api, lambda event: None, config, 10_000.0, 100.0, legs=LEGS
+    )
+
+
+def _measure(mode, latency, pairs):
+    exchange = PaperExchange(flat_candles([TICKER]), krw=1e12, coins={"BTC": 1e6})
+    store = OrderStore(":memory:")
+    store.init_schema()
+    set_order_store(store)
+    with MockUpbitServer(exchange, latency=latency, enforce_limits=False) as server:
+        api = connect(server, scheduler=unlimited_scheduler())
+        try:
+            samples = []
+            for _ in range(pairs):
+                started = time.perf_counter()
+                mode(api, server)
+                samples.append((time.perf_counter() - started) * 1e3)
+        finally:
+            api._order_pool.shutdown()
+    store.close()
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--latencies",
+        type=float,
+        nargs="+",
+        default=[0.0, 0.01, 0.05],
+        help="요청당 서버 지연(초)",
+    )
+    parser.add_argument("--pairs", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'latency':>8} {'mode':>11} {'p50 ms':>8} {'p95 ms':>8}")
+    for latency in args.latencies:
+        for name, mode in (
+            ("sequential", sequential),
+            ("concurrent", concurrent),
+            ("retry", retry),
+        ):
+            p50, p95 = _measure(mode, latency, args.pairs)
+            print(f"{latency:>8.3f} {name:>11} {p50:>8.2f} {p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
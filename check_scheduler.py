@@ -0,0 +1,90 @@
+import math
+import random
+import time
+
+# 주문 가격에 가까워도 점검 간격은 이 시간(초)보다 짧아지지 않음
+MIN_CHECK_SECONDS = 60
+# 가격이 주문에 닿을 때까지의 예상 시간 중 이 비율이 지나면 점검
+HIT_TIME_FRACTION = 0.5
+# 변동성(초당 로그 수익률 분산) 지수 이동 평균에서 새 관측값의 비중
+VOLATILITY_ALPHA = 0.05
+# 연속 오류 시 재시도 대기: BACKOFF_BASE_SECONDS * 2^(n-1), 최대 BACKOFF_MAX_SECONDS
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 600
+
+
+def leg_crossed(legs, price):
+    """현재가가 매도 주문 가격 이상이거나 매수 주문 가격 이하이면 True"""
+    if not legs or not price:
+        return False
+    return price >= legs.get("sell", math.inf) or price <= legs.get("buy", -math.inf)
+
+
+class CheckScheduler:
+    """주문 쌍마다 다음 점검 시각을 정하는 스케줄러
+
+    현재가와 미체결 주문 가격의 거리(로그 수익률)를 최근 변동성으로 나눠 가격이
+    주문에 닿을 때까지의 예상 시간((거리 / σ)^2)을 구하고, 그 일부가 지난 시점에
+    점검합니다. term_hour 는 최대 점검 간격으로만 쓰입니다.
+    현재가는 observe() 로 전달받은 값만 사용하므로 추가 REST 요청이 없으며,
+    clock 과 rng 를 바꾸면 모의 시계로 일정을 재현할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        clock=time.monotonic,
+        rng: random.Random | None = None,
+        min_seconds=MIN_CHECK_SECONDS,
+    ):
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.min_seconds = min_seconds
+        self._last = {}
+        self._variance = {}
+        self._errors = 0
+
+    def observe(self, ticker, price):
+        """시세 관측값으로 티커의 변동성 추정치를 갱신합니다."""
+        now = self.clock()
+        last = self._last.get(ticker)
+        self._last[ticker] = (price, now)
+        if last is None or not price or not last[0] or now <= last[1]:
+            return
+        rate = math.log(price / last[0]) ** 2 / (now - last[1])
+        variance = self._variance.get(ticker)
+        self._variance[ticker] = (
+            rate
+            if variance is None
+            else variance + VOLATILITY_ALPHA * (rate - variance)
+        )
+
+    def last_price(self, ticker):
+        last = self._last.get(ticker)
+        return last[0] if last else None
+
+    def next_delay(self, ticker, legs, max_seconds):
+        """미체결 주문 가격 legs({"sell", "buy"})로 다음 점검까지 대기할 시간(초)을 계산합니다.
+
+        미체결 주문이 없거나 현재가/변동성을 모르면 max_seconds 를 반환합니다.
+        """
+        price = self.last_price(ticker)
+        variance = self._variance.get(ticker)
+        if not legs or not price or not variance:
+            return max_seconds
+        if leg_crossed(legs, price):
+            return min(self.min_seconds, max_seconds)
+        distance = min(abs(math.log(leg / price)) for leg in legs.values())
+        hit_seconds = distance**2 / variance
+        return min(max(HIT_TIME_FRACTION * hit_seconds, self.min_seconds), max_seconds)
+
+    def backoff(self):
+        """연속 오류 횟수에 따라 두 배씩 늘어나는 재시도 대기 시간(초)을 반환합니다.
+
+        여러 엔진이 같은 시각에 재시도하지 않도록 상한의 절반에서 상한 사이로 흩뜨립니다.
+        """
+        self._errors += 1
+        cap = min(BACKOFF_BASE_SECONDS * 2 ** (self._errors - 1), BACKOFF_MAX_SECONDS)
+        return cap / 2 + self.rng.uniform(0, cap / 2)
+
+    def reset_backoff(self):
+        self._errors = 0
@@ -0,0 +1,219 @@
+import argparse
+import json
+import signal
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+from analytics import load_ticker_summary
+from events import EventLog
+from market_data import POLL_INTERVAL, MarketDataHub
+from order_db import (
+    count_orders,
+    get_order_tickers,
+    get_orders_page,
+    get_recent_orders,
+    get_ticker_states,
+    init_order_db,
+)
+from pricing import PRICING_FIXED
+from rebalance_engine import RebalanceConfig, RebalanceEngine
+from upbit_api import UpbitAPI
+from utils.common_utils import get_env, load_config
+from utils.log_buffer import LEVELS, LogBuffer
+from utils.metrics import REGISTRY
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class EngineDaemon:
+    """리밸런싱 엔진을 Streamlit 과 분리된 프로세스에서 실행하고 상태를 보관하는 데몬"""
+
+    def __init__(
+        self,
+        api: UpbitAPI,
+        configs,
+        log_buffer: LogBuffer,
+        event_log: EventLog | None = None,
+        **engine_kwargs,
+    ):
+        self.configs = configs
+        self.log_buffer = log_buffer
+        self.event_log = event_log
+        self.engine = RebalanceEngine(api, configs, log=self.log, **engine_kwargs)
+        self.stop_event = threading.Event()
+        self.started_at = None
+        self._thread = None
+
+    def log(self, message):
+        self.log_buffer.extend([message])
+        if self.event_log:
+            self.event_log.append(message)
+
+    def start(self):
+        self.started_at = datetime.now()
+        self._thread = threading.Thread(
+            target=self.engine.run, args=(self.stop_event,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self._thread:
+            self._thread.join()
+        if self.event_log:
+            self.event_log.flush()
+
+    def status(self):
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "started_at": self.started_at,
+            "configs": [config.__dict__ for config in self.configs],
+            "ticker_states": get_ticker_states(),
+        }
+
+
+def make_handler(daemon: EngineDaemon):
+    class Handler(BaseHTTPRequestHandler):
+        """GET /status, /logs, /orders, /orders/page, /analytics, /events 는 JSON, /metrics 는 Prometheus 텍스트로 제공하는 읽기 전용 핸들러"""
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if url.path == "/status":
+                body = daemon.status()
+            elif url.path == "/logs":
+                body = daemon.log_buffer.render_text(
+                    int(params.get("limit", 200)),
+                    LEVELS.get(params.get("level", "INFO"), LEVELS["INFO"]),
+                ).split("\n")
+            elif url.path == "/orders":
+                body = get_recent_orders(int(params.get("limit", 20)))
+            elif url.path == "/orders/page":
+                filters = (params.get("ticker"), params.get("status"))
+                body = {
+                    "rows": get_orders_page(
+                        int(params.get("offset", 0)),
+                        int(params.get("limit", 50)),
+                        *filters,
+                    ),
+                    "total": count_orders(*filters),
+                    "tickers": get_order_tickers(),
+                }
+            elif url.path == "/analytics":
+                body = load_ticker_summary()
+            elif url.path == "/events" and daemon.event_log:
+                since = params.get("since")
+                body = daemon.event_log.query(
+                    ticker=params.get("ticker"),
+                    types=params["type"].split(",") if "type" in params else None,
+                    since=float(since) if since else None,
+                )
+            elif url.path == "/metrics":
+                self._send(REGISTRY.render_prometheus().encode(), PROMETHEUS_TYPE)
+                return
+            else:
+                self.send_error(404)
+                return
+            payload = json.dumps(body, default=str, ensure_ascii=False).encode()
+            self._send(payload, "application/json; charset=utf-8")
+
+        def _send(self, payload, content_type):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            # 주기적인 UI 폴링 요청으로 콘솔이 채워지지 않도록 접근 로그는 생략
+            pass
+
+    return Handler
+
+
+def load_engine_configs(daemon_config):
+    """config.yaml 의 daemon.tickers 항목(비율은 % 단위)을 RebalanceConfig 로 변환합니다."""
+    return [
+        RebalanceConfig(
+            ticker=item["ticker"],
+            ratio=item["ratio"] / 100,
+            price_ratio=item["price_ratio"] / 100,
+            term_hour=item["term_hour"],
+            pricing=item.get("pricing", PRICING_FIXED),
+            atr_multiplier=item.get("atr_multiplier", 1.0),
+            use_orderbook=item.get("use_orderbook", False),
+        )
+        for item in daemon_config["tickers"]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리밸런싱 엔진 헤드리스 데몬")
+    parser.add_argument("--config", default="config.yaml")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    daemon_config = config["daemon"]
+    load_dotenv(verbose=True, dotenv_path="envs/.env", override=True)
+    access_key = get_env("ACCESS_KEY")
+    secret_key = get_env("SECRET_KEY")
+    if not access_key or not secret_key:
+        raise SystemExit("Upbit API 키가 설정되지 않았습니다. .env 파일을 확인하세요.")
+
+    init_order_db()
+    if config.get("async_api"):
+        # aiohttp 는 비동기 클라이언트를 쓸 때만 import
+        from async_upbit_api import SyncUpbitAPI
+
+        api = SyncUpbitAPI(access_key, secret_key)
+    else:
+        api = UpbitAPI(access_key, secret_key)
+    market_data = MarketDataHub(
+        api.fetch_current_prices, config.get("market_data_interval", POLL_INTERVAL)
+    )
+    daemon = EngineDaemon(
+        api,
+        load_engine_configs(daemon_config),
+        LogBuffer(config["log_buffer_capacity"], config["log_spill_path"]),
+        EventLog(config["event_log_path"]),
+        max_workers=daemon_config.get("max_workers", 8),
+        use_stream=daemon_config.get("use_stream", False),
+        market_data=market_data,
+    )
+    # 시세 조회 오류도 엔진 로그와 이벤트 저장소에 남김
+    market_data.log = daemon.log
+    server = ThreadingHTTPServer(
+        (
+            daemon_config.get("host", DEFAULT_HOST),
+            daemon_config.get("port", DEFAULT_PORT),
+        ),
+        make_handler(daemon),
+    )
+
+    def shutdown(signum, frame):
+        # serve_forever 를 돌리는 메인 스레드에서 shutdown 을 직접 호출하면 교착되므로 별도 스레드 사용
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    market_data.start()
+    daemon.start()
+    print(f"[데몬 시작] http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    finally:
+        daemon.stop()
+        market_data.stop()
+        server.server_close()
+        print("[데몬 종료]")
+
+
+if __name__ == "__main__":
+    main()
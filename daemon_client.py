@@ -0,0 +1,40 @@
+import requests
+
+# UI 가 데몬 응답을 기다리는 최대 시간(초)
+REQUEST_TIMEOUT = 3
+
+
+class DaemonClient:
+    """daemon.py 가 제공하는 HTTP 엔드포인트를 읽는 읽기 전용 클라이언트"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def _get(self, path, **params):
+        response = self.session.get(
+            f"{self.base_url}{path}", params=params, timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def get_status(self):
+        return self._get("/status")
+
+    def get_logs(self, limit=200, level="INFO"):
+        return self._get("/logs", limit=limit, level=level)
+
+    def get_recent_orders(self, limit=20):
+        return self._get("/orders", limit=limit)
+
+    def get_orders_page(self, offset=0, limit=50, ticker=None, status=None):
+        """{"rows", "total", "tickers"}: 거른 주문 이력의 한 페이지, 전체 건수, 티커 목록"""
+        params = {"offset": offset, "limit": limit, "ticker": ticker, "status": status}
+        return self._get("/orders/page", **{k: v for k, v in params.items() if v})
+
+    def get_analytics(self):
+        return self._get("/analytics")
+
+    def get_events(self, ticker=None, type=None, since=None):
+        params = {"ticker": ticker, "type": type, "since": since}
+        return self._get("/events", **{k: v for k, v in params.items() if v})
@@ -0,0 +1,206 @@
+import logging
+import os
+import threading
+import time
+import traceback
+from datetime import datetime
+
+from utils.json_utils import append_jsonl, load_jsonl
+
+# 이벤트 종류별 화면 표시 형식 (str() 로 처음 읽힐 때만 포맷)
+TEMPLATES = {
+    "loop_started": "[리밸런싱 루프 시작]",
+    "loop_stopped": "[리밸런싱 루프 종료]",
+    "loop_error": "[오류] 리밸런싱 루프 중 예외 발생: {error}",
+    "waiting": "[대기] {hours:.2f}시간 후 다음 확인을 시작합니다.",
+    "retry_wait": "[대기] {seconds:.0f}초 후 다시 시도합니다.",
+    "leg_crossed": "[{ticker}] [가격 도달] 현재가 {price:,} 가 주문 가격에 닿아 바로 확인합니다.",
+    "sync_started": "[주문 동기화] 미체결 주문 {count}건 상태 확인 시작",
+    "sync_failed": "[오류] 주문 상태 동기화 실패: {error}",
+    "invalid_uuid": "[경고] 유효하지 않은 UUID: {order}",
+    "status_updated": "[주문 상태 갱신] UUID: {uuid}, 상태: {status}",
+    "pending_checked": "[{ticker}] [미체결 주문 확인] {count}건",
+    "pending_wait": "[{ticker}] [상태] 미체결 주문이 남아있어 대기합니다. ({count}건)",
+    "intent_wait": "[{ticker}] [상태] 접수 여부를 확인하지 못한 주문이 있어 대기합니다. ({count}건)",
+    "all_filled": "[{ticker}] [상태] 모든 주문 체결 완료. 신규 리밸런싱 주문을 시작합니다.",
+    "sizing": "[{ticker}] 현재가: {price}, 보유 수량: {balance}, 주문 수량: {amount}",
+    "price_missing": "[{ticker}] [오류] 현재가를 조회하지 못했습니다.",
+    "below_min_order": (
+        "[{ticker}] [경고] 주문 금액이 최소 주문 금액({min_order:,} KRW)보다 작아 건너뜁니다. "
+        "(매도: {sell_notional:,.0f} KRW, 매수: {buy_notional:,.0f} KRW)"
+    ),
+    "krw_budget_exceeded": (
+        "[{ticker}] [경고] 매수에 필요한 KRW가 부족해 건너뜁니다. "
+        "(필요: {required:,.0f} KRW, 남은 잔액: {available:,.0f} KRW)"
+    ),
+    "order_info_missing": (
+        "[오류] 주문 정보가 비어있거나 UUID가 없습니다. 주문 저장을 건너뜁니다. "
+        "[진단] 주문 수량: {amount}, 최소 주문 금액: {notional}, 전체 주문 정보: {order_info}"
+    ),
+    "order_placed": "[{ticker}] [{side_label} 주문] 가격: {price:.2f}, 수량: {amount}",
+    "order_error": "[{ticker}] [오류] 신규 주문 발주 중 예외 발생: {error}",
+    "leg_retry": "[{ticker}] [경고] {side} 주문 실패, 재시도합니다.",
+    "leg_rollback": "[{ticker}] [오류] {side} 주문 재시도 실패, {placed_side} 주문을 취소합니다.",
+    "leg_cancel_failed": (
+        "[{ticker}] [오류] {side} 주문 취소 실패, 다음 동기화에서 상태를 확인합니다. UUID: {uuid}"
+    ),
+    "reconcile_started": "[주문 복구] 확인되지 않은 주문 의도 {count}건 대조 시작",
+    "reconcile_failed": "[{ticker}] [오류] 주문 의도 대조 중 주문 목록 조회 실패: {error}",
+    "intent_recovered": "[{ticker}] [주문 복구] {side_label} 주문 UUID: {uuid}",
+    "reconcile_done": "[주문 복구] 복구 {recovered}건, 미접수 정리 {dropped}건",
+    "stream_started": "[실시간 체결 감지] 주문 스트림 구독 시작",
+    "stream_order": "[{ticker}] [실시간 체결 감지] UUID: {uuid}, 상태: {status}",
+    "pricing_fallback": (
+        "[{ticker}] [경고] ATR 을 계산할 {interval} 캔들({period}개 이상)이 없어 "
+        "고정 비율({price_ratio:.1%})로 주문합니다."
+    ),
+    "candle_refresh_failed": "[{ticker}] [경고] ATR 캔들 갱신 실패, 저장된 캔들을 사용합니다: {error}",
+    "market_data_error": "[경고] 현재가 허브 갱신 중 오류: {error}",
+    "account_refresh_failed": "[경고] 잔고/티커 목록 조회 실패, 마지막 값을 표시합니다: {error}",
+    "stream_error": "[경고] 주문 스트림 연결 오류, 재연결합니다: {error}",
+}
+ERROR_EVENTS = {
+    "loop_error",
+    "sync_failed",
+    "price_missing",
+    "order_info_missing",
+    "order_error",
+    "leg_rollback",
+    "leg_cancel_failed",
+    "reconcile_failed",
+}
+WARNING_EVENTS = {
+    "invalid_uuid",
+    "leg_retry",
+    "below_min_order",
+    "krw_budget_exceeded",
+    "stream_error",
+    "pricing_fallback",
+    "candle_refresh_failed",
+    "market_data_error",
+    "account_refresh_failed",
+}
+SIDE_LABELS = {"sell": "매도", "buy": "매수"}
+
+
+class Event:
+    """리밸런싱 엔진이 남기는 구조화된 이벤트
+
+    생성 시에는 값만 담아 두고, 문자열이나 traceback 은 실제로 읽을 때 만듭니다.
+    """
+
+    __slots__ = ("ts", "type", "ticker", "fields", "exc", "_text")
+
+    def __init__(self, type, ticker=None, exc=None, **fields):
+        self.ts = time.time()
+        self.type = type
+        self.ticker = ticker
+        self.fields = fields
+        self.exc = exc
+        self._text = None
+
+    @property
+    def level(self):
+        if self.type in ERROR_EVENTS:
+            return logging.ERROR
+        if self.type in WARNING_EVENTS:
+            return logging.WARNING
+        return logging.INFO
+
+    def __str__(self):
+        if self._text is None:
+            fields = dict(self.fields)
+            if "side" in fields:
+                fields["side_label"] = SIDE_LABELS.get(fields["side"], fields["side"])
+            if self.exc is not None:
+                fields.setdefault("error", self.exc)
+            text = TEMPLATES.get(self.type, self.type).format(
+                ticker=self.ticker, **fields
+            )
+            if self.exc is not None:
+                text += "\n" + self.traceback()
+            self._text = text
+        return self._text
+
+    def traceback(self):
+        if self.exc is None:
+            return None
+        return "".join(traceback.format_exception(self.exc))
+
+    def to_dict(self):
+        return {
+            "ts": self.ts,
+            "type": self.type,
+            "ticker": self.ticker,
+            "level": logging.getLevelName(self.level),
+            "fields": {k: _jsonable(v) for k, v in self.fields.items()},
+            "traceback": self.traceback(),
+        }
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return str(value)
+
+
+class EventLog:
+    """이벤트를 모아 두었다가 JSONL 파일에 한 번에 추가하는 이벤트 저장소"""
+
+    def __init__(self, path, batch_size=100, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def append(self, event):
+        if not isinstance(event, Event):
+            return
+        with self._lock:
+            self._pending.append(event)
+            due = (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            if pending:
+                append_jsonl(self.path, [event.to_dict() for event in pending])
+
+    def query(self, ticker=None, types=None, since=None, until=None):
+        """티커, 이벤트 종류, 시간 범위(datetime)로 저장된 이벤트를 걸러 반환합니다."""
+        self.flush()
+        if not os.path.exists(self.path):
+            return []
+        since_ts = since.timestamp() if isinstance(since, datetime) else since
+        until_ts = until.timestamp() if isinstance(until, datetime) else until
+        return [
+            record
+            for record in load_jsonl(self.path)
+            if (ticker is None or record["ticker"] == ticker)
+            and (types is None or record["type"] in types)
+            and (since_ts is None or record["ts"] >= since_ts)
+            and (until_ts is None or record["ts"] < until_ts)
+        ]
+
+
+def fan_out(*sinks):
+    """하나의 이벤트를 여러 곳(로그 큐, 이벤트 저장소 등)에 전달하는 log 함수를 만듭니다."""
+
+    def log(event):
+        for sink in sinks:
+            sink(event)
+
+    return log
@@ -0,0 +1,153 @@
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from events import Event
+
+# 구독 중인 티커 전체의 현재가를 일괄 조회하는 간격(초)
+POLL_INTERVAL = 1
+# 마지막 갱신이 이 시간(초)보다 오래되면 스냅샷 대신 바로 다시 조회
+STALE_SECONDS = 10
+
+
+@dataclass(frozen=True)
+class PriceSnapshot:
+    """한 번의 일괄 조회 결과 (읽기 전용)"""
+
+    prices: MappingProxyType
+    version: int
+    updated_at: float
+
+    def is_stale(self, stale_seconds):
+        return time.monotonic() - self.updated_at > stale_seconds
+
+
+EMPTY_SNAPSHOT = PriceSnapshot(MappingProxyType({}), 0, float("-inf"))
+
+
+class MarketDataHub:
+    """모든 Streamlit 세션과 리밸런싱 엔진이 함께 쓰는 현재가 허브
+
+    구독된 티커 전체를 백그라운드 스레드에서 주기마다 한 번의 요청으로 조회하고,
+    결과를 새 PriceSnapshot 으로 통째로 교체해 공개합니다. 읽는 쪽은 잠금 없이
+    현재 스냅샷 참조만 가져오므로, 세션과 티커 수가 늘어도 네트워크 요청은 늘지 않습니다.
+
+    fetch_prices 는 티커 목록을 받아 {ticker: price} 를 반환하는 함수입니다
+    (보통 캐시를 거치지 않는 UpbitAPI.fetch_current_prices). UpbitAPI 와 같은
+    get_current_price(s) 를 제공하므로 엔진에는 api 대신 시세 조회용으로 넘길 수 있습니다.
+    조회/콜백 오류는 log 에 market_data_error 이벤트로 남깁니다.
+    """
+
+    def __init__(
+        self,
+        fetch_prices,
+        interval=POLL_INTERVAL,
+        stale_seconds=STALE_SECONDS,
+        log=None,
+    ):
+        self.fetch_prices = fetch_prices
+        self.interval = interval
+        self.stale_seconds = stale_seconds
+        self.log = log or (lambda event: None)
+        # 티커 집합과 콜백 목록도 쓰기 때만 새 객체로 교체 (읽기는 잠금 없음)
+        self._snapshot = EMPTY_SNAPSHOT
+        self._tickers = frozenset()
+        self._callbacks = ()
+        # 구독 변경용 잠금과 조회용 잠금을 분리해, 네트워크 조회 중에도 구독은 바로 반환
+        self._write_lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+
+    def is_alive(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def subscribe(self, tickers, callback=None):
+        """tickers 를 조회 대상에 더합니다.
+
+        callback 은 갱신마다 새 PriceSnapshot 을 인자로 조회 스레드에서 호출되므로
+        빠르게 반환해야 합니다.
+        """
+        with self._write_lock:
+            self._tickers = self._tickers | frozenset(tickers)
+            if callback is not None:
+                self._callbacks = (*self._callbacks, callback)
+
+    def unsubscribe(self, callback):
+        with self._write_lock:
+            self._callbacks = tuple(cb for cb in self._callbacks if cb is not callback)
+
+    def snapshot(self) -> PriceSnapshot:
+        return self._snapshot
+
+    def get_current_price(self, ticker):
+        return self.get_current_prices([ticker]).get(ticker)
+
+    def get_current_prices(self, tickers):
+        """스냅샷에서 {ticker: price} 를 반환합니다.
+
+        처음 보는 티커가 있거나 스냅샷이 오래되었으면 구독에 더하고 바로 한 번 갱신합니다.
+        """
+        snapshot = self._snapshot
+        if snapshot.is_stale(self.stale_seconds) or any(
+            ticker not in snapshot.prices for ticker in tickers
+        ):
+            self.subscribe(tickers)
+            snapshot = self.refresh(tickers)
+        return {
+            ticker: snapshot.prices[ticker]
+            for ticker in tickers
+            if ticker in snapshot.prices
+        }
+
+    def refresh(self, required=()):
+        """구독 중인 티커 전체를 한 번에 조회해 스냅샷을 교체하고 반환합니다.
+
+        여러 스레드가 동시에 요청하면 먼저 조회 잠금을 얻은 스레드만 조회하고,
+        나머지는 그 결과에 required 티커가 모두 있으면 그대로 사용합니다.
+        조회 중에는 구독 잠금을 잡지 않으므로 subscribe() 는 기다리지 않습니다.
+        """
+        with self._fetch_lock:
+            snapshot = self._snapshot
+            if (
+                required
+                and not snapshot.is_stale(self.stale_seconds)
+                and all(ticker in snapshot.prices for ticker in required)
+            ):
+                return snapshot
+            tickers = sorted(self._tickers)
+            if not tickers:
+                return snapshot
+            fetched = self.fetch_prices(tickers) or {}
+            prices = {**snapshot.prices, **fetched}
+            snapshot = PriceSnapshot(
+                MappingProxyType(prices), snapshot.version + 1, time.monotonic()
+            )
+            self._snapshot = snapshot
+            callbacks = self._callbacks
+        for callback in callbacks:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                self.log(Event("market_data_error", exc=e))
+        return snapshot
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.log(Event("market_data_error", exc=e))
+            self._stop_event.wait(self.interval)
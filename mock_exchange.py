@@ -0,0 +1,255 @@
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from paper_exchange import PaperExchange
+from upbit_api import RATE_LIMITS_PER_SEC, UpbitAPI
+from utils.rate_limiter import RequestScheduler, TokenBucket
+
+UPBIT_TO_SIDE = {"ask": "sell", "bid": "buy"}
+# Upbit 의 요청 수 제한 그룹별 초당 허용 요청 수
+GROUP_LIMITS_PER_SEC = {"order": 8, "default": 30, "ticker": 10, "orderbook": 10}
+# 모의 서버는 서명을 검사하지 않으므로 형식만 맞춘 키
+MOCK_ACCESS_KEY = "mock-access-key"
+MOCK_SECRET_KEY = "mock-secret-key-for-local-tests-only"
+TOO_MANY_REQUESTS_BODY = {
+    "error": {"name": "too_many_requests", "message": "Too many API requests."}
+}
+
+
+def flat_candles(tickers, price=10_000.0, length=2, freq="1min"):
+    """모든 티커의 가격이 price 로 고정된 캔들 (체결 없이 주문만 쌓이는 거래소용)"""
+    index = pd.date_range("2024-01-01", periods=length, freq=freq)
+    column = np.full(length, float(price))
+    frame = pd.DataFrame({"high": column, "low": column, "close": column}, index=index)
+    return {ticker: frame for ticker in tickers}
+
+
+def unlimited_scheduler():
+    """요청 수 제한 없이 통과시키는 스케줄러 (한도와 무관한 왕복 비용 측정용)"""
+    return RequestScheduler({group: TokenBucket(1e9) for group in RATE_LIMITS_PER_SEC})
+
+
+def connect(server, api_class=UpbitAPI, **kwargs):
+    """server 에 연결된 api_class(UpbitAPI, SyncUpbitAPI 등) 인스턴스를 만듭니다."""
+    return api_class(MOCK_ACCESS_KEY, MOCK_SECRET_KEY, base_url=server.url, **kwargs)
+
+
+def _request_group(method, path):
+    if path == "/v1/ticker":
+        return "ticker"
+    if path == "/v1/orderbook":
+        return "orderbook"
+    if (method, path) in (("POST", "/v1/orders"), ("DELETE", "/v1/order")):
+        return "order"
+    return "default"
+
+
+class MockUpbitServer:
+    """PaperExchange 를 Upbit REST API 형식으로 노출하는 로컬 HTTP 모의 서버
+
+    UpbitAPI(base_url=server.url) 처럼 연결해 실제 네트워크 왕복과 JSON 직렬화를
+    거치는 테스트/벤치마크에 사용합니다. 그룹별 요청 수 제한을 서버에서 강제해
+    넘으면 429 를 돌려주고, 정상 응답에는 Remaining-Req 헤더를 붙입니다.
+    inject() 로 특정 요청에 오류 응답이나 지연을 주입할 수 있습니다.
+    """
+
+    def __init__(self, exchange: PaperExchange, latency=0.0, enforce_limits=True):
+        self.exchange = exchange
+        self.latency = latency
+        self.enforce_limits = enforce_limits
+        self.calls = Counter()
+        self.rejected = Counter()
+        self._buckets = {
+            group: TokenBucket(rate) for group, rate in GROUP_LIMITS_PER_SEC.items()
+        }
+        self._faults = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def inject(self, method, path, status=None, delay=0.0, times=1, side=None):
+        """다음 times 번의 (method, path) 요청에 status 오류 응답 또는 delay 초 지연을 줍니다.
+
+        side("sell"/"buy")를 주면 해당 방향의 주문 요청에만 적용합니다.
+        """
+        with self._lock:
+            self._faults.append(
+                {
+                    "method": method,
+                    "path": path,
+                    "side": side,
+                    "status": status,
+                    "delay": delay,
+                    "times": times,
+                }
+            )
+
+    def reset_counts(self):
+        with self._lock:
+            self.calls.clear()
+            self.rejected.clear()
+
+    def _take_fault(self, method, path, side):
+        with self._lock:
+            for fault in self._faults:
+                if (
+                    fault["method"] == method
+                    and fault["path"] == path
+                    and fault["side"] in (None, side)
+                ):
+                    fault["times"] -= 1
+                    if fault["times"] <= 0:
+                        self._faults.remove(fault)
+                    return fault
+        return None
+
+    def _reserve(self, group):
+        """허용되면 남은 초당 요청 수를, 한도를 넘었으면 None 을 반환합니다."""
+        with self._lock:
+            bucket = self._buckets[group]
+            if bucket.reserve() != 0 and self.enforce_limits:
+                self.rejected[group] += 1
+                return None
+            return max(int(bucket.tokens), 0)
+
+    def handle(self, method, path, query, body):
+        """(HTTP 상태, 응답 본문, 요청 수 제한 그룹, 남은 요청 수)를 반환합니다."""
+        side = UPBIT_TO_SIDE.get(body.get("side"))
+        group = _request_group(method, path)
+        with self._lock:
+            self.calls[(method, path)] += 1
+        remaining = self._reserve(group)
+        if remaining is None:
+            return 429, TOO_MANY_REQUESTS_BODY, group, 0
+        if self.latency:
+            time.sleep(self.latency)
+        fault = self._take_fault(method, path, side)
+        if fault:
+            time.sleep(fault["delay"])
+            if fault["status"]:
+                error = {"error": {"name": "injected", "message": "injected fault"}}
+                return fault["status"], error, group, remaining
+        status, payload = self._dispatch(method, path, query, body, side)
+        return status, payload, group, remaining
+
+    def _dispatch(self, method, path, query, body, side):
+        exchange = self.exchange
+        if (method, path) == ("GET", "/v1/accounts"):
+            with exchange._lock:
+                currencies = set(exchange.balances) | set(exchange.locked)
+                accounts = [
+                    {
+                        "currency": currency,
+                        "balance": str(exchange.balances[currency]),
+                        "locked": str(exchange.locked[currency]),
+                        "avg_buy_price": "0",
+                        "unit_currency": "KRW",
+                    }
+                    for currency in sorted(currencies)
+                ]
+            return 200, accounts
+        if (method, path) == ("GET", "/v1/ticker"):
+            markets = query["markets"].split(",")
+            return 200, [
+                {"market": ticker, "trade_price": exchange.get_current_price(ticker)}
+                for ticker in markets
+                if ticker in exchange.series
+            ]
+        if (method, path) == ("GET", "/v1/orderbook"):
+            return 200, [exchange.get_orderbook(query["markets"])]
+        if (method, path) == ("POST", "/v1/orders"):
+            order = exchange.place_limit_order(
+                body["market"], side, float(body["price"]), float(body["volume"])
+            )
+            if order is None:
+                error = {"error": {"name": "insufficient_funds", "message": ""}}
+                return 400, error
+            return 201, order
+        if (method, path) == ("DELETE", "/v1/order"):
+            order = exchange.orders.get(query["uuid"])
+            if order is None or not exchange.cancel_order(query["uuid"]):
+                return 404, {"error": {"name": "order_not_found", "message": ""}}
+            return 200, dict(order)
+        if (method, path) == ("GET", "/v1/order"):
+            order = exchange.orders.get(query["uuid"])
+            if order is None:
+                return 404, {"error": {"name": "order_not_found", "message": ""}}
+            return 200, dict(order)
+        if (method, path) == ("GET", "/v1/orders"):
+            orders = exchange.get_orders(query["market"], query.get("state", "wait"))
+            limit = int(query.get("limit", 100))
+            start = (int(query.get("page", 1)) - 1) * limit
+            return 200, orders[start : start + limit]
+        return 404, {"error": {"name": "not_found", "message": path}}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 헤더와 본문을 따로 보내므로 Nagle 지연(약 40ms)이 왕복마다 붙지 않도록 끔
+            disable_nagle_algorithm = True
+
+            def _serve(self, method):
+                url = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                status, payload, group, remaining = server.handle(
+                    method, url.path, query, body
+                )
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header(
+                    "Remaining-Req", f"group={group}; min=1800; sec={remaining}"
+                )
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def do_DELETE(self):
+                self._serve("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
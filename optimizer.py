@@ -0,0 +1,181 @@
+import argparse
+import os
+import time
+
+import duckdb
+import pandas as pd
+
+from backtest import sweep
+from pricing import FEE_RATE
+from utils.candle_store import CandleStore
+from utils.common_utils import load_config
+
+DEFAULT_CONFIG = {
+    "db_path": "./intermediate/optimizer.duckdb",
+    "interval": "minute1",
+    "tickers": [],
+    "ratios": [5, 10, 15, 20],
+    "price_ratios": [3, 5, 10, 15, 20],
+    "term_hours": list(range(1, 25)),
+    "metric": "pnl",
+    "top_n": 20,
+    "fee_rate": FEE_RATE,
+    "max_workers": None,
+    # 저장된 캔들이 없을 때 받을 기간(일), 비워두면 config.yaml 의 최상위 days_ago
+    "days_ago": 30,
+}
+RANK_METRICS = ("pnl", "excess_pnl")
+RESULT_COLUMNS = [
+    "ratio",
+    "price_ratio",
+    "term_hour",
+    "pnl",
+    "excess_pnl",
+    "cycles",
+    "fees",
+]
+
+CREATE_RESULTS_SQL = """
+    CREATE TABLE IF NOT EXISTS optimizer_results (
+        ticker VARCHAR,
+        rank INTEGER,
+        metric VARCHAR,
+        ratio DOUBLE,
+        price_ratio DOUBLE,
+        term_hour DOUBLE,
+        pnl DOUBLE,
+        excess_pnl DOUBLE,
+        cycles INTEGER,
+        fees DOUBLE,
+        candles INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (ticker, rank)
+    )
+"""
+INSERT_RESULTS_SQL = """
+    INSERT INTO optimizer_results
+        (ticker, rank, metric, ratio, price_ratio, term_hour,
+         pnl, excess_pnl, cycles, fees, candles)
+    SELECT ?, rank, ?, ratio, price_ratio, term_hour,
+           pnl, excess_pnl, cycles, fees, ?
+    FROM ranked
+"""
+PRESETS_SQL = "SELECT * FROM optimizer_results WHERE ticker=? ORDER BY rank LIMIT ?"
+
+
+def load_optimizer_config(conf_file="config.yaml"):
+    """config.yaml 의 optimizer 항목을 기본값과 합쳐 반환합니다.
+
+    days_ago 는 optimizer 항목에 없으면 최상위 days_ago 를 씁니다.
+    """
+    config = load_config(conf_file)
+    defaults = {
+        **DEFAULT_CONFIG,
+        "days_ago": config.get("days_ago", DEFAULT_CONFIG["days_ago"]),
+    }
+    return {**defaults, **(config.get("optimizer") or {})}
+
+
+def rank_results(results, metric="pnl", top_n=None):
+    """metric 내림차순으로 정렬하고 1부터 시작하는 rank 열을 붙입니다."""
+    if metric not in RANK_METRICS:
+        raise ValueError(f"지원하지 않는 순위 기준입니다: {metric}")
+    ranked = results.sort_values(
+        [metric, "cycles"], ascending=False, ignore_index=True
+    )[RESULT_COLUMNS]
+    if top_n:
+        ranked = ranked.head(top_n)
+    ranked.insert(0, "rank", range(1, len(ranked) + 1))
+    return ranked
+
+
+def save_results(db_path, ticker, ranked, metric, candles):
+    """티커의 이전 결과를 지우고 순위가 매겨진 결과를 한 트랜잭션으로 저장합니다."""
+    con = duckdb.connect(db_path)
+    try:
+        con.execute(CREATE_RESULTS_SQL)
+        con.register("ranked", ranked)
+        con.execute("BEGIN TRANSACTION")
+        con.execute("DELETE FROM optimizer_results WHERE ticker=?", (ticker,))
+        con.execute(INSERT_RESULTS_SQL, (ticker, metric, candles))
+        con.execute("COMMIT")
+    finally:
+        con.close()
+
+
+def load_presets(db_path, ticker, limit=5):
+    """저장된 최적화 결과 중 상위 limit 개 설정을 딕셔너리 목록으로 반환합니다.
+
+    결과 파일이 없거나 다른 프로세스가 쓰는 중이면 빈 목록을 반환합니다.
+    """
+    if not os.path.exists(db_path):
+        return []
+    try:
+        con = duckdb.connect(db_path, read_only=True)
+    except duckdb.Error:
+        return []
+    try:
+        cursor = con.execute(PRESETS_SQL, (ticker, limit))
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except duckdb.CatalogException:
+        return []
+    finally:
+        con.close()
+
+
+def optimize_ticker(store: CandleStore, ticker, config, log=print):
+    """캔들 저장소를 갱신한 뒤 저장된 캔들로 티커 하나의 설정 조합 전체를 백테스트해
+    (순위 결과, 캔들 수)를 반환합니다.
+
+    갱신에 실패하면 log 에 경고를 남기고 이미 저장된 캔들로 진행합니다.
+    """
+    try:
+        store.update(ticker, config["interval"], config["days_ago"])
+    except Exception as e:
+        log(f"[{ticker}] [경고] 캔들 갱신 실패, 저장된 캔들로 진행합니다: {e}")
+    path = store.path(ticker, config["interval"])
+    if not os.path.exists(path):
+        return None, 0
+    results = sweep(
+        path,
+        [ratio / 100 for ratio in config["ratios"]],
+        [price_ratio / 100 for price_ratio in config["price_ratios"]],
+        config["term_hours"],
+        fee_rate=config["fee_rate"],
+        max_workers=config["max_workers"],
+    )
+    candles = len(pd.read_feather(path, columns=["close"]))
+    return rank_results(results, config["metric"], config["top_n"]), candles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리밸런싱 설정 최적화")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument(
+        "--ticker", nargs="+", help="config.yaml 의 optimizer.tickers 대신 사용"
+    )
+    args = parser.parse_args()
+
+    config = load_optimizer_config(args.config)
+    store = CandleStore.from_config(args.config)
+    combos = (
+        len(config["ratios"]) * len(config["price_ratios"]) * len(config["term_hours"])
+    )
+    for ticker in args.ticker or config["tickers"]:
+        started = time.perf_counter()
+        ranked, candles = optimize_ticker(store, ticker, config)
+        if ranked is None:
+            print(f"[{ticker}] {config['interval']} 캔들이 없어 건너뜁니다.")
+            continue
+        save_results(config["db_path"], ticker, ranked, config["metric"], candles)
+        elapsed = time.perf_counter() - started
+        print(
+            f"[{ticker}] 캔들 {candles:,}개, {combos:,}개 설정, {elapsed:.1f}초 "
+            f"-> {config['db_path']}"
+        )
+        print(ranked.head(5).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
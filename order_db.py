@@ -1,55 +1,628 @@
+import threading
+import uuid as uuid_lib
+from collections import defaultdict
+from contextlib import contextmanager
+
 import duckdb
 
+from utils.metrics import timed
 
-def init_order_db():
-    con = duckdb.connect("orders.duckdb")
-    con.execute(
+DB_PATH = "orders.duckdb"
+
+# 더 이상 상태가 바뀌지 않는 주문 상태
+TERMINAL_STATUSES = ("done", "cancel")
+# 마이그레이션 전 uuid 없이 저장된 주문에 붙이는 임시 uuid 접두어
+LEGACY_UUID_PREFIX = "legacy-"
+
+ORDER_COLUMNS_SQL = """
+        ticker VARCHAR,
+        order_type VARCHAR,
+        uuid VARCHAR PRIMARY KEY,
+        price DOUBLE,
+        amount DOUBLE,
+        status VARCHAR,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+"""
+INSERT_ORDER_SQL = (
+    "INSERT INTO orders (ticker, order_type, uuid, price, amount, status) "
+    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING"
+)
+# 시각을 주입하는 저장소(모의 거래 재생 시각 등)용
+INSERT_ORDER_AT_SQL = (
+    "INSERT INTO orders (ticker, order_type, uuid, price, amount, status, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING"
+)
+INSERT_OPEN_ORDER_SQL = "INSERT INTO open_orders SELECT * FROM orders WHERE uuid=?"
+UPDATE_STATUS_SQL = "UPDATE orders SET status=? WHERE uuid=?"
+UPDATE_OPEN_STATUS_SQL = "UPDATE open_orders SET status=? WHERE uuid=?"
+DELETE_OPEN_ORDER_SQL = "DELETE FROM open_orders WHERE uuid=?"
+RECENT_ORDERS_SQL = "SELECT * FROM orders ORDER BY created_at DESC LIMIT ?"
+ORDERS_PAGE_SQL = (
+    "SELECT * FROM orders{where} ORDER BY created_at DESC LIMIT ? OFFSET ?"
+)
+COUNT_ORDERS_SQL = "SELECT count(*) FROM orders{where}"
+PENDING_ORDERS_SQL = "SELECT * FROM open_orders ORDER BY created_at ASC"
+OPEN_ORDERS_BY_UUID_SQL = (
+    "SELECT * FROM open_orders WHERE list_contains(?, uuid) ORDER BY created_at ASC"
+)
+INSERT_INTENT_SQL = (
+    "INSERT INTO order_intents (intent_id, ticker, side, price, amount) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+DELETE_INTENT_SQL = "DELETE FROM order_intents WHERE intent_id=?"
+INTENT_IDS_SQL = "SELECT intent_id FROM order_intents"
+OPEN_INTENTS_SQL = (
+    "SELECT * FROM order_intents "
+    "WHERE created_at <= now() - to_seconds(?) ORDER BY created_at ASC"
+)
+KNOWN_UUIDS_SQL = "SELECT uuid FROM orders WHERE list_contains(?, uuid)"
+CLOSING_ORDERS_SQL = (
+    "SELECT uuid, ticker, order_type, price, amount, created_at FROM open_orders "
+    "WHERE list_contains(?, uuid)"
+)
+UPSERT_TICKER_STATS_SQL = """
+    INSERT INTO ticker_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, now())
+    ON CONFLICT (ticker) DO UPDATE SET
+        placed_count = ticker_stats.placed_count + excluded.placed_count,
+        filled_count = ticker_stats.filled_count + excluded.filled_count,
+        cancelled_count = ticker_stats.cancelled_count + excluded.cancelled_count,
+        buy_volume = ticker_stats.buy_volume + excluded.buy_volume,
+        buy_notional = ticker_stats.buy_notional + excluded.buy_notional,
+        sell_volume = ticker_stats.sell_volume + excluded.sell_volume,
+        sell_notional = ticker_stats.sell_notional + excluded.sell_notional,
+        fill_seconds = ticker_stats.fill_seconds + excluded.fill_seconds,
+        updated_at = excluded.updated_at
+"""
+UPSERT_TICKER_STATE_SQL = """
+    INSERT INTO ticker_state VALUES (
+        ?, ?, ?, ?, now(), CASE WHEN ? THEN now() END
+    )
+    ON CONFLICT (ticker) DO UPDATE SET
+        ratio = excluded.ratio,
+        price_ratio = excluded.price_ratio,
+        term_hour = excluded.term_hour,
+        last_checked_at = excluded.last_checked_at,
+        last_placed_at = coalesce(excluded.last_placed_at, ticker_state.last_placed_at)
+"""
+
+
+def _table_exists(cursor, name):
+    return (
+        cursor.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name=?",
+            (name,),
+        ).fetchone()[0]
+        > 0
+    )
+
+
+def _migrate_v1(cursor):
+    """uuid 기본키, ticker 인덱스, 미체결 주문 전용 open_orders 테이블을 도입합니다.
+
+    uuid 가 없는 기존 행은 이력에서 빠지지 않도록 LEGACY_UUID_PREFIX 로 시작하는
+    임시 uuid 를 붙여 옮기며, 거래소에 조회할 수 없으므로 open_orders 에는 넣지 않습니다.
+    """
+    cursor.execute(f"CREATE TABLE orders_v1 ({ORDER_COLUMNS_SQL})")
+    if _table_exists(cursor, "orders"):
+        # 기존 이력은 uuid 별 최신 행만 옮긴다
+        cursor.execute(
+            """
+            INSERT INTO orders_v1
+            SELECT * FROM orders
+            WHERE uuid IS NOT NULL
+            QUALIFY row_number() OVER (PARTITION BY uuid ORDER BY created_at DESC) = 1
+            """
+        )
+        cursor.execute(
+            """
+            INSERT INTO orders_v1
+            SELECT ticker, order_type,
+                   ? || row_number() OVER (ORDER BY created_at),
+                   price, amount, status, created_at
+            FROM orders
+            WHERE uuid IS NULL
+            """,
+            (LEGACY_UUID_PREFIX,),
+        )
+        cursor.execute("DROP TABLE orders")
+    cursor.execute("ALTER TABLE orders_v1 RENAME TO orders")
+    cursor.execute("CREATE INDEX idx_orders_ticker ON orders (ticker)")
+    cursor.execute(f"CREATE TABLE open_orders ({ORDER_COLUMNS_SQL})")
+    cursor.execute(
+        "INSERT INTO open_orders SELECT * FROM orders "
+        "WHERE status NOT IN ('done', 'cancel') AND NOT starts_with(uuid, ?)",
+        (LEGACY_UUID_PREFIX,),
+    )
+
+
+def _migrate_v2(cursor):
+    """리밸런싱 엔진의 티커별 설정과 최근 점검/발주 시각을 담는 ticker_state 테이블"""
+    cursor.execute(
+        """
+        CREATE TABLE ticker_state (
+            ticker VARCHAR PRIMARY KEY,
+            ratio DOUBLE,
+            price_ratio DOUBLE,
+            term_hour DOUBLE,
+            last_checked_at TIMESTAMP,
+            last_placed_at TIMESTAMP
+        )
+        """
+    )
+
+
+def _migrate_v3(cursor):
+    """주문 제출 전에 기록하고 접수 확인 후 지우는 주문 의도(write-ahead) 저널"""
+    cursor.execute(
         """
-        CREATE TABLE IF NOT EXISTS orders (
+        CREATE TABLE order_intents (
+            intent_id VARCHAR PRIMARY KEY,
             ticker VARCHAR,
-            order_type VARCHAR,
-            uuid VARCHAR,
+            side VARCHAR,
             price DOUBLE,
             amount DOUBLE,
-            status VARCHAR,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         """
     )
-    con.close()
 
 
-def save_order(ticker, order_type, uuid, price, amount, status):
-    con = duckdb.connect("orders.duckdb")
-    con.execute(
-        "INSERT INTO orders (ticker, order_type, uuid, price, amount, status) VALUES (?, ?, ?, ?, ?, ?)",
-        (ticker, order_type, uuid, price, amount, status),
+def _migrate_v4(cursor):
+    """티커별 주문/체결 집계를 상태 변경 시점마다 누적하는 ticker_stats 테이블
+
+    기존 이력은 한 번만 집계해 채우며, 체결 소요 시간은 알 수 없으므로 0 으로 둡니다.
+    """
+    cursor.execute(
+        """
+        CREATE TABLE ticker_stats (
+            ticker VARCHAR PRIMARY KEY,
+            placed_count BIGINT,
+            filled_count BIGINT,
+            cancelled_count BIGINT,
+            buy_volume DOUBLE,
+            buy_notional DOUBLE,
+            sell_volume DOUBLE,
+            sell_notional DOUBLE,
+            fill_seconds DOUBLE,
+            updated_at TIMESTAMP
+        )
+        """
     )
-    con.close()
+    cursor.execute(
+        """
+        INSERT INTO ticker_stats
+        SELECT
+            ticker,
+            count(*),
+            count(*) FILTER (status = 'done'),
+            count(*) FILTER (status = 'cancel'),
+            coalesce(sum(amount) FILTER (status = 'done' AND order_type = 'buy'), 0),
+            coalesce(
+                sum(price * amount) FILTER (status = 'done' AND order_type = 'buy'), 0
+            ),
+            coalesce(sum(amount) FILTER (status = 'done' AND order_type = 'sell'), 0),
+            coalesce(
+                sum(price * amount) FILTER (status = 'done' AND order_type = 'sell'), 0
+            ),
+            0,
+            now()
+        FROM orders
+        WHERE ticker IS NOT NULL
+        GROUP BY ticker
+        """
+    )
+
+
+def _migrate_v5(cursor):
+    """주문 이력 화면의 상태 필터(조회/건수)용 status 인덱스"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status ON orders (status)")
+
+
+# 순서대로 적용되는 스키마 마이그레이션 (인덱스 + 1 이 스키마 버전)
+MIGRATIONS = [_migrate_v1, _migrate_v2, _migrate_v3, _migrate_v4, _migrate_v5]
+
+
+def _new_orders(orders, known):
+    """orders 중 known 에 없는 uuid 의 주문만 처음 나온 순서대로 반환합니다."""
+    seen = set(known)
+    new = []
+    for order in orders:
+        if order[2] not in seen:
+            seen.add(order[2])
+            new.append(order)
+    return new
+
+
+def _stats_rows(placed=(), closed=(), now=None):
+    """새 주문과 종료된 주문으로 ticker_stats 에 더할 티커별 증분 행을 만듭니다.
+
+    placed 는 (ticker, order_type, uuid, price, amount, status),
+    closed 는 (ticker, order_type, price, amount, created_at, status) 목록입니다.
+    """
+    deltas = defaultdict(lambda: [0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0])
+    for ticker, *_ in placed:
+        deltas[ticker][0] += 1
+    # 처음부터 종료 상태로 저장되는 주문(복구 등)은 체결 소요 시간을 알 수 없음
+    closed = list(closed) + [
+        (ticker, order_type, price, amount, None, status)
+        for ticker, order_type, _, price, amount, status in placed
+        if status in TERMINAL_STATUSES
+    ]
+    for ticker, order_type, price, amount, created_at, status in closed:
+        delta = deltas[ticker]
+        if status == "cancel":
+            delta[2] += 1
+            continue
+        delta[1] += 1
+        side = 3 if order_type == "buy" else 5
+        delta[side] += amount
+        delta[side + 1] += price * amount
+        if created_at is not None and now is not None:
+            delta[7] += max((now - created_at).total_seconds(), 0)
+    return [(ticker, *delta) for ticker, delta in deltas.items()]
+
+
+def _order_filter(ticker=None, status=None):
+    conditions, params = [], []
+    if ticker:
+        conditions.append("ticker=?")
+        params.append(ticker)
+    if status:
+        conditions.append("status=?")
+        params.append(status)
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
+
+
+class OrderStore:
+    """하나의 DuckDB 연결을 유지하며 스레드별 커서를 제공하는 주문 저장소"""
+
+    def __init__(self, db_path=DB_PATH, clock=None):
+        self.db_path = db_path
+        # 주문 생성/종료 시각을 DB 시계 대신 clock() (datetime) 으로 기록 (모의 거래 재생용)
+        self.clock = clock
+        self._con = duckdb.connect(db_path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # 주문/상태가 바뀔 때마다 증가하는 변경 번호 (화면 캐시 무효화용).
+        # 이 OrderStore 로 쓴 변경만 세므로, 같은 DB 에 다른 연결로 쓰는 경우는 반영되지 않음
+        self._version = 0
+        # 한 DB 파일에는 쓰기 프로세스가 하나뿐이므로 미체결 주문과 미확인 주문 의도를
+        # 메모리에도 유지해, 매 주기 조회를 DB 왕복 없이 처리한다 (처음 조회할 때 적재)
+        self._pending = None
+        self._intent_ids = None
+        self._cache_lock = threading.Lock()
+
+    def _cursor(self):
+        # DuckDB 연결 객체는 스레드 간 공유가 안전하지 않으므로 스레드마다 커서를 분리
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            with self._lock:
+                cursor = self._con.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    def init_schema(self):
+        """아직 적용되지 않은 스키마 마이그레이션을 순서대로 적용합니다."""
+        cursor = self._cursor()
+        cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER)")
+        row = cursor.execute("SELECT max(version) FROM schema_version").fetchone()
+        version = row[0] or 0
+        for next_version, migrate in enumerate(MIGRATIONS[version:], start=version + 1):
+            cursor.execute("BEGIN TRANSACTION")
+            try:
+                migrate(cursor)
+                cursor.execute("INSERT INTO schema_version VALUES (?)", (next_version,))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def save_order(self, ticker, order_type, uuid, price, amount, status):
+        self.save_orders([(ticker, order_type, uuid, price, amount, status)])
+
+    @timed("order_db_seconds", op="save_orders")
+    def save_orders(self, orders, intent_ids=()):
+        """(ticker, order_type, uuid, price, amount, status) 목록을 일괄 저장합니다.
+
+        intent_ids 로 넘긴 주문 의도는 같은 트랜잭션에서 저널에서 지웁니다.
+        주문 의도 대조(reconcile_intents)와 엔진이 같은 주문을 기록할 수 있으므로
+        이미 저장된 uuid 는 건너뛰어 집계가 두 번 반영되지 않게 합니다.
+        """
+        if not orders and not intent_ids:
+            return
+        opened = []
+        with self._transaction() as cursor:
+            if orders:
+                known = cursor.execute(
+                    KNOWN_UUIDS_SQL, ([order[2] for order in orders],)
+                ).fetchall()
+                orders = _new_orders(orders, {uuid for uuid, in known})
+            open_uuids = [
+                (order[2],) for order in orders if order[5] not in TERMINAL_STATUSES
+            ]
+            if orders:
+                if self.clock:
+                    created_at = self.clock()
+                    cursor.executemany(
+                        INSERT_ORDER_AT_SQL, [(*order, created_at) for order in orders]
+                    )
+                else:
+                    cursor.executemany(INSERT_ORDER_SQL, orders)
+                cursor.executemany(UPSERT_TICKER_STATS_SQL, _stats_rows(placed=orders))
+            if open_uuids:
+                cursor.executemany(INSERT_OPEN_ORDER_SQL, open_uuids)
+                opened = cursor.execute(
+                    OPEN_ORDERS_BY_UUID_SQL, ([uuid for uuid, in open_uuids],)
+                ).fetchall()
+            if intent_ids:
+                cursor.executemany(
+                    DELETE_INTENT_SQL, [(intent_id,) for intent_id in intent_ids]
+                )
+        with self._cache_lock:
+            if self._pending is not None:
+                self._pending.update((row[2], row) for row in opened)
+            if self._intent_ids is not None:
+                self._intent_ids.difference_update(intent_ids)
+        if orders:
+            self._bump_version()
+
+    @timed("order_db_seconds", op="record_intents")
+    def record_intents(self, intents):
+        """(ticker, side, price, amount) 목록을 주문 제출 전에 저널에 기록하고 id 목록을 반환합니다."""
+        rows = [(uuid_lib.uuid4().hex, *intent) for intent in intents]
+        with self._transaction() as cursor:
+            cursor.executemany(INSERT_INTENT_SQL, rows)
+        with self._cache_lock:
+            if self._intent_ids is not None:
+                self._intent_ids.update(row[0] for row in rows)
+        return [row[0] for row in rows]
+
+    def discard_intents(self, intent_ids):
+        self.save_orders([], intent_ids)
+
+    @timed("order_db_seconds", op="get_open_intents")
+    def get_open_intents(self, min_age_seconds=0):
+        """접수 확인 없이 min_age_seconds 이상 지난 주문 의도를 오래된 순으로 반환합니다."""
+        with self._cache_lock:
+            if self._intent_ids is None:
+                rows = self._cursor().execute(INTENT_IDS_SQL).fetchall()
+                self._intent_ids = {intent_id for intent_id, in rows}
+            if not self._intent_ids:
+                return []
+        return self._cursor().execute(OPEN_INTENTS_SQL, (min_age_seconds,)).fetchall()
+
+    def get_known_uuids(self, uuids):
+        """uuids 중 이미 orders 에 저장된 것만 반환합니다."""
+        if not uuids:
+            return set()
+        rows = self._cursor().execute(KNOWN_UUIDS_SQL, (list(uuids),)).fetchall()
+        return {row[0] for row in rows}
+
+    @timed("order_db_seconds", op="get_recent_orders")
+    def get_recent_orders(self, limit=20):
+        return self._cursor().execute(RECENT_ORDERS_SQL, (limit,)).fetchall()
+
+    @timed("order_db_seconds", op="get_orders_page")
+    def get_orders_page(self, offset=0, limit=50, ticker=None, status=None):
+        """티커/상태로 거른 전체 주문 이력에서 최신순으로 한 페이지를 반환합니다."""
+        where, params = _order_filter(ticker, status)
+        return (
+            self._cursor()
+            .execute(ORDERS_PAGE_SQL.format(where=where), (*params, limit, offset))
+            .fetchall()
+        )
+
+    @timed("order_db_seconds", op="count_orders")
+    def count_orders(self, ticker=None, status=None):
+        where, params = _order_filter(ticker, status)
+        return (
+            self._cursor()
+            .execute(COUNT_ORDERS_SQL.format(where=where), params)
+            .fetchone()[0]
+        )
+
+    @property
+    def version(self):
+        """이 저장소로 주문/상태를 바꿀 때마다 증가하는 메모리 변경 번호
+
+        DB 에서 읽는 값이 아니므로 쓰기는 이 저장소 하나로만 해야 합니다. DuckDB 파일은
+        한 프로세스만 열 수 있어, 데몬이 실행 중이면 앱은 DB 대신 데몬 HTTP 로 조회합니다.
+        """
+        return self._version
+
+    def _bump_version(self):
+        with self._lock:
+            self._version += 1
+
+    @timed("order_db_seconds", op="get_pending_orders")
+    def get_pending_orders(self):
+        with self._cache_lock:
+            if self._pending is None:
+                rows = self._cursor().execute(PENDING_ORDERS_SQL).fetchall()
+                self._pending = {row[2]: row for row in rows}
+            return list(self._pending.values())
+
+    def update_order_status(self, uuid, status):
+        self.update_statuses({uuid: status})
+
+    @timed("order_db_seconds", op="update_statuses")
+    def update_statuses(self, statuses):
+        """{uuid: status} 를 하나의 트랜잭션으로 일괄 갱신합니다.
+
+        종료 상태가 된 주문은 open_orders 에서 제거합니다.
+        """
+        if not statuses:
+            return
+        params = [(status, uuid) for uuid, status in statuses.items()]
+        closed = [(uuid,) for status, uuid in params if status in TERMINAL_STATUSES]
+        still_open = [p for p in params if p[0] not in TERMINAL_STATUSES]
+        with self._transaction() as cursor:
+            if closed:
+                # 미체결 목록에 있던 주문만 이번에 종료된 것으로 보고 집계에 더함
+                closing = cursor.execute(
+                    CLOSING_ORDERS_SQL, ([uuid for uuid, in closed],)
+                ).fetchall()
+                stats = _stats_rows(
+                    closed=[
+                        (ticker, order_type, price, amount, created_at, statuses[uuid])
+                        for uuid, ticker, order_type, price, amount, created_at in closing
+                    ],
+                    now=(
+                        self.clock()
+                        if self.clock
+                        else cursor.execute("SELECT localtimestamp").fetchone()[0]
+                    ),
+                )
+                if stats:
+                    cursor.executemany(UPSERT_TICKER_STATS_SQL, stats)
+            cursor.executemany(UPDATE_STATUS_SQL, params)
+            if closed:
+                cursor.executemany(DELETE_OPEN_ORDER_SQL, closed)
+            if still_open:
+                cursor.executemany(UPDATE_OPEN_STATUS_SQL, still_open)
+        with self._cache_lock:
+            if self._pending is not None:
+                for status, uuid in params:
+                    row = self._pending.get(uuid)
+                    if row is None:
+                        continue
+                    if status in TERMINAL_STATUSES:
+                        del self._pending[uuid]
+                    else:
+                        self._pending[uuid] = (*row[:5], status, *row[6:])
+        self._bump_version()
+
+    @timed("order_db_seconds", op="save_ticker_states")
+    def save_ticker_states(self, states):
+        """(ticker, ratio, price_ratio, term_hour, placed) 목록으로 티커 상태를 갱신합니다."""
+        if not states:
+            return
+        with self._transaction() as cursor:
+            cursor.executemany(UPSERT_TICKER_STATE_SQL, states)
+
+    @timed("order_db_seconds", op="get_ticker_stats")
+    def get_ticker_stats(self):
+        return (
+            self._cursor()
+            .execute("SELECT * FROM ticker_stats ORDER BY ticker")
+            .fetchall()
+        )
+
+    @timed("order_db_seconds", op="get_ticker_states")
+    def get_ticker_states(self):
+        return self._cursor().execute("SELECT * FROM ticker_state").fetchall()
+
+    @contextmanager
+    def _transaction(self):
+        cursor = self._cursor()
+        cursor.execute("BEGIN TRANSACTION")
+        try:
+            yield cursor
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_order_store():
+    """프로세스 전체에서 공유하는 기본 OrderStore 를 반환합니다."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = OrderStore()
+    return _default_store
+
+
+def set_order_store(store):
+    """기본 OrderStore 를 교체합니다. 모의 거래처럼 별도 DB(메모리 등)를 쓸 때 사용합니다."""
+    global _default_store
+    with _default_store_lock:
+        _default_store = store
+
+
+def init_order_db():
+    get_order_store().init_schema()
+
+
+def save_order(ticker, order_type, uuid, price, amount, status):
+    get_order_store().save_order(ticker, order_type, uuid, price, amount, status)
+
+
+def save_orders(orders, intent_ids=()):
+    get_order_store().save_orders(orders, intent_ids)
+
+
+def record_intents(intents):
+    return get_order_store().record_intents(intents)
+
+
+def discard_intents(intent_ids):
+    get_order_store().discard_intents(intent_ids)
+
+
+def get_open_intents(min_age_seconds=0):
+    return get_order_store().get_open_intents(min_age_seconds)
+
+
+def get_known_uuids(uuids):
+    return get_order_store().get_known_uuids(uuids)
 
 
 def get_recent_orders(limit=20):
-    con = duckdb.connect("orders.duckdb")
-    result = con.execute(
-        "SELECT * FROM orders ORDER BY created_at DESC LIMIT ?", (limit,)
-    ).fetchall()
-    con.close()
-    return result
+    return get_order_store().get_recent_orders(limit)
+
+
+def get_orders_page(offset=0, limit=50, ticker=None, status=None):
+    return get_order_store().get_orders_page(offset, limit, ticker, status)
+
+
+def count_orders(ticker=None, status=None):
+    return get_order_store().count_orders(ticker, status)
+
+
+def get_order_tickers():
+    """주문 이력이 있는 티커 목록을 집계 테이블에서 읽어 반환합니다."""
+    return [row[0] for row in get_order_store().get_ticker_stats()]
+
+
+def get_orders_version():
+    """기본 OrderStore 의 변경 번호를 반환합니다. 값이 같으면 주문 이력도 그대로입니다.
+
+    기본 OrderStore 를 거친 변경만 반영합니다 (OrderStore.version 참고).
+    """
+    return get_order_store().version
 
 
 def get_pending_orders():
-    con = duckdb.connect("orders.duckdb")
-    result = con.execute(
-        "SELECT * FROM orders WHERE status NOT IN ('done', 'cancel') ORDER BY created_at ASC"
-    ).fetchall()
-    con.close()
-    return result
+    return get_order_store().get_pending_orders()
 
 
 def update_order_status(uuid, status):
-    con = duckdb.connect("orders.duckdb")
-    con.execute(
-        "UPDATE orders SET status=? WHERE uuid=?",
-        (status, uuid),
-    )
-    con.close()
+    get_order_store().update_order_status(uuid, status)
+
+
+def update_order_statuses(statuses):
+    """{uuid: status} 를 하나의 트랜잭션으로 일괄 갱신합니다."""
+    get_order_store().update_statuses(statuses)
+
+
+def save_ticker_states(states):
+    get_order_store().save_ticker_states(states)
+
+
+def get_ticker_states():
+    return get_order_store().get_ticker_states()
+
+
+def get_ticker_stats():
+    return get_order_store().get_ticker_stats()
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+import uuid as uuid_lib
+
+import jwt
+from websockets.asyncio.client import connect
+
+PRIVATE_WS_URL = "wss://api.upbit.com/websocket/v1/private"
+# 연결이 끊겼을 때 재연결까지 대기 시간(초)
+RECONNECT_DELAY = 5
+# stop() 요청을 확인하기 위한 수신 대기 단위(초)
+RECV_TIMEOUT = 1
+
+
+class OrderStream:
+    """Upbit 내 주문(myOrder) WebSocket 스트림을 구독해 주문 상태 변경을 전달하는 클래스
+
+    on_order 는 {"ticker", "uuid", "side", "state"} 딕셔너리를 인자로 받으며,
+    수신 스레드에서 호출되므로 빠르게 반환해야 합니다. 연결이 끊기면 on_error 에
+    예외를 전달하고 reconnect_delay 초 후 다시 연결합니다.
+    url 을 바꾸면 기록된 이벤트를 재생하는 로컬 WebSocket 서버로도 테스트할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        access_key,
+        secret_key,
+        on_order,
+        tickers=None,
+        url=None,
+        on_error=None,
+        reconnect_delay=RECONNECT_DELAY,
+    ):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.on_order = on_order
+        self.on_error = on_error
+        self.tickers = list(tickers or [])
+        self.url = url or PRIVATE_WS_URL
+        self.reconnect_delay = reconnect_delay
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=RECV_TIMEOUT * 2)
+
+    def is_alive(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self):
+        asyncio.run(self._consume())
+
+    def _auth_headers(self):
+        payload = {"access_key": self.access_key, "nonce": str(uuid_lib.uuid4())}
+        token = jwt.encode(payload, self.secret_key)
+        return {"Authorization": f"Bearer {token}"}
+
+    def _subscription(self):
+        request = {"type": "myOrder"}
+        if self.tickers:
+            request["codes"] = self.tickers
+        return [{"ticket": str(uuid_lib.uuid4())}, request]
+
+    async def _consume(self):
+        while not self._stop_event.is_set():
+            try:
+                async with connect(
+                    self.url, additional_headers=self._auth_headers()
+                ) as ws:
+                    await ws.send(json.dumps(self._subscription()))
+                    while not self._stop_event.is_set():
+                        try:
+                            message = await asyncio.wait_for(
+                                ws.recv(), timeout=RECV_TIMEOUT
+                            )
+                        except asyncio.TimeoutError:
+                            continue
+                        self._dispatch(message)
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+                await asyncio.sleep(self.reconnect_delay)
+
+    def _dispatch(self, message):
+        if isinstance(message, bytes):
+            message = message.decode("utf-8")
+        data = json.loads(message)
+        if data.get("type") != "myOrder":
+            return
+        self.on_order(
+            {
+                "ticker": data.get("code"),
+                "uuid": data.get("uuid"),
+                "side": "sell" if data.get("ask_bid") == "ASK" else "buy",
+                "state": data.get("state"),
+            }
+        )
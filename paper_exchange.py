@@ -0,0 +1,306 @@
+import argparse
+import heapq
+import itertools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+from analytics import load_ticker_summary
+from backtest import candle_minutes, load_candles
+from order_db import OrderStore, set_order_store
+from pricing import FEE_RATE, MIN_ORDER_KRW, leg_prices, tick_sizes
+from rebalance_engine import RebalanceConfig, RebalanceEngine
+
+UPBIT_SIDES = {"sell": "ask", "buy": "bid"}
+
+
+class PaperExchange:
+    """UpbitAPI 와 같은 인터페이스로 동작하는 프로세스 내부 모의 거래소
+
+    잔고와 주문은 메모리에만 두고, 티커별 캔들(high/low/close)을 재생하며
+    advance() 로 시간을 앞당길 때 지나간 캔들의 고가/저가에 닿은 지정가 주문을
+    주문 가격으로 체결합니다. 네트워크 요청이나 대기 없이 동작합니다.
+    """
+
+    access_key = None
+    secret_key = None
+
+    def __init__(self, candles, krw=0.0, coins=None, fee_rate=FEE_RATE):
+        """candles 는 {ticker: high/low/close 열이 있는 DataFrame} 입니다."""
+        self.series = {
+            ticker: tuple(
+                np.ascontiguousarray(df[col], dtype=np.float64)
+                for col in ("high", "low", "close")
+            )
+            for ticker, df in candles.items()
+        }
+        self.timestamps = {ticker: df.index for ticker, df in candles.items()}
+        self.length = min(len(arrays[2]) for arrays in self.series.values())
+        self.index = 0
+        self.fee_rate = fee_rate
+        self.balances = defaultdict(float, {"KRW": krw, **(coins or {})})
+        self.locked = defaultdict(float)
+        self.orders = {}
+        # 티커별 미체결 주문 힙: 매도는 낮은 가격, 매수는 높은 가격이 먼저
+        self._asks = defaultdict(list)
+        self._bids = defaultdict(list)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def request_priority(self, priority):
+        yield
+
+    def invalidate_balances(self):
+        pass
+
+    # ------------------------------------------------------------------
+    # 시세 재생과 체결
+    # ------------------------------------------------------------------
+    def advance(self, steps=1):
+        """캔들을 steps 개 진행하며 그 사이 가격에 닿은 주문을 체결합니다.
+
+        재생할 캔들이 남아 있지 않으면 False 를 반환합니다.
+        """
+        if self.index >= self.length - 1:
+            return False
+        start, self.index = self.index + 1, min(self.index + steps, self.length - 1)
+        with self._lock:
+            for ticker, (high, low, _) in self.series.items():
+                # 구간의 최고가/최저가만 보면 되므로 캔들 수와 무관하게 한 번에 처리
+                self._match(ticker, high[start : self.index + 1].max(), "ask")
+                self._match(ticker, low[start : self.index + 1].min(), "bid")
+        return True
+
+    def _match(self, ticker, reached, side):
+        book = self._asks[ticker] if side == "ask" else self._bids[ticker]
+        while book:
+            key, _, uuid = book[0]
+            price = key if side == "ask" else -key
+            if (side == "ask" and price > reached) or (
+                side == "bid" and price < reached
+            ):
+                return
+            heapq.heappop(book)
+            order = self.orders[uuid]
+            if order["state"] == "wait":
+                self._fill(order)
+
+    def _fill(self, order):
+        currency = order["market"].split("-")[1]
+        price, volume = float(order["price"]), float(order["volume"])
+        notional = price * volume
+        if order["side"] == "ask":
+            self.locked[currency] -= volume
+            self.balances["KRW"] += notional * (1 - self.fee_rate)
+        else:
+            self.locked["KRW"] -= notional * (1 + self.fee_rate)
+            self.balances[currency] += volume
+        order.update(state="done", remaining_volume="0", executed_volume=str(volume))
+
+    def _now(self, ticker):
+        return str(self.timestamps[ticker][self.index])
+
+    def now(self):
+        """재생 중인 캔들 시각(datetime). OrderStore(clock=...) 에 넘겨 체결 시간을 재생 시각으로 집계합니다."""
+        timestamps = next(iter(self.timestamps.values()))
+        return timestamps[self.index].to_pydatetime()
+
+    # ------------------------------------------------------------------
+    # UpbitAPI 인터페이스
+    # ------------------------------------------------------------------
+    def get_balances_by_currency(self):
+        with self._lock:
+            return dict(self.balances)
+
+    def get_krw_balance(self):
+        return self.balances["KRW"]
+
+    def get_balance(self, ticker):
+        return self.balances[ticker.split("-")[1]]
+
+    def get_current_price(self, ticker):
+        return float(self.series[ticker][2][self.index])
+
+    def get_current_prices(self, tickers):
+        return {ticker: self.get_current_price(ticker) for ticker in tickers}
+
+    fetch_current_prices = get_current_prices
+
+    def get_tickers(self):
+        return list(self.series)
+
+    def get_orderbook(self, ticker):
+        price = self.get_current_price(ticker)
+        tick = float(tick_sizes([price])[0])
+        return {
+            "market": ticker,
+            "orderbook_units": [{"ask_price": price + tick, "bid_price": price - tick}],
+        }
+
+    def place_limit_order(self, ticker, side, price, amount):
+        """잔고를 묶고 주문을 접수합니다. 잔고 부족, 최소 주문 금액 미만이면 None."""
+        currency = ticker.split("-")[1]
+        notional = price * amount
+        if notional < MIN_ORDER_KRW:
+            return None
+        with self._lock:
+            if side == "sell":
+                if self.balances[currency] < amount:
+                    return None
+                self.balances[currency] -= amount
+                self.locked[currency] += amount
+            else:
+                cost = notional * (1 + self.fee_rate)
+                if self.balances["KRW"] < cost:
+                    return None
+                self.balances["KRW"] -= cost
+                self.locked["KRW"] += cost
+            seq = next(self._seq)
+            order = {
+                "uuid": f"paper-{seq}",
+                "side": UPBIT_SIDES[side],
+                "ord_type": "limit",
+                "price": str(price),
+                "state": "wait",
+                "market": ticker,
+                "created_at": self._now(ticker),
+                "volume": str(amount),
+                "remaining_volume": str(amount),
+                "executed_volume": "0",
+            }
+            self.orders[order["uuid"]] = order
+            close = self.get_current_price(ticker)
+            # 현재가를 넘어선 주문은 즉시 체결
+            if (side == "sell" and price <= close) or (
+                side == "buy" and price >= close
+            ):
+                self._fill(order)
+            elif side == "sell":
+                heapq.heappush(self._asks[ticker], (price, seq, order["uuid"]))
+            else:
+                heapq.heappush(self._bids[ticker], (-price, seq, order["uuid"]))
+        return dict(order)
+
+    def cancel_order(self, uuid):
+        with self._lock:
+            order = self.orders.get(uuid)
+            if order is None or order["state"] != "wait":
+                return False
+            currency = order["market"].split("-")[1]
+            price, volume = float(order["price"]), float(order["volume"])
+            if order["side"] == "ask":
+                self.locked[currency] -= volume
+                self.balances[currency] += volume
+            else:
+                cost = price * volume * (1 + self.fee_rate)
+                self.locked["KRW"] -= cost
+                self.balances["KRW"] += cost
+            # 힙에 남은 항목은 체결 검사 시 상태를 보고 건너뜀
+            order["state"] = "cancel"
+            return True
+
+    def rebalancing_orders(self, ticker, price, amount, ratio, prices=None):
+        if prices is None:
+            prices = leg_prices(price, ratio)
+        result = {}
+        for side, leg_price in prices.items():
+            order = self.place_limit_order(ticker, side, leg_price, amount)
+            result[f"{side}_price"] = leg_price
+            result[f"{side}_uuid"] = order["uuid"] if order else None
+            result[f"{side}_order_raw"] = order
+        return result
+
+    def check_order_status(self, uuid):
+        order = self.orders.get(uuid)
+        return order["state"] if order else "unknown"
+
+    def check_order_statuses(self, orders):
+        return {uuid: self.check_order_status(uuid) for _, uuid in orders if uuid}
+
+    def get_orders(self, ticker, state="wait", max_pages=None):
+        with self._lock:
+            return [
+                dict(order)
+                for order in reversed(self.orders.values())
+                if order["market"] == ticker and order["state"] == state
+            ]
+
+    def valuation(self):
+        """묶인 잔고를 포함해 현재가 기준 전체 평가 금액(KRW)을 반환합니다."""
+        total = self.balances["KRW"] + self.locked["KRW"]
+        for ticker in self.series:
+            currency = ticker.split("-")[1]
+            amount = self.balances[currency] + self.locked[currency]
+            total += amount * self.get_current_price(ticker)
+        return total
+
+
+def run_paper(engine: RebalanceEngine, exchange: PaperExchange, candles_per_cycle):
+    """캔들 재생이 끝날 때까지 candles_per_cycle 개씩 진행하며 리밸런싱을 반복하고,
+    실행한 주기 수를 반환합니다."""
+    tickers = sorted(engine.configs)
+    cycles = 0
+    with engine.workers():
+        while exchange.advance(candles_per_cycle):
+            engine.run_once(tickers)
+            cycles += 1
+    return cycles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캔들 재생 기반 모의 거래")
+    parser.add_argument("path", help="OHLCV 캔들 CSV, Parquet 또는 Arrow 파일")
+    parser.add_argument("--ticker", default="KRW-BTC")
+    parser.add_argument("--ratio", type=float, default=10)
+    parser.add_argument("--price-ratio", type=float, default=5)
+    parser.add_argument("--term-hour", type=float, default=1)
+    parser.add_argument("--krw", type=float, default=1_000_000)
+    parser.add_argument(
+        "--coin",
+        type=float,
+        help="시작 코인 수량 (지정하지 않으면 --krw 의 절반을 첫 종가로 코인으로 바꿔 시작)",
+    )
+    parser.add_argument("--db", default=":memory:", help="모의 주문을 저장할 DuckDB")
+    args = parser.parse_args()
+
+    df = load_candles(args.path)
+    krw, coin = args.krw, args.coin
+    if coin is None:
+        # 보유 코인이 없으면 매도 주문을 낼 수 없고 매수 수량도 0 이 되므로 절반씩 나눠 시작
+        coin = krw / 2 / float(df["close"].iloc[0])
+        krw -= krw / 2
+
+    currency = args.ticker.split("-")[1]
+    exchange = PaperExchange({args.ticker: df}, krw=krw, coins={currency: coin})
+    # 체결 소요 시간이 벽시계가 아닌 재생 시각으로 집계되도록 거래소 시각을 사용
+    store = OrderStore(args.db, clock=exchange.now)
+    store.init_schema()
+    set_order_store(store)
+    config = RebalanceConfig(
+        args.ticker, args.ratio / 100, args.price_ratio / 100, args.term_hour
+    )
+    engine = RebalanceEngine(exchange, [config], log=lambda event: None, max_workers=1)
+    start_value = krw + coin * exchange.get_current_price(args.ticker)
+
+    started = time.perf_counter()
+    cycles = run_paper(
+        engine,
+        exchange,
+        max(int(args.term_hour * 60 / candle_minutes(df)), 1),
+    )
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"[모의 거래] {cycles:,}주기, {elapsed:.2f}초 ({cycles / elapsed:,.0f}주기/초)"
+    )
+    print(f"평가 금액: {start_value:,.0f} -> {exchange.valuation():,.0f} KRW")
+    for row in load_ticker_summary():
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
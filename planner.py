@@ -0,0 +1,110 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from events import Event
+from pricing import FEE_RATE, MIN_ORDER_KRW, as_order_price, snap_prices
+
+
+@dataclass
+class PlannedOrder:
+    """한 티커에 제출할 매도/매수 주문 쌍"""
+
+    config: object  # RebalanceConfig
+    price: float
+    balance: float
+    amount: float
+    legs: dict
+    buy_cost: float
+
+
+@dataclass
+class RebalancePlan:
+    """한 번의 잔고/현재가 스냅샷으로 계산한 전체 티커의 주문 계획"""
+
+    orders: list = field(default_factory=list)
+    # 건너뛴 티커별 사유 (price_missing, below_min_order, krw_budget_exceeded 이벤트)
+    skipped: dict = field(default_factory=dict)
+    krw_available: float = 0.0
+    krw_planned: float = 0.0
+
+
+def plan_rebalance(
+    configs,
+    balances,
+    prices,
+    legs=None,
+    fee_rate=FEE_RATE,
+    min_order_krw=MIN_ORDER_KRW,
+):
+    """모든 티커의 주문 수량과 가격을 배열 연산 한 번으로 계산해 RebalancePlan 을 반환합니다.
+
+    balances 는 {currency: balance} (KRW 포함), prices 는 {ticker: price} 스냅샷입니다.
+    legs 로 {ticker: {"sell", "buy"}} 를 넘긴 티커는 고정 비율 대신 그 가격을 씁니다
+    (ATR/호가 기반 가격). 매도/매수 어느 한쪽이라도 최소 주문 금액에 못 미치는 티커는
+    제외하고, 매수 주문에 묶일 KRW(수수료 포함)는 configs 순서대로 남은 잔액 안에서
+    배정합니다.
+    """
+    configs = list(configs)
+    legs = legs or {}
+    krw = float(balances.get("KRW", 0))
+    plan = RebalancePlan(krw_available=krw)
+    if not configs:
+        return plan
+
+    tickers = [config.ticker for config in configs]
+    price = np.array([prices.get(ticker) or 0 for ticker in tickers], dtype=np.float64)
+    balance = np.array(
+        [balances.get(ticker.split("-")[1], 0) for ticker in tickers],
+        dtype=np.float64,
+    )
+    ratio = np.array([config.ratio for config in configs], dtype=np.float64)
+    price_ratio = np.array([config.price_ratio for config in configs], dtype=np.float64)
+
+    amount = np.round(balance * ratio, 8)
+    sell = snap_prices(price * (1 + price_ratio), "sell")
+    buy = snap_prices(price * (1 - price_ratio), "buy")
+    for i, ticker in enumerate(tickers):
+        if ticker in legs:
+            sell[i], buy[i] = legs[ticker]["sell"], legs[ticker]["buy"]
+
+    sell_notional = sell * amount
+    buy_notional = buy * amount
+    buy_cost = buy_notional * (1 + fee_rate)
+    has_price = price > 0
+    sized = has_price & (np.minimum(sell_notional, buy_notional) >= min_order_krw)
+
+    remaining = krw
+    for i, ticker in enumerate(tickers):
+        if not has_price[i]:
+            plan.skipped[ticker] = Event("price_missing", ticker)
+        elif not sized[i]:
+            plan.skipped[ticker] = Event(
+                "below_min_order",
+                ticker,
+                min_order=min_order_krw,
+                sell_notional=float(sell_notional[i]),
+                buy_notional=float(buy_notional[i]),
+            )
+        elif buy_cost[i] > remaining:
+            # 남은 잔액으로 살 수 없는 티커만 건너뛰고 뒤의 티커는 계속 배정
+            plan.skipped[ticker] = Event(
+                "krw_budget_exceeded",
+                ticker,
+                required=float(buy_cost[i]),
+                available=remaining,
+            )
+        else:
+            remaining -= float(buy_cost[i])
+            plan.orders.append(
+                PlannedOrder(
+                    configs[i],
+                    float(price[i]),
+                    float(balance[i]),
+                    float(amount[i]),
+                    {"sell": as_order_price(sell[i]), "buy": as_order_price(buy[i])},
+                    float(buy_cost[i]),
+                )
+            )
+    plan.krw_planned = krw - remaining
+    return plan
@@ -0,0 +1,206 @@
+import threading
+import time
+
+import numpy as np
+
+from events import Event
+from utils.candle_store import CandleStore
+
+# Upbit KRW 마켓 주문 가격 단위 (가격 하한, 호가 단위) - 가격 하한 오름차순
+KRW_TICK_TABLE = (
+    (0, 0.00000001),
+    (0.0001, 0.0000001),
+    (0.001, 0.000001),
+    (0.01, 0.00001),
+    (0.1, 0.0001),
+    (1, 0.001),
+    (10, 0.01),
+    (100, 0.1),
+    (1_000, 1),
+    (10_000, 10),
+    (100_000, 50),
+    (500_000, 100),
+    (1_000_000, 500),
+    (2_000_000, 1_000),
+)
+_TICK_BOUNDS = np.array([bound for bound, _ in KRW_TICK_TABLE], dtype=np.float64)
+_TICK_SIZES = np.array([tick for _, tick in KRW_TICK_TABLE], dtype=np.float64)
+# 호가 단위의 소수 자릿수 (부동소수 오차로 생기는 꼬리 자릿수 제거용)
+_TICK_DECIMALS = np.maximum(-np.floor(np.log10(_TICK_SIZES)), 0).astype(np.int64)
+# Upbit KRW 마켓 최소 주문 금액
+MIN_ORDER_KRW = 5000
+# Upbit KRW 마켓 거래 수수료율
+FEE_RATE = 0.0005
+# price / tick 의 부동소수 오차 허용 범위
+_SNAP_EPSILON = 1e-9
+
+# 주문 가격 결정 방식
+PRICING_FIXED = "fixed"  # 현재가 ± price_ratio
+PRICING_ATR = "atr"  # 현재가 ± atr_multiplier * ATR
+PRICING_MODES = (PRICING_FIXED, PRICING_ATR)
+
+ATR_INTERVAL = "minute60"
+ATR_PERIOD = 14
+# ATR 캔들 저장소를 다시 받는 주기(초): minute60 캔들 하나가 새로 생기는 간격
+ATR_REFRESH_SECONDS = 60 * 60
+# ATR 캔들이 하나도 없을 때 받는 기간(일)
+ATR_HISTORY_DAYS = 2
+
+
+def tick_sizes(prices) -> np.ndarray:
+    """가격 배열 각각에 적용되는 KRW 마켓 호가 단위를 반환합니다."""
+    prices = np.asarray(prices, dtype=np.float64)
+    index = np.searchsorted(_TICK_BOUNDS, prices, side="right") - 1
+    return _TICK_SIZES[np.maximum(index, 0)]
+
+
+def snap_prices(prices, side: str) -> np.ndarray:
+    """가격 배열을 호가 단위에 맞춥니다.
+
+    매도(sell)는 올림, 매수(buy)는 내림으로 맞춰 원래 가격보다 불리해지지 않게 합니다.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    index = np.maximum(np.searchsorted(_TICK_BOUNDS, prices, side="right") - 1, 0)
+    ticks = _TICK_SIZES[index]
+    steps = prices / ticks
+    if side == "sell":
+        steps = np.ceil(steps - _SNAP_EPSILON)
+    else:
+        steps = np.floor(steps + _SNAP_EPSILON)
+    snapped = steps * ticks
+    # 호가 단위별 자릿수로 반올림해 0.30000000000000004 같은 값을 정리
+    for decimals in np.unique(_TICK_DECIMALS[index]):
+        mask = _TICK_DECIMALS[index] == decimals
+        snapped[mask] = np.round(snapped[mask], decimals)
+    return snapped
+
+
+def snap_price(price: float, side: str):
+    """가격 하나를 호가 단위에 맞춥니다. 호가 단위가 1 이상이면 정수로 반환합니다."""
+    return as_order_price(snap_prices([price], side)[0])
+
+
+def as_order_price(snapped):
+    """호가 단위에 맞춘 가격을 주문용 값으로 바꿉니다. 호가 단위가 1 이상이면 정수."""
+    snapped = float(snapped)
+    return int(snapped) if snapped >= 1_000 else snapped
+
+
+def average_true_range(high, low, close, period: int = ATR_PERIOD) -> float | None:
+    """최근 period 개 캔들의 평균 실제 범위(ATR)를 계산합니다. 데이터가 부족하면 None."""
+    if len(close) < period + 1:
+        return None
+    high = np.asarray(high[-period:], dtype=np.float64)
+    low = np.asarray(low[-period:], dtype=np.float64)
+    prev_close = np.asarray(close[-period - 1 : -1], dtype=np.float64)
+    true_range = np.maximum(
+        high - low,
+        np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)),
+    )
+    return float(true_range.mean())
+
+
+def leg_prices(price, price_ratio=None, offset=None, orderbook=None):
+    """기준가에서 매도/매수 주문 가격을 계산해 {"sell": ..., "buy": ...} 로 반환합니다.
+
+    offset(가격 차이)을 주면 price_ratio 대신 사용합니다. orderbook 을 주면
+    최우선 매도/매수 호가의 중간값을 기준가로 쓰고, 두 주문이 상대 호가를
+    넘어 즉시 체결되지 않도록 최우선 호가 바깥으로 제한합니다.
+    """
+    best = _best_quotes(orderbook)
+    if best:
+        best_ask, best_bid = best
+        price = (best_ask + best_bid) / 2
+    if offset is None:
+        offset = price * price_ratio
+    sell, buy = price + offset, price - offset
+    if best:
+        sell, buy = max(sell, best_ask), min(buy, best_bid)
+    return {"sell": snap_price(sell, "sell"), "buy": snap_price(buy, "buy")}
+
+
+def _best_quotes(orderbook):
+    units = (orderbook or {}).get("orderbook_units")
+    if not units:
+        return None
+    return float(units[0]["ask_price"]), float(units[0]["bid_price"])
+
+
+class LegPricer:
+    """리밸런싱 설정의 가격 결정 방식에 따라 주문 쌍의 가격을 정하는 객체
+
+    ATR 방식은 로컬 캔들 저장소의 메모리 매핑 배열에서 최근 캔들만 읽어 계산합니다.
+    티커별로 refresh_seconds 마다 저장소에 새 캔들을 받아 두며, 그래도 캔들이 부족하면
+    log 에 pricing_fallback 이벤트를 남기고 고정 비율 방식으로 대체합니다.
+    """
+
+    def __init__(
+        self,
+        candle_store: CandleStore | None = None,
+        atr_interval: str = ATR_INTERVAL,
+        atr_period: int = ATR_PERIOD,
+        log=None,
+        refresh_seconds: float = ATR_REFRESH_SECONDS,
+        clock=time.monotonic,
+    ):
+        self._candle_store = candle_store
+        self.atr_interval = atr_interval
+        self.atr_period = atr_period
+        self.log = log or (lambda event: None)
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        self._refreshed_at = {}
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def candle_store(self):
+        # config.yaml 을 읽는 저장소는 ATR 방식을 처음 쓸 때 생성
+        if self._candle_store is None:
+            self._candle_store = CandleStore.from_config()
+        return self._candle_store
+
+    def refresh(self, ticker: str):
+        """마지막 갱신 후 refresh_seconds 가 지났으면 저장소에 새 캔들을 받습니다.
+
+        실패하면 candle_refresh_failed 이벤트를 남기고 저장된 캔들을 그대로 씁니다.
+        """
+        with self._refresh_lock:
+            now = self.clock()
+            refreshed_at = self._refreshed_at.get(ticker)
+            if refreshed_at is not None and now - refreshed_at < self.refresh_seconds:
+                return
+            # 실패해도 다음 주기까지는 다시 받지 않아 주문 경로를 막지 않음
+            self._refreshed_at[ticker] = now
+        try:
+            self.candle_store.update(ticker, self.atr_interval, ATR_HISTORY_DAYS)
+        except Exception as e:
+            self.log(Event("candle_refresh_failed", ticker, exc=e))
+
+    def atr(self, ticker: str) -> float | None:
+        self.refresh(ticker)
+        arrays = self.candle_store.load_arrays(ticker, self.atr_interval)
+        if arrays is None:
+            return None
+        return average_true_range(
+            arrays["high"], arrays["low"], arrays["close"], self.atr_period
+        )
+
+    def quote(self, api, config, price):
+        """config(RebalanceConfig)에 맞춰 매도/매수 주문 가격을 반환합니다."""
+        offset = None
+        if config.pricing == PRICING_ATR:
+            atr = self.atr(config.ticker)
+            if atr is not None:
+                offset = atr * config.atr_multiplier
+            else:
+                self.log(
+                    Event(
+                        "pricing_fallback",
+                        config.ticker,
+                        interval=self.atr_interval,
+                        period=self.atr_period,
+                        price_ratio=config.price_ratio,
+                    )
+                )
+        orderbook = api.get_orderbook(config.ticker) if config.use_orderbook else None
+        return leg_prices(price, config.price_ratio, offset, orderbook)
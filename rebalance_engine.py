@@ -0,0 +1,566 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from order_db import (
+    TERMINAL_STATUSES,
+    discard_intents,
+    get_known_uuids,
+    get_open_intents,
+    get_pending_orders,
+    record_intents,
+    save_orders,
+    save_ticker_states,
+    update_order_statuses,
+)
+from check_scheduler import CheckScheduler, leg_crossed
+from events import Event
+from order_stream import OrderStream
+from planner import PlannedOrder, plan_rebalance
+from pricing import PRICING_FIXED, LegPricer
+from upbit_api import UpbitAPI
+from utils.metrics import REGISTRY, timed
+
+# 동시에 주문을 제출하는 최대 워커 수 (티커 수와 무관하게 고정)
+DEFAULT_MAX_WORKERS = 8
+# 주문 쌍 중 한쪽만 접수되었을 때 실패한 주문의 재시도 횟수
+LEG_RETRIES = 1
+# 실행 중에는 이 시간(초)보다 오래 확인되지 않은 주문 의도만 거래소와 대조
+INTENT_GRACE_SECONDS = 60
+# 주문 의도 대조 시 조회하는 최근 체결 주문 페이지 수
+RECONCILE_DONE_PAGES = 1
+# 주문을 내지 않은 티커의 점검 시각은 이 간격(초)마다만 ticker_state 에 기록
+TICKER_STATE_SAVE_SECONDS = 30
+SIDE_TO_UPBIT = {"sell": "ask", "buy": "bid"}
+
+
+@dataclass(frozen=True)
+class RebalanceConfig:
+    """티커별 리밸런싱 설정 (ratio, price_ratio 는 0~1 비율)"""
+
+    ticker: str
+    ratio: float
+    price_ratio: float
+    term_hour: float
+    # 주문 가격 결정 방식 (pricing.PRICING_MODES), ATR 방식이면 price_ratio 대신 사용
+    pricing: str = PRICING_FIXED
+    atr_multiplier: float = 1.0
+    # 호가창의 최우선 호가를 기준가로 쓰고 상대 호가를 넘지 않도록 제한
+    use_orderbook: bool = False
+
+
+def sync_pending_orders(api: UpbitAPI, log, tickers=None, progress=None):
+    """DB의 미체결 주문 상태를 Upbit과 일괄 동기화하고 변경 여부를 반환합니다.
+
+    tickers 를 지정하면 해당 티커의 주문만 동기화합니다.
+    progress 를 주면 티커 하나를 조회할 때마다 progress(완료 티커 수, 전체 티커 수)를 호출합니다.
+    """
+    pending_orders = get_pending_orders()
+    if tickers is not None:
+        pending_orders = [order for order in pending_orders if order[0] in tickers]
+    log(Event("sync_started", count=len(pending_orders)))
+    targets = []
+    for order in pending_orders:
+        uuid = order[2]
+        if not uuid or not isinstance(uuid, str):
+            log(Event("invalid_uuid", order=order))
+            continue
+        targets.append((order[0], uuid))
+    if not targets:
+        return False
+
+    targets_by_ticker = defaultdict(list)
+    for target in targets:
+        targets_by_ticker[target[0]].append(target)
+    statuses = {}
+    # 주문 목록 조회는 티커 단위이므로 티커별로 나눠도 요청 수는 같음
+    for done, ticker_targets in enumerate(targets_by_ticker.values(), start=1):
+        try:
+            statuses.update(api.check_order_statuses(ticker_targets))
+        except Exception as e:
+            log(Event("sync_failed", exc=e))
+            return False
+        if progress:
+            progress(done, len(targets_by_ticker))
+
+    changed = {}
+    for order in pending_orders:
+        uuid = order[2]
+        status = statuses.get(uuid)
+        if status is None:
+            continue
+        log(Event("status_updated", order[0], uuid=uuid, status=status))
+        if status != order[5]:  # 상태가 변경된 경우
+            changed[uuid] = status
+    update_order_statuses(changed)
+    return bool(changed)
+
+
+def place_rebalance_pair(
+    api: UpbitAPI,
+    log,
+    config: RebalanceConfig,
+    price,
+    balance,
+    pricer: LegPricer | None = None,
+    legs=None,
+):
+    """현재가와 보유 수량으로 매도/매수 주문 한 쌍을 제출하고 DB에 저장합니다.
+
+    legs({"sell", "buy"} 가격)를 주면 pricer 로 다시 계산하지 않습니다.
+    주문이 저장되면 True 를 반환합니다.
+    """
+    ticker = config.ticker
+    amount = round(balance * config.ratio, 8)
+    log(Event("sizing", ticker, price=price, balance=balance, amount=amount))
+
+    if legs is None:
+        legs = (pricer or LegPricer(log=log)).quote(api, config, price)
+    # 응답을 받기 전에 프로세스가 죽어도 재시작 시 거래소와 대조할 수 있도록 먼저 기록
+    intent_ids = dict(
+        zip(
+            ("sell", "buy"),
+            record_intents(
+                [(ticker, side, float(legs[side]), amount) for side in ("sell", "buy")]
+            ),
+        )
+    )
+    order_info = api.rebalancing_orders(
+        ticker, price, amount, config.price_ratio, prices=legs
+    )
+    if not order_info or not (
+        order_info.get("sell_uuid") or order_info.get("buy_uuid")
+    ):
+        log(
+            Event(
+                "order_info_missing",
+                ticker,
+                amount=amount,
+                notional=price * amount,
+                order_info=order_info,
+            )
+        )
+        return False
+
+    # 성공한 주문은 상대 주문의 결과와 무관하게 바로 기록
+    order_info["intent_ids"] = intent_ids
+    placed = [side for side in ("sell", "buy") if order_info.get(f"{side}_uuid")]
+    _save_legs(ticker, order_info, placed, amount)
+    failed = [side for side in ("sell", "buy") if side not in placed]
+    if failed:
+        if not _retry_or_rollback(api, log, ticker, order_info, failed[0], amount):
+            return False
+
+    for side in ("sell", "buy"):
+        log(
+            Event(
+                "order_placed",
+                ticker,
+                side=side,
+                uuid=order_info[f"{side}_uuid"],
+                price=order_info[f"{side}_price"],
+                amount=amount,
+            )
+        )
+    return True
+
+
+def _save_legs(ticker, order_info, sides, amount):
+    save_orders(
+        [
+            (
+                ticker,
+                side,
+                order_info[f"{side}_uuid"],
+                float(order_info[f"{side}_price"]),
+                float(amount),
+                "requested",
+            )
+            for side in sides
+        ],
+        [order_info["intent_ids"][side] for side in sides],
+    )
+
+
+def _retry_or_rollback(api: UpbitAPI, log, ticker, order_info, failed_side, amount):
+    """한쪽 주문만 접수된 경우 실패한 주문을 재시도하고, 그래도 실패하면 접수된 주문을 취소합니다."""
+    placed_side = "buy" if failed_side == "sell" else "sell"
+    failed_price = order_info[f"{failed_side}_price"]
+    log(Event("leg_retry", ticker, side=failed_side))
+    for _ in range(LEG_RETRIES):
+        # 이전 시도의 의도는 대조용으로 남기고, 재시도마다 새 의도를 기록
+        [order_info["intent_ids"][failed_side]] = record_intents(
+            [(ticker, failed_side, float(failed_price), amount)]
+        )
+        order = api.place_limit_order(ticker, failed_side, failed_price, amount)
+        if isinstance(order, dict) and order.get("uuid"):
+            order_info[f"{failed_side}_uuid"] = order["uuid"]
+            _save_legs(ticker, order_info, [failed_side], amount)
+            return True
+
+    placed_uuid = order_info[f"{placed_side}_uuid"]
+    log(Event("leg_rollback", ticker, side=failed_side, placed_side=placed_side))
+    if api.cancel_order(placed_uuid):
+        update_order_statuses({placed_uuid: "cancel"})
+    else:
+        log(Event("leg_cancel_failed", ticker, side=placed_side, uuid=placed_uuid))
+    return False
+
+
+def reconcile_intents(api: UpbitAPI, log, min_age_seconds=0):
+    """접수 확인 없이 남은 주문 의도를 거래소 주문 목록과 대조해 정리합니다.
+
+    티커마다 미체결 주문 전체와 최근 체결 주문 한 페이지만 조회하고,
+    (방향, 가격, 수량)이 일치하면서 DB에 없는 주문을 찾아 저장합니다.
+    일치하는 주문이 없는 의도는 접수되지 않은 것으로 보고 버립니다.
+    """
+    intents = get_open_intents(min_age_seconds)
+    if not intents:
+        return 0
+    log(Event("reconcile_started", count=len(intents)))
+    intents_by_ticker = defaultdict(list)
+    for intent in intents:
+        intents_by_ticker[intent[1]].append(intent)
+
+    recovered = []
+    for ticker, ticker_intents in intents_by_ticker.items():
+        try:
+            candidates = api.get_orders(ticker, "wait") + api.get_orders(
+                ticker, "done", max_pages=RECONCILE_DONE_PAGES
+            )
+        except Exception as e:
+            log(Event("reconcile_failed", ticker, exc=e))
+            # 조회에 실패한 티커의 의도는 다음 대조까지 남겨 둠
+            intents = [intent for intent in intents if intent[1] != ticker]
+            continue
+        known = get_known_uuids([order.get("uuid") for order in candidates])
+        for intent_id, _, side, price, amount, _ in ticker_intents:
+            match = _match_intent(candidates, known, side, price, amount)
+            if match is None:
+                continue
+            known.add(match["uuid"])
+            recovered.append(
+                (ticker, side, match["uuid"], price, amount, match.get("state"))
+            )
+            log(Event("intent_recovered", ticker, side=side, uuid=match["uuid"]))
+
+    save_orders(recovered)
+    discard_intents([intent[0] for intent in intents])
+    log(
+        Event(
+            "reconcile_done",
+            recovered=len(recovered),
+            dropped=len(intents) - len(recovered),
+        )
+    )
+    return len(recovered)
+
+
+def _match_intent(candidates, known, side, price, amount):
+    for order in candidates:
+        if (
+            order.get("uuid") not in known
+            and order.get("side") == SIDE_TO_UPBIT[side]
+            and abs(float(order.get("price") or 0) - price) <= price * 1e-9
+            and abs(float(order.get("volume") or 0) - amount) <= 1e-8
+        ):
+            return order
+    return None
+
+
+def wait_for_wakeup(stop_event: threading.Event, wake_event: threading.Event, timeout):
+    """중지 요청, 체결 이벤트, timeout 중 하나가 발생할 때까지 대기합니다."""
+    deadline = time.monotonic() + timeout
+    while not stop_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        # 중지 요청을 놓치지 않도록 최대 1초 단위로 나누어 대기
+        if wake_event.wait(min(remaining, 1)):
+            wake_event.clear()
+            return
+
+
+class RebalanceEngine:
+    """여러 티커의 리밸런싱을 하나의 스케줄러 스레드와 제한된 워커 풀로 실행하는 엔진
+
+    한 번의 점검에서 due 상태인 티커를 모아 주문 상태 동기화, 잔고 조회,
+    현재가 조회를 각각 한 번씩만 수행하고, 주문 제출만 워커 풀에 나누어 맡깁니다.
+    티커별 진행 상태는 주문 DB(open_orders, ticker_state)에 남깁니다.
+    """
+
+    def __init__(
+        self,
+        api: UpbitAPI,
+        configs,
+        log=print,
+        max_workers=DEFAULT_MAX_WORKERS,
+        use_stream=False,
+        market_data=None,
+        scheduler: CheckScheduler | None = None,
+    ):
+        self.api = api
+        # 현재가는 공유 시세 허브(MarketDataHub)가 있으면 그 스냅샷에서 읽음
+        self.market_data = market_data or api
+        self.configs = {config.ticker: config for config in configs}
+        self.log = log
+        self.max_workers = max_workers
+        self.use_stream = use_stream
+        # ATR 방식의 캔들 저장소를 티커들이 공유하도록 엔진당 하나만 생성
+        self.pricer = LegPricer(log=log)
+        self._wake_event = threading.Event()
+        self._woken_tickers = set()
+        self._woken_lock = threading.Lock()
+        self._executor = None
+        self._state_saved_at = {}
+        self.scheduler = scheduler or CheckScheduler()
+        # 티커별 미체결 주문 가격 {"sell", "buy"} 과 이미 가격 도달로 깨운 티커
+        self._legs = {}
+        self._crossed = set()
+        # 확인되지 않은 주문 의도가 남아 새 주문을 미룬 티커
+        self._intent_tickers = set()
+
+    def run(self, stop_event: threading.Event):
+        """stop_event 가 설정될 때까지 티커별 점검 일정에 맞춰 리밸런싱을 실행합니다.
+
+        다음 점검 시각은 CheckScheduler 가 주문 가격까지의 거리와 변동성으로 정하며
+        (최대 term_hour), 시세 허브가 있으면 가격이 주문에 닿는 즉시 깨어납니다.
+        """
+        self.log(Event("loop_started"))
+        # 이전 프로세스가 주문 응답을 기록하지 못하고 종료된 경우를 먼저 정리
+        # (다른 엔진/세션이 제출 중인 최근 의도는 유예 시간이 지난 뒤 대조)
+        reconcile_intents(self.api, self.log, INTENT_GRACE_SECONDS)
+        order_stream = self._start_order_stream() if self.use_stream else None
+        subscribe = getattr(self.market_data, "subscribe", None)
+        if subscribe:
+            subscribe(self.configs, self._on_prices)
+        next_due = {ticker: 0.0 for ticker in self.configs}
+        with self.workers():
+            while not stop_event.is_set():
+                now = time.monotonic()
+                due = {t for t, due_at in next_due.items() if due_at <= now}
+                due |= self._pop_woken_tickers()
+                REGISTRY.gauge("rebalance_due_tickers").set(len(due))
+                try:
+                    with timed("rebalance_iteration_seconds"):
+                        self.run_once(sorted(due))
+                except Exception as e:
+                    self.log(Event("loop_error", exc=e))
+                    delay = self.scheduler.backoff()
+                    self.log(Event("retry_wait", seconds=delay))
+                    stop_event.wait(delay)
+                    continue
+                self.scheduler.reset_backoff()
+                self._update_legs()
+                for ticker in due:
+                    max_seconds = self.configs[ticker].term_hour * 3600
+                    if ticker in self._intent_tickers:
+                        # 남은 의도는 유예 시간이 지나면 대조되므로 그때 다시 점검
+                        max_seconds = min(max_seconds, INTENT_GRACE_SECONDS)
+                    next_due[ticker] = now + self.scheduler.next_delay(
+                        ticker, self._legs.get(ticker), max_seconds
+                    )
+                timeout = max(min(next_due.values()) - time.monotonic(), 0)
+                self.log(Event("waiting", hours=timeout / 3600))
+                wait_for_wakeup(stop_event, self._wake_event, timeout)
+        if subscribe:
+            self.market_data.unsubscribe(self._on_prices)
+        if order_stream:
+            order_stream.stop()
+        self.log(Event("loop_stopped"))
+
+    def _update_legs(self):
+        """메모리에 유지되는 미체결 주문 목록으로 티커별 주문 가격을 갱신합니다."""
+        legs = defaultdict(dict)
+        for order in get_pending_orders():
+            if order[0] in self.configs:
+                legs[order[0]][order[1]] = order[3]
+        for ticker in self.configs:
+            if legs.get(ticker) != self._legs.get(ticker):
+                # 새 주문 쌍이 나가면 가격 도달 알림을 다시 받을 수 있음
+                self._crossed.discard(ticker)
+        self._legs = dict(legs)
+
+    def _on_prices(self, snapshot):
+        """시세 허브 갱신마다 변동성을 갱신하고, 주문 가격에 닿은 티커를 즉시 깨웁니다."""
+        woken = []
+        for ticker in self.configs:
+            price = snapshot.prices.get(ticker)
+            if price is None:
+                continue
+            self.scheduler.observe(ticker, price)
+            if ticker not in self._crossed and leg_crossed(
+                self._legs.get(ticker), price
+            ):
+                self._crossed.add(ticker)
+                woken.append(ticker)
+                self.log(Event("leg_crossed", ticker, price=price))
+        if woken:
+            with self._woken_lock:
+                self._woken_tickers.update(woken)
+            self._wake_event.set()
+
+    @contextmanager
+    def workers(self):
+        """with 블록 동안 run_once 가 같은 주문 워커 풀을 재사용하도록 합니다."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._executor = executor
+            try:
+                yield executor
+            finally:
+                self._executor = None
+
+    def run_once(self, tickers):
+        """지정한 티커들을 한 번 점검하고, 미체결 주문과 확인되지 않은 주문 의도가 없는 티커에 새 주문을 냅니다."""
+        if not tickers:
+            return
+        reconcile_intents(self.api, self.log, INTENT_GRACE_SECONDS)
+        sync_pending_orders(self.api, self.log, tickers=set(tickers))
+        pending_by_ticker = defaultdict(list)
+        for order in get_pending_orders():
+            pending_by_ticker[order[0]].append(order)
+        # 유예 시간 안의 의도는 대조되지 않았으므로, 접수 여부를 알 때까지 새 주문을 내지 않음
+        # (재시작 직후 이전 프로세스가 보낸 주문과 중복 제출되는 것을 막음)
+        intents_by_ticker = defaultdict(int)
+        for intent in get_open_intents():
+            intents_by_ticker[intent[1]] += 1
+        self._intent_tickers = set(intents_by_ticker) & set(tickers)
+
+        idle = []
+        for ticker in tickers:
+            pending_count = len(pending_by_ticker.get(ticker, []))
+            self.log(Event("pending_checked", ticker, count=pending_count))
+            if pending_count:
+                self.log(Event("pending_wait", ticker, count=pending_count))
+            elif intents_by_ticker.get(ticker):
+                self.log(Event("intent_wait", ticker, count=intents_by_ticker[ticker]))
+            else:
+                self.log(Event("all_filled", ticker))
+                idle.append(self.configs[ticker])
+
+        placed = set()
+        if idle:
+            if self._executor is not None:
+                placed = self._place_all(self._executor, idle)
+            else:
+                # run() 밖에서 run_once 만 호출한 경우 임시 풀을 사용
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    placed = self._place_all(executor, idle)
+
+        self._save_states(tickers, placed)
+
+    def _save_states(self, tickers, placed):
+        """주문을 낸 티커와 마지막 기록 후 TICKER_STATE_SAVE_SECONDS 가 지난 티커만 기록합니다."""
+        now = time.monotonic()
+        due = [
+            ticker
+            for ticker in tickers
+            if ticker in placed
+            or now - self._state_saved_at.get(ticker, -TICKER_STATE_SAVE_SECONDS)
+            >= TICKER_STATE_SAVE_SECONDS
+        ]
+        if not due:
+            return
+        save_ticker_states(
+            [
+                (
+                    ticker,
+                    self.configs[ticker].ratio,
+                    self.configs[ticker].price_ratio,
+                    self.configs[ticker].term_hour,
+                    ticker in placed,
+                )
+                for ticker in due
+            ]
+        )
+        self._state_saved_at.update(dict.fromkeys(due, now))
+
+    def _place_all(self, executor, configs):
+        """잔고/현재가 스냅샷 하나로 전체 주문 계획을 세우고 병렬 제출한 뒤 성공한 티커를 반환합니다."""
+        # 잔고와 현재가는 모든 티커가 하나의 스냅샷을 공유
+        balances = self.api.get_balances_by_currency()
+        prices = self.market_data.get_current_prices(
+            [config.ticker for config in configs]
+        )
+        plan = plan_rebalance(
+            configs, balances, prices, self._quote_all(executor, configs, prices)
+        )
+        for event in plan.skipped.values():
+            self.log(event)
+        futures = {
+            executor.submit(self._place, order): order.config.ticker
+            for order in plan.orders
+        }
+        wait(futures)
+        return {ticker for future, ticker in futures.items() if future.result()}
+
+    def _quote_all(self, executor, configs, prices):
+        """고정 비율이 아닌 가격 결정 방식(ATR, 호가)을 쓰는 티커의 주문 가격을 병렬로 구합니다."""
+        futures = {
+            executor.submit(self._quote, config, prices[config.ticker]): config.ticker
+            for config in configs
+            if (config.pricing != PRICING_FIXED or config.use_orderbook)
+            and prices.get(config.ticker) is not None
+        }
+        wait(futures)
+        return {
+            ticker: future.result()
+            for future, ticker in futures.items()
+            if future.result() is not None
+        }
+
+    def _quote(self, config: RebalanceConfig, price):
+        try:
+            return self.pricer.quote(self.api, config, price)
+        except Exception as e:
+            self.log(Event("order_error", config.ticker, exc=e))
+            return None
+
+    def _place(self, order: PlannedOrder):
+        config = order.config
+        try:
+            return place_rebalance_pair(
+                self.api,
+                self.log,
+                config,
+                order.price,
+                order.balance,
+                self.pricer,
+                legs=order.legs,
+            )
+        except Exception as e:
+            self.log(Event("order_error", config.ticker, exc=e))
+            return False
+
+    def _pop_woken_tickers(self):
+        with self._woken_lock:
+            woken, self._woken_tickers = self._woken_tickers, set()
+        return woken
+
+    def _start_order_stream(self):
+        """체결/취소 이벤트를 DB에 반영하고 해당 티커를 즉시 깨우는 주문 스트림을 시작합니다."""
+
+        def on_order(event):
+            ticker = event["ticker"]
+            if ticker not in self.configs or event["state"] not in TERMINAL_STATUSES:
+                return
+            update_order_statuses({event["uuid"]: event["state"]})
+            self.log(
+                Event("stream_order", ticker, uuid=event["uuid"], status=event["state"])
+            )
+            with self._woken_lock:
+                self._woken_tickers.add(ticker)
+            self._wake_event.set()
+
+        stream = OrderStream(
+            self.api.access_key,
+            self.api.secret_key,
+            on_order,
+            tickers=list(self.configs),
+            on_error=lambda e: self.log(Event("stream_error", exc=e)),
+        ).start()
+        self.log(Event("stream_started"))
+        return stream
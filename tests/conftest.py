@@ -0,0 +1,59 @@
+import pytest
+
+import order_db
+from mock_exchange import MockUpbitServer, connect, flat_candles
+from order_db import OrderStore, set_order_store
+from paper_exchange import PaperExchange
+
+TICKERS = ["KRW-BTC", "KRW-ETH"]
+
+
+@pytest.fixture
+def exchange():
+    return PaperExchange(
+        flat_candles(TICKERS), krw=10_000_000, coins={"BTC": 100.0, "ETH": 100.0}
+    )
+
+
+@pytest.fixture
+def server(exchange):
+    with MockUpbitServer(exchange) as server:
+        yield server
+
+
+@pytest.fixture
+def make_api(server):
+    """모의 서버에 연결된 UpbitAPI 를 만드는 함수"""
+    apis = []
+
+    def make(**kwargs):
+        api = connect(server, **kwargs)
+        apis.append(api)
+        return api
+
+    yield make
+    for api in apis:
+        api._order_pool.shutdown(wait=False)
+
+
+@pytest.fixture
+def api(make_api):
+    return make_api()
+
+
+@pytest.fixture
+def use_order_store():
+    """OrderStore 를 전역 주문 DB 로 등록하는 함수 (테스트가 끝나면 이전 저장소로 되돌림)"""
+    previous = order_db._default_store
+    yield set_order_store
+    set_order_store(previous)
+
+
+@pytest.fixture
+def store(use_order_store):
+    """전역 주문 DB 로 등록된 메모리 OrderStore"""
+    store = OrderStore(":memory:")
+    store.init_schema()
+    use_order_store(store)
+    yield store
+    store.close()
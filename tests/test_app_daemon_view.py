@@ -0,0 +1,71 @@
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import daemon_client
+import utils.common_utils
+
+ORDERS = [
+    ("KRW-BTC", "sell", f"uuid-{i}", 11_000.0, 1.0, "wait", "2024-01-01 00:00:00")
+    for i in range(120)
+]
+
+
+class FakeDaemonClient:
+    """데몬 HTTP 응답 대신 고정된 주문 이력을 돌려주는 클라이언트 (조회 인자를 기록)"""
+
+    page_requests = []
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def get_status(self):
+        return {"running": True, "started_at": "2024-01-01", "configs": []}
+
+    def get_orders_page(self, offset=0, limit=50, ticker=None, status=None):
+        self.page_requests.append((offset, limit, ticker, status))
+        return {
+            "rows": ORDERS[offset : offset + limit],
+            "total": len(ORDERS),
+            "tickers": ["KRW-BTC"],
+        }
+
+    def get_analytics(self):
+        return []
+
+    def get_logs(self, limit=200, level="INFO"):
+        return ["[리밸런싱 루프 시작]"]
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(daemon_client, "DaemonClient", FakeDaemonClient)
+    monkeypatch.setattr(
+        utils.common_utils,
+        "load_config",
+        lambda *args, **kwargs: {"daemon": {"url": "http://daemon"}},
+    )
+    FakeDaemonClient.page_requests = []
+    st.cache_resource.clear()
+    yield AppTest.from_file("../app.py", default_timeout=30).run()
+    st.cache_resource.clear()
+
+
+def test_daemon_view_pages_order_history(app):
+    assert not app.exception
+    assert FakeDaemonClient.page_requests[-1] == (0, 20, None, None)
+    assert len(app.main.dataframe[0].value) == 20
+    assert app.main.caption[0].value == "전체 120건 중 1~20건"
+
+    app.number_input(key="daemon_order_page").set_value(3).run()
+    assert FakeDaemonClient.page_requests[-1] == (40, 20, None, None)
+
+    app.selectbox(key="daemon_order_ticker_filter").select("KRW-BTC").run()
+    app.selectbox(key="daemon_order_status_filter").select("wait").run()
+    assert FakeDaemonClient.page_requests[-1] == (40, 20, "KRW-BTC", "wait")
+
+
+def test_daemon_view_does_not_block_the_script(app):
+    # 주기 갱신은 fragment 가 맡으므로 스크립트가 잠들거나 전체 재실행을 요청하지 않음
+    assert not app.exception
+    assert app.text[0].value == "[리밸런싱 루프 시작]"
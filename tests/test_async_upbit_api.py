@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+import async_upbit_api
+from async_upbit_api import AsyncUpbitAPI, SyncUpbitAPI
+from mock_exchange import connect, unlimited_scheduler
+
+
+@pytest.fixture
+def sync_api(server):
+    api = connect(server, api_class=SyncUpbitAPI, scheduler=unlimited_scheduler())
+    yield api
+    api.close()
+
+
+def test_orders_and_status_through_mock_server(sync_api, exchange):
+    result = sync_api.rebalancing_orders(
+        "KRW-BTC", 10_000.0, 1.0, 0.05, prices={"sell": 10_500, "buy": 9_500}
+    )
+    assert sync_api.check_order_status(result["sell_uuid"]) == "wait"
+    assert sync_api.check_order_statuses(
+        [("KRW-BTC", result["sell_uuid"]), ("KRW-BTC", result["buy_uuid"])]
+    ) == {result["sell_uuid"]: "wait", result["buy_uuid"]: "wait"}
+    assert sync_api.cancel_order(result["buy_uuid"])
+    assert sync_api.check_order_status(result["buy_uuid"]) == "cancel"
+
+
+def test_failures_return_none_without_output(sync_api, server, capsys):
+    server.inject("POST", "/v1/orders", status=500)
+    server.inject("GET", "/v1/order", status=500)
+
+    assert sync_api.place_limit_order("KRW-BTC", "sell", 10_500, 1.0) is None
+    assert sync_api.check_order_status("missing") == "unknown"
+    assert not sync_api.cancel_order("missing")
+    assert capsys.readouterr().out == ""
+
+
+def test_rate_limited_request_is_retried(sync_api, server):
+    server.inject("GET", "/v1/order", status=429)
+    order = server.exchange.place_limit_order("KRW-BTC", "sell", 10_500.0, 1.0)
+
+    assert sync_api.check_order_status(order["uuid"]) == "wait"
+    assert server.calls[("GET", "/v1/order")] == 2
+
+
+def test_concurrent_balance_reads_share_one_request(server):
+    async def run():
+        api = connect(server, api_class=AsyncUpbitAPI, scheduler=unlimited_scheduler())
+        try:
+            return await asyncio.gather(
+                *(api.get_balances_by_currency() for _ in range(8))
+            )
+        finally:
+            await api.close()
+
+    results = asyncio.run(run())
+    assert all(result == results[0] for result in results)
+    assert server.calls[("GET", "/v1/accounts")] == 1
+
+
+def test_timeouts_return_none_like_sync_client(server, monkeypatch):
+    monkeypatch.setattr(async_upbit_api, "REQUEST_TIMEOUT", 0.2)
+    server.inject("POST", "/v1/orders", delay=1.0)
+    server.inject("GET", "/v1/order", delay=1.0)
+    server.inject("DELETE", "/v1/order", delay=1.0)
+
+    async def run():
+        api = connect(server, api_class=AsyncUpbitAPI, scheduler=unlimited_scheduler())
+        try:
+            return (
+                await api.place_limit_order("KRW-BTC", "sell", 10_500, 1.0),
+                await api.check_order_status("uuid-1"),
+                await api.cancel_order("uuid-1"),
+            )
+        finally:
+            await api.close()
+
+    assert asyncio.run(run()) == (None, "unknown", False)
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pyupbit
+
+from utils.candle_store import (
+    FETCH_PAGE_SIZE,
+    KST_OFFSET,
+    CandleStore,
+    PyupbitCandleSource,
+    now_kst,
+)
+
+
+class FakeSource:
+    """index 의 캔들 중 to 이전 count 개를 돌려주는 소스 (호출한 to 를 기록)"""
+
+    def __init__(self, index):
+        self.index = index
+        self.calls = []
+
+    def fetch(self, ticker, interval, to, count):
+        self.calls.append(to)
+        index = self.index if to is None else self.index[self.index < to]
+        index = index[-count:]
+        values = np.arange(len(index), dtype=float)
+        return pd.DataFrame(
+            {col: values for col in ("open", "high", "low", "close", "volume")},
+            index=index,
+        )
+
+
+class StuckSource(FakeSource):
+    """to 를 무시하고 항상 최신 페이지를 돌려주는 소스"""
+
+    def fetch(self, ticker, interval, to, count):
+        return super().fetch(ticker, interval, None, count)
+
+
+def _minutes(end, count):
+    return pd.date_range(end=end.floor("min"), periods=count, freq="1min")
+
+
+def test_first_update_pages_back_to_days_ago(tmp_path):
+    source = FakeSource(_minutes(now_kst(), 3 * 24 * 60))
+    store = CandleStore(str(tmp_path), source)
+
+    added = store.update("KRW-BTC", "minute1", days_ago=1)
+
+    assert 24 * 60 - 1 <= added <= 24 * 60
+    # 하루치(1440개)를 200개씩 받으면 8페이지
+    assert len(source.calls) == -(-24 * 60 // FETCH_PAGE_SIZE)
+    frame = store.load_frame("KRW-BTC", "minute1")
+    assert frame.index.is_monotonic_increasing
+    assert not frame.index.duplicated().any()
+
+
+def test_update_only_fetches_after_last_timestamp(tmp_path):
+    index = _minutes(now_kst(), 600)
+    source = FakeSource(index[:500])
+    store = CandleStore(str(tmp_path), source)
+    store.update("KRW-BTC", "minute1", days_ago=1)
+
+    source.index = index
+    source.calls.clear()
+    assert store.update("KRW-BTC", "minute1") == 100
+    assert len(source.calls) == 1
+    assert store.last_timestamp("KRW-BTC", "minute1") == index[-1]
+
+
+def test_stops_when_source_does_not_move_backward(tmp_path):
+    source = StuckSource(_minutes(now_kst(), 3 * 24 * 60))
+    store = CandleStore(str(tmp_path), source)
+
+    assert store.update("KRW-BTC", "minute1", days_ago=1) == FETCH_PAGE_SIZE
+    assert len(source.calls) == 2
+
+
+def test_pyupbit_source_sends_to_as_utc(monkeypatch):
+    received = {}
+
+    def get_ohlcv(ticker, interval, count, to):
+        received["to"] = to
+        return None
+
+    monkeypatch.setattr(pyupbit, "get_ohlcv", get_ohlcv)
+    to = pd.Timestamp("2024-01-01 09:00")
+    frame = PyupbitCandleSource().fetch("KRW-BTC", "minute1", to, 200)
+
+    assert received["to"] == to - KST_OFFSET
+    assert frame.empty
+
+
+def test_last_stored_candle_is_refetched_and_overwritten(tmp_path):
+    index = _minutes(now_kst(), 300)
+    source = FakeSource(index[:250])
+    store = CandleStore(str(tmp_path), source)
+    store.update("KRW-BTC", "minute1", days_ago=1)
+    forming = store.load_frame("KRW-BTC", "minute1").loc[index[249]]
+
+    # 다음 조회에서는 저장 당시 만들어지던 마지막 캔들이 확정된 값으로 바뀌어 있음
+    source.index = index
+    assert store.update("KRW-BTC", "minute1") == 50
+
+    frame = store.load_frame("KRW-BTC", "minute1")
+    assert len(frame) == 250 + 50
+    assert not frame.index.duplicated().any()
+    latest = source.fetch("KRW-BTC", "minute1", None, FETCH_PAGE_SIZE)
+    assert frame.loc[index[249], "close"] != forming["close"]
+    assert frame.loc[index[249], "close"] == latest.loc[index[249], "close"]
@@ -0,0 +1,150 @@
+import math
+import random
+
+import pytest
+
+from check_scheduler import (
+    BACKOFF_MAX_SECONDS,
+    MIN_CHECK_SECONDS,
+    VOLATILITY_ALPHA,
+    CheckScheduler,
+    leg_crossed,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class UpperRng:
+    """uniform 이 항상 상한을 돌려주는 난수 생성기 (재시도 대기 상한 확인용)"""
+
+    def uniform(self, a, b):
+        return b
+
+
+def _scheduler(clock, price=100.0, step=0.01, seconds=1.0):
+    """price 에서 seconds 초 뒤 로그 수익률 step 만큼 움직인 관측값 두 개를 넣은 스케줄러"""
+    scheduler = CheckScheduler(clock=clock, rng=random.Random(0))
+    scheduler.observe("KRW-BTC", price)
+    clock.now += seconds
+    scheduler.observe("KRW-BTC", price * math.exp(step))
+    return scheduler
+
+
+@pytest.mark.parametrize(
+    "legs, price, crossed",
+    [
+        ({"sell": 105, "buy": 95}, 100, False),
+        ({"sell": 105, "buy": 95}, 105, True),
+        ({"sell": 105, "buy": 95}, 94, True),
+        ({"sell": 105}, 94, False),
+        ({}, 100, False),
+        ({"sell": 105, "buy": 95}, None, False),
+    ],
+)
+def test_leg_crossed(legs, price, crossed):
+    assert leg_crossed(legs, price) is crossed
+
+
+def test_unknown_volatility_waits_max_seconds():
+    clock = FakeClock()
+    scheduler = CheckScheduler(clock=clock)
+    legs = {"sell": 105, "buy": 95}
+
+    assert scheduler.next_delay("KRW-BTC", legs, 3600) == 3600
+    scheduler.observe("KRW-BTC", 100)
+    # 관측값 하나로는 변동성을 모름
+    assert scheduler.next_delay("KRW-BTC", legs, 3600) == 3600
+    assert scheduler.next_delay("KRW-BTC", {}, 3600) == 3600
+
+
+def test_observations_at_same_instant_are_ignored():
+    clock = FakeClock()
+    scheduler = CheckScheduler(clock=clock)
+    scheduler.observe("KRW-BTC", 100)
+    scheduler.observe("KRW-BTC", 200)
+
+    assert scheduler.last_price("KRW-BTC") == 200
+    assert scheduler.next_delay("KRW-BTC", {"sell": 300}, 3600) == 3600
+
+
+def test_delay_is_half_the_expected_hit_time():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    price = scheduler.last_price("KRW-BTC")
+
+    # 분산 1e-4/초, 가장 가까운 주문까지 로그 거리 0.5 -> 예상 2_500초의 절반
+    legs = {"sell": price * math.exp(0.5), "buy": price * math.exp(-0.8)}
+    assert scheduler.next_delay("KRW-BTC", legs, 3600) == pytest.approx(1250)
+    assert scheduler.next_delay("KRW-BTC", legs, 600) == 600
+
+
+def test_delay_never_drops_below_min_seconds():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    price = scheduler.last_price("KRW-BTC")
+
+    legs = {"sell": price * math.exp(0.1), "buy": price * math.exp(-0.1)}
+    assert scheduler.next_delay("KRW-BTC", legs, 3600) == MIN_CHECK_SECONDS
+    # 이미 닿은 주문은 최소 간격 뒤 (최대 간격이 더 짧으면 그 값)
+    crossed = {"sell": price, "buy": price * 0.9}
+    assert scheduler.next_delay("KRW-BTC", crossed, 3600) == MIN_CHECK_SECONDS
+    assert scheduler.next_delay("KRW-BTC", crossed, 30) == 30
+
+
+def test_volatility_is_an_exponential_moving_average():
+    clock = FakeClock()
+    scheduler = _scheduler(clock)
+    price = scheduler.last_price("KRW-BTC")
+    clock.now += 1
+    scheduler.observe("KRW-BTC", price * math.exp(0.03))
+
+    variance = 1e-4 + VOLATILITY_ALPHA * (9e-4 - 1e-4)
+    legs = {"sell": scheduler.last_price("KRW-BTC") * math.exp(0.5)}
+    expected = 0.5 * 0.25 / variance
+    assert scheduler.next_delay("KRW-BTC", legs, 3600) == pytest.approx(expected)
+
+
+def test_volatile_ticker_is_checked_sooner_on_simulated_walk():
+    clock = FakeClock()
+    rng = random.Random(42)
+    scheduler = CheckScheduler(clock=clock, rng=rng)
+    prices = {"KRW-BTC": 100.0, "KRW-ETH": 100.0}
+    sigma = {"KRW-BTC": 0.001, "KRW-ETH": 0.004}
+    for _ in range(500):
+        clock.now += 10
+        for ticker in prices:
+            prices[ticker] *= math.exp(rng.gauss(0, sigma[ticker] * math.sqrt(10)))
+            scheduler.observe(ticker, prices[ticker])
+
+    delays = {
+        ticker: scheduler.next_delay(
+            ticker, {"sell": price * 1.05, "buy": price * 0.95}, 24 * 3600
+        )
+        for ticker, price in prices.items()
+    }
+    assert MIN_CHECK_SECONDS < delays["KRW-ETH"] < delays["KRW-BTC"] < 24 * 3600
+    # 분산이 16배면 예상 도달 시간은 1/16 (추정 오차 허용)
+    assert delays["KRW-BTC"] / delays["KRW-ETH"] == pytest.approx(16, rel=0.3)
+
+
+def test_backoff_doubles_up_to_cap_and_resets():
+    scheduler = CheckScheduler(rng=UpperRng())
+
+    caps = [scheduler.backoff() for _ in range(10)]
+    assert caps == [5, 10, 20, 40, 80, 160, 320, 600, 600, 600]
+    scheduler.reset_backoff()
+    assert scheduler.backoff() == 5
+
+
+def test_backoff_is_jittered_between_half_and_cap():
+    scheduler = CheckScheduler(rng=random.Random(7))
+
+    for errors in range(1, 12):
+        cap = min(5 * 2 ** (errors - 1), BACKOFF_MAX_SECONDS)
+        assert cap / 2 <= scheduler.backoff() <= cap
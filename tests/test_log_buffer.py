@@ -0,0 +1,65 @@
+import logging
+
+from events import Event
+from utils.log_buffer import LogBuffer, infer_level
+
+
+def _messages(buffer, **kwargs):
+    return [message for _, _, message in buffer.tail(**kwargs)]
+
+
+def test_ring_keeps_newest_entries_and_reads_newest_first():
+    buffer = LogBuffer(3)
+    buffer.extend(["a", "b"])
+    buffer.extend(["c", "d", "e"])
+
+    assert len(buffer) == 3
+    assert _messages(buffer) == ["e", "d", "c"]
+    assert _messages(buffer, limit=2) == ["e", "d"]
+    assert buffer.render_text() == "e\nd\nc"
+
+
+def test_tail_filters_by_level():
+    buffer = LogBuffer(10)
+    buffer.extend(["정보", "[경고] 느림", "[오류] 실패", Event("loop_error", exc=None)])
+
+    assert infer_level("[경고] 느림") == logging.WARNING
+    assert _messages(buffer, min_level=logging.ERROR)[1] == "[오류] 실패"
+    assert len(_messages(buffer, min_level=logging.WARNING)) == 3
+    assert len(_messages(buffer, min_level=logging.ERROR, limit=1)) == 1
+
+
+def _spilled(path):
+    return [line.split(" ", 3)[3] for line in path.read_text("utf-8").splitlines()]
+
+
+def test_evicted_entries_are_spilled_in_order(tmp_path):
+    path = tmp_path / "logs" / "spill.log"
+    buffer = LogBuffer(2, str(path))
+    buffer.extend(["1", "2", "3"])
+    buffer.extend(["[오류] 4"])
+
+    assert _messages(buffer) == ["[오류] 4", "3"]
+    assert _spilled(path) == ["1", "2"]
+    assert " INFO " in path.read_text("utf-8")
+
+
+def test_batch_larger_than_capacity_spills_its_own_overflow(tmp_path):
+    path = tmp_path / "spill.log"
+    buffer = LogBuffer(2, str(path))
+    buffer.extend(["old"])
+    buffer.extend(["a", "b", "c", "d"])
+
+    assert _messages(buffer) == ["d", "c"]
+    assert _spilled(path) == ["old", "a", "b"]
+
+
+def test_spill_file_rotates(tmp_path):
+    path = tmp_path / "spill.log"
+    buffer = LogBuffer(1, str(path), max_bytes=200, backup_count=2)
+    buffer.extend([f"line {i:04d}" for i in range(50)])
+
+    assert (tmp_path / "spill.log.1").exists()
+    assert (tmp_path / "spill.log.2").exists()
+    assert not (tmp_path / "spill.log.3").exists()
+    assert _spilled(path)[-1] == "line 0048"
@@ -0,0 +1,130 @@
+import threading
+import time
+
+from market_data import MarketDataHub
+
+TICKERS = ["KRW-BTC", "KRW-ETH"]
+
+
+class FakeFeed:
+    """호출마다 가격을 1씩 올려 돌려주는 시세 함수 (gate 가 열릴 때까지 응답을 붙잡을 수 있음)"""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self.error = error
+
+    def __call__(self, tickers):
+        self.calls.append(list(tickers))
+        self.started.set()
+        self.gate.wait(5)
+        if self.error:
+            raise self.error
+        return {ticker: float(len(self.calls)) for ticker in tickers}
+
+
+def test_prices_come_from_one_batched_fetch():
+    feed = FakeFeed()
+    hub = MarketDataHub(feed)
+
+    assert hub.get_current_prices(TICKERS) == {"KRW-BTC": 1.0, "KRW-ETH": 1.0}
+    assert hub.get_current_price("KRW-BTC") == 1.0
+    assert feed.calls == [TICKERS]
+
+
+def test_subscribe_does_not_wait_for_in_flight_fetch():
+    feed = FakeFeed()
+    hub = MarketDataHub(feed)
+    hub.subscribe(["KRW-BTC"])
+    feed.gate.clear()
+    worker = threading.Thread(target=hub.refresh)
+    worker.start()
+    feed.started.wait(5)
+
+    started = time.monotonic()
+    hub.subscribe(["KRW-ETH"], lambda snapshot: None)
+    assert time.monotonic() - started < 0.5
+
+    feed.gate.set()
+    worker.join(5)
+    # 조회 중에 더한 티커는 다음 갱신부터 포함
+    assert hub.refresh().prices == {"KRW-BTC": 2.0, "KRW-ETH": 2.0}
+
+
+def test_concurrent_readers_share_one_fetch():
+    feed = FakeFeed()
+    hub = MarketDataHub(feed)
+    hub.subscribe(TICKERS)
+    feed.gate.clear()
+    results = []
+    readers = [
+        threading.Thread(target=lambda: results.append(hub.get_current_prices(TICKERS)))
+        for _ in range(8)
+    ]
+    for reader in readers:
+        reader.start()
+    feed.started.wait(5)
+    time.sleep(0.05)
+    feed.gate.set()
+    for reader in readers:
+        reader.join(5)
+
+    assert len(feed.calls) == 1
+    assert results == [{"KRW-BTC": 1.0, "KRW-ETH": 1.0}] * 8
+
+
+def test_stale_snapshot_is_refreshed():
+    feed = FakeFeed()
+    hub = MarketDataHub(feed, stale_seconds=0)
+    hub.get_current_prices(TICKERS)
+    time.sleep(0.01)
+
+    assert hub.get_current_prices(TICKERS)["KRW-BTC"] == 2.0
+
+
+def test_callbacks_see_new_snapshots_and_errors_are_logged():
+    events, seen = [], []
+    hub = MarketDataHub(FakeFeed(), log=events.append)
+    hub.subscribe(TICKERS, lambda snapshot: seen.append(snapshot.version))
+
+    def broken(snapshot):
+        raise ValueError("callback")
+
+    hub.subscribe([], broken)
+    hub.refresh()
+    hub.refresh()
+
+    assert seen == [1, 2]
+    assert [event.type for event in events] == ["market_data_error"] * 2
+
+
+def test_poll_errors_are_logged_and_polling_continues():
+    events = []
+    feed = FakeFeed(error=OSError("down"))
+    hub = MarketDataHub(feed, interval=0.01, log=events.append)
+    hub.subscribe(TICKERS)
+    hub.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(events) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        hub.stop()
+
+    assert len(events) >= 3
+    assert {event.type for event in events} == {"market_data_error"}
+
+
+def test_hub_bypasses_the_api_price_cache(make_api, server):
+    api = make_api(cache_ttl=60)
+    hub = MarketDataHub(api.fetch_current_prices)
+    hub.subscribe(TICKERS)
+
+    hub.refresh()
+    hub.refresh()
+    assert server.calls[("GET", "/v1/ticker")] == 2
+    # 허브가 받은 값은 캐시에도 들어가 개별 조회가 요청을 만들지 않음
+    assert api.get_current_price("KRW-ETH") == 10_000.0
+    assert server.calls[("GET", "/v1/ticker")] == 2
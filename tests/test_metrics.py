@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from utils.metrics import Histogram, MetricsRegistry, timed
+
+
+def test_quantiles_use_bucket_upper_bounds():
+    histogram = Histogram(buckets=(0.01, 0.1, 1))
+    assert histogram.quantile(0.5) == 0.0
+
+    for value in [0.005] * 50 + [0.05] * 45 + [0.5] * 4 + [2]:
+        histogram.observe(value)
+
+    assert histogram.count == 100
+    assert histogram.sum == pytest.approx(0.25 + 2.25 + 2 + 2)
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.95) == 0.1
+    assert histogram.quantile(0.99) == 1
+    assert histogram.quantile(1.0) == float("inf")
+
+
+def test_value_on_bound_falls_in_that_bucket():
+    histogram = Histogram(buckets=(0.01, 0.1))
+    histogram.observe(0.01)
+
+    assert histogram.counts == [1, 0, 0]
+
+
+def test_prometheus_text():
+    registry = MetricsRegistry()
+    registry.histogram("api_seconds", op="ticker").observe(0.003)
+    registry.histogram("api_seconds", op="ticker").observe(20)
+    registry.gauge("queue_depth").set(3)
+
+    lines = registry.render_prometheus().splitlines()
+
+    assert lines[0] == "# TYPE api_seconds histogram"
+    assert 'api_seconds_bucket{op="ticker",le="0.001"} 0' in lines
+    assert 'api_seconds_bucket{op="ticker",le="0.005"} 1' in lines
+    assert 'api_seconds_bucket{op="ticker",le="10"} 1' in lines
+    assert 'api_seconds_bucket{op="ticker",le="+Inf"} 2' in lines
+    assert 'api_seconds_sum{op="ticker"} 20.003' in lines
+    assert 'api_seconds_count{op="ticker"} 2' in lines
+    assert lines[-2:] == ["# TYPE queue_depth gauge", "queue_depth 3"]
+
+
+def test_snapshot_rows():
+    registry = MetricsRegistry()
+    registry.histogram("db_seconds", op="save").observe(0.02)
+
+    [row] = registry.snapshot()
+    assert row["labels"] == "op=save"
+    assert row["count"] == 1
+    assert row["avg_ms"] == pytest.approx(20)
+    assert row["p95_ms"] == pytest.approx(25)
+
+
+def test_timed_decorator_records_each_concurrent_call():
+    registry = MetricsRegistry()
+    barrier = threading.Barrier(4)
+
+    @timed("work_seconds", registry=registry)
+    def work(seconds):
+        barrier.wait(5)
+        time.sleep(seconds)
+
+    threads = [threading.Thread(target=work, args=(0.02,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    histogram = registry.histogram("work_seconds")
+    assert histogram.count == 4
+    # 호출마다 시작 시각을 따로 보관하므로 각각 약 20ms (서로 덮어쓰지 않음)
+    assert 4 * 0.02 <= histogram.sum < 4 * 0.5
+
+
+def test_timed_context_records_failures_and_reraises():
+    registry = MetricsRegistry()
+
+    with pytest.raises(ValueError):
+        with registry.timed("op_seconds", op="fail"):
+            raise ValueError("boom")
+
+    assert registry.histogram("op_seconds", op="fail").count == 1
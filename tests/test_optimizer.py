@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from optimizer import DEFAULT_CONFIG, load_optimizer_config, optimize_ticker
+from utils.candle_store import CandleStore, now_kst
+
+
+class ZigzagSource:
+    """종가가 9_000 과 11_000 사이를 오가는 1분 캔들 소스 (호출 인자를 기록)"""
+
+    def __init__(self, minutes=600, error=None):
+        self.minutes, self.error = minutes, error
+        self.calls = []
+
+    def fetch(self, ticker, interval, to, count):
+        self.calls.append((ticker, interval, to))
+        if self.error:
+            raise self.error
+        index = pd.date_range(
+            end=now_kst().floor("min"), periods=self.minutes, freq="1min"
+        )
+        if to is not None:
+            index = index[index < to]
+        index = index[-count:]
+        close = 10_000 + 1_000 * np.sin(np.arange(len(index)) / 30)
+        return pd.DataFrame(
+            {
+                "open": close,
+                "high": close * 1.001,
+                "low": close * 0.999,
+                "close": close,
+                "volume": np.ones(len(index)),
+            },
+            index=index,
+        )
+
+
+def _config(**overrides):
+    return {
+        **DEFAULT_CONFIG,
+        "ratios": [10],
+        "price_ratios": [3, 5],
+        "term_hours": [1],
+        "max_workers": 1,
+        **overrides,
+    }
+
+
+def test_candles_are_updated_before_sweeping(tmp_path):
+    source = ZigzagSource()
+    store = CandleStore(str(tmp_path), source)
+
+    ranked, candles = optimize_ticker(store, "KRW-BTC", _config(days_ago=1))
+
+    assert source.calls[0] == ("KRW-BTC", "minute1", None)
+    assert candles == 600
+    assert list(ranked["rank"]) == [1, 2]
+    assert set(ranked["price_ratio"]) == {0.03, 0.05}
+
+
+def test_failed_update_falls_back_to_stored_candles(tmp_path):
+    CandleStore(str(tmp_path), ZigzagSource()).update("KRW-BTC", "minute1", 1)
+    store = CandleStore(str(tmp_path), ZigzagSource(error=OSError("down")))
+    messages = []
+
+    ranked, candles = optimize_ticker(store, "KRW-BTC", _config(), log=messages.append)
+
+    assert candles == 600 and len(ranked) == 2
+    assert len(messages) == 1 and "down" in messages[0]
+
+
+def test_nothing_stored_and_update_fails_skips_ticker(tmp_path):
+    store = CandleStore(str(tmp_path), ZigzagSource(error=OSError("down")))
+
+    assert optimize_ticker(store, "KRW-BTC", _config(), log=lambda m: None) == (
+        None,
+        0,
+    )
+
+
+def test_days_ago_defaults_to_top_level_setting(tmp_path):
+    conf = tmp_path / "config.yaml"
+    conf.write_text("days_ago: 7\noptimizer:\n  tickers: [KRW-BTC]\n")
+    assert load_optimizer_config(str(conf))["days_ago"] == 7
+
+    conf.write_text("days_ago: 7\noptimizer:\n  days_ago: 3\n")
+    assert load_optimizer_config(str(conf))["days_ago"] == 3
@@ -0,0 +1,89 @@
+import duckdb
+
+from order_db import LEGACY_UUID_PREFIX, OrderStore
+
+LEGACY_ROWS = [
+    ("KRW-BTC", "sell", "uuid-1", 10_500.0, 1.0, "wait", "2024-01-01 00:00:00"),
+    ("KRW-BTC", "sell", "uuid-1", 10_500.0, 1.0, "done", "2024-01-01 01:00:00"),
+    ("KRW-BTC", "buy", "uuid-2", 9_500.0, 1.0, "wait", "2024-01-01 00:00:00"),
+    ("KRW-ETH", "buy", None, 9_000.0, 2.0, "wait", "2024-01-02 00:00:00"),
+    ("KRW-ETH", "sell", None, 11_000.0, 2.0, "done", "2024-01-03 00:00:00"),
+]
+
+
+def _legacy_store(tmp_path):
+    path = str(tmp_path / "orders.duckdb")
+    con = duckdb.connect(path)
+    con.execute(
+        "CREATE TABLE orders (ticker VARCHAR, order_type VARCHAR, uuid VARCHAR, "
+        "price DOUBLE, amount DOUBLE, status VARCHAR, created_at TIMESTAMP)"
+    )
+    con.executemany("INSERT INTO orders VALUES (?, ?, ?, ?, ?, ?, ?)", LEGACY_ROWS)
+    con.close()
+    store = OrderStore(path)
+    store.init_schema()
+    return store
+
+
+def test_migration_keeps_rows_without_uuid(tmp_path):
+    store = _legacy_store(tmp_path)
+
+    rows = {row[2]: row for row in store.get_recent_orders(10)}
+    assert set(rows) == {"uuid-1", "uuid-2", "legacy-1", "legacy-2"}
+    assert rows["uuid-1"][5] == "done"
+    assert rows["legacy-1"][:2] == ("KRW-ETH", "buy")
+    # uuid 가 없던 미체결 행은 거래소에 조회할 수 없으므로 동기화 대상에서 제외
+    assert [row[2] for row in store.get_pending_orders()] == ["uuid-2"]
+    assert store.count_orders(ticker="KRW-ETH") == 2
+    assert all(
+        row[2].startswith(LEGACY_UUID_PREFIX)
+        for row in store.get_orders_page(0, 10, ticker="KRW-ETH")
+    )
+    store.close()
+
+
+def test_migration_indexes_ticker_and_status(tmp_path):
+    store = _legacy_store(tmp_path)
+
+    indexes = {
+        name
+        for name, in store._cursor()
+        .execute("SELECT index_name FROM duckdb_indexes() WHERE table_name='orders'")
+        .fetchall()
+    }
+    assert {"idx_orders_ticker", "idx_orders_status"} <= indexes
+    assert store.count_orders(status="done") == 2
+    store.update_statuses({"uuid-2": "cancel"})
+    assert store.count_orders(status="wait") == 1
+    store.close()
+
+
+def test_version_changes_only_when_orders_change(store):
+    order = ("KRW-BTC", "sell", "uuid-1", 10_500.0, 1.0, "wait")
+    start = store.version
+
+    store.save_orders([order])
+    assert store.version == start + 1
+    # 이미 저장된 주문, 조회, 주문 의도는 주문 이력을 바꾸지 않음
+    store.save_orders([order])
+    store.get_orders_page(0, 10)
+    store.record_intents([("KRW-BTC", "buy", 9_500.0, 1.0)])
+    assert store.version == start + 1
+
+    store.update_statuses({"uuid-1": "done"})
+    assert store.version == start + 2
+
+
+def test_version_counts_only_writes_through_the_same_store(tmp_path):
+    path = str(tmp_path / "orders.duckdb")
+    writer = OrderStore(path)
+    writer.init_schema()
+    reader = OrderStore(path)
+
+    writer.save_orders([("KRW-BTC", "sell", "uuid-1", 10_500.0, 1.0, "wait")])
+
+    # 변경 번호는 메모리 값이라 다른 연결의 쓰기는 반영되지 않음 (쓰기는 저장소 하나로)
+    assert reader.count_orders() == 1
+    assert (writer.version, reader.version) == (1, 0)
+    reader.close()
+    writer.close()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import threading
+import time
+
+import jwt
+import pytest
+from websockets.asyncio.server import serve
+
+from order_stream import OrderStream
+
+ACCESS_KEY = "stream-access-key"
+SECRET_KEY = "stream-secret-key-for-local-tests-only"
+
+# Upbit myOrder 스트림에서 기록한 형식의 메시지 (필요한 필드만)
+RECORDED = [
+    {
+        "type": "myOrder",
+        "code": "KRW-BTC",
+        "uuid": "u-1",
+        "ask_bid": "ASK",
+        "state": "wait",
+    },
+    {"type": "myTrade", "code": "KRW-BTC", "uuid": "u-1"},
+    {
+        "type": "myOrder",
+        "code": "KRW-BTC",
+        "uuid": "u-1",
+        "ask_bid": "ASK",
+        "state": "done",
+    },
+    {
+        "type": "myOrder",
+        "code": "KRW-ETH",
+        "uuid": "u-2",
+        "ask_bid": "BID",
+        "state": "cancel",
+    },
+]
+
+
+class ReplayServer:
+    """연결마다 sessions 의 다음 메시지 목록을 재생하고 연결을 끊는 로컬 WebSocket 서버"""
+
+    def __init__(self, sessions, as_bytes=False):
+        self.sessions = list(sessions)
+        self.as_bytes = as_bytes
+        self.subscriptions = []
+        self.headers = []
+        self.url = None
+        self._ready = threading.Event()
+        self._loop = None
+        self._stop = None
+
+    async def _handler(self, ws):
+        self.headers.append(ws.request.headers.get("Authorization"))
+        self.subscriptions.append(json.loads(await ws.recv()))
+        messages = self.sessions.pop(0) if self.sessions else []
+        for message in messages:
+            data = json.dumps(message)
+            await ws.send(data.encode() if self.as_bytes else data)
+        if self.sessions:
+            return
+        # 마지막 세션은 클라이언트가 끊을 때까지 유지
+        await ws.wait_closed()
+
+    async def _main(self):
+        self._stop = asyncio.Event()
+        async with serve(self._handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            self.url = f"ws://127.0.0.1:{port}"
+            self._ready.set()
+            await self._stop.wait()
+
+    def __enter__(self):
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self._main())
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(5)
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _stream(server, received, errors=None, tickers=("KRW-BTC", "KRW-ETH")):
+    return OrderStream(
+        ACCESS_KEY,
+        SECRET_KEY,
+        received.append,
+        tickers=tickers,
+        url=server.url,
+        on_error=errors.append if errors is not None else None,
+        reconnect_delay=0.05,
+    )
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_replays_my_order_events(as_bytes):
+    received = []
+    with ReplayServer([RECORDED], as_bytes=as_bytes) as server:
+        stream = _stream(server, received).start()
+        try:
+            assert wait_until(lambda: len(received) == 3)
+        finally:
+            stream.stop()
+
+    assert received == [
+        {"ticker": "KRW-BTC", "uuid": "u-1", "side": "sell", "state": "wait"},
+        {"ticker": "KRW-BTC", "uuid": "u-1", "side": "sell", "state": "done"},
+        {"ticker": "KRW-ETH", "uuid": "u-2", "side": "buy", "state": "cancel"},
+    ]
+    assert not stream.is_alive()
+
+
+def test_subscribes_with_signed_token_and_tickers():
+    with ReplayServer([[]]) as server:
+        stream = _stream(server, [], tickers=["KRW-BTC"]).start()
+        try:
+            assert wait_until(lambda: server.subscriptions)
+        finally:
+            stream.stop()
+
+    ticket, request = server.subscriptions[0]
+    assert ticket["ticket"]
+    assert request == {"type": "myOrder", "codes": ["KRW-BTC"]}
+    scheme, token = server.headers[0].split()
+    assert scheme == "Bearer"
+    assert (
+        jwt.decode(token, SECRET_KEY, algorithms=["HS256"])["access_key"] == ACCESS_KEY
+    )
+
+
+def test_reconnects_after_disconnect_and_reports_error():
+    received, errors = [], []
+    with ReplayServer([RECORDED[:1], RECORDED[2:]]) as server:
+        stream = _stream(server, received, errors).start()
+        try:
+            assert wait_until(lambda: len(received) == 3)
+        finally:
+            stream.stop()
+
+    assert [event["state"] for event in received] == ["wait", "done", "cancel"]
+    assert len(server.subscriptions) == 2
+    assert len(errors) == 1
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from analytics import load_ticker_summary
+from order_db import OrderStore
+from paper_exchange import PaperExchange, run_paper
+from rebalance_engine import RebalanceConfig, RebalanceEngine
+
+TICKER = "KRW-BTC"
+
+
+def sine_candles(length=24 * 60, period=240, amplitude=0.1):
+    """1분 캔들로 period 분 주기의 사인파를 그리는 가격"""
+    index = pd.date_range("2024-01-01", periods=length, freq="1min")
+    close = 10_000 * (1 + amplitude * np.sin(np.arange(length) * 2 * np.pi / period))
+    return pd.DataFrame(
+        {"high": close * 1.001, "low": close * 0.999, "close": close}, index=index
+    )
+
+
+def _run(use_order_store, krw=1_000_000, coin=50.0, candles_per_cycle=60):
+    exchange = PaperExchange({TICKER: sine_candles()}, krw=krw, coins={"BTC": coin})
+    store = OrderStore(":memory:", clock=exchange.now)
+    store.init_schema()
+    use_order_store(store)
+    engine = RebalanceEngine(
+        exchange,
+        [RebalanceConfig(TICKER, 0.1, 0.02, 1)],
+        log=lambda event: None,
+        max_workers=1,
+    )
+    cycles = run_paper(engine, exchange, candles_per_cycle)
+    return exchange, store, cycles
+
+
+def test_limit_orders_fill_from_replayed_candles(use_order_store):
+    exchange, store, cycles = _run(use_order_store)
+
+    assert cycles == (24 * 60 - 1) // 60 + 1
+    [summary] = load_ticker_summary()
+    assert summary["filled"] > 0
+    assert summary["placed"] == summary["filled"] + len(store.get_pending_orders())
+    store.close()
+
+
+def test_fill_time_uses_replay_clock(use_order_store):
+    exchange, store, _ = _run(use_order_store)
+
+    [summary] = load_ticker_summary()
+    # 벽시계로 재면 몇 밀리초지만, 재생 시각으로는 최소 한 주기(60분) 이상 걸림
+    assert summary["avg_fill_minutes"] >= 60
+    created = store.get_recent_orders(1)[0][6]
+    assert created.year == 2024
+    store.close()
+
+
+def test_orders_lock_balances_until_filled_or_cancelled():
+    exchange = PaperExchange({TICKER: sine_candles()}, krw=100_000, coins={"BTC": 1})
+    sell = exchange.place_limit_order(TICKER, "sell", 11_000, 1)
+    buy = exchange.place_limit_order(TICKER, "buy", 9_000, 5)
+
+    assert exchange.balances["BTC"] == 0 and exchange.locked["BTC"] == 1
+    assert exchange.place_limit_order(TICKER, "sell", 11_000, 1) is None
+    assert exchange.cancel_order(buy["uuid"])
+    assert exchange.balances["KRW"] == 100_000
+
+    exchange.advance(60)
+    assert exchange.check_order_status(sell["uuid"]) == "done"
+    assert exchange.balances["KRW"] == 100_000 + 11_000 * (1 - exchange.fee_rate)
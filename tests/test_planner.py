@@ -0,0 +1,115 @@
+import pytest
+
+from planner import plan_rebalance
+from rebalance_engine import RebalanceConfig
+
+
+def _config(ticker, ratio=0.1, price_ratio=0.05):
+    return RebalanceConfig(ticker, ratio, price_ratio, 1)
+
+
+def test_legs_are_snapped_to_tick_and_sized_from_balance():
+    configs = [_config("KRW-BTC"), _config("KRW-ETH")]
+    balances = {"KRW": 1_000_000, "BTC": 1.0, "ETH": 10.0}
+    prices = {"KRW-BTC": 100_000.0, "KRW-ETH": 10_003.0}
+
+    plan = plan_rebalance(configs, balances, prices)
+
+    btc, eth = plan.orders
+    assert (btc.price, btc.balance, btc.amount) == (100_000.0, 1.0, 0.1)
+    assert btc.legs == {"sell": 105_000, "buy": 95_000}
+    assert btc.buy_cost == pytest.approx(95_000 * 0.1 * 1.0005)
+    # 10_503.15 는 올려서, 9_502.85 는 내려서 호가 단위에 맞춤
+    assert eth.legs == {"sell": 10_510, "buy": 9_502}
+    assert isinstance(eth.legs["sell"], int)
+    assert plan.skipped == {}
+
+
+def test_amount_is_rounded_to_eight_decimals():
+    plan = plan_rebalance(
+        [_config("KRW-BTC", ratio=1 / 3)],
+        {"KRW": 1e9, "BTC": 1.0},
+        {"KRW-BTC": 100_000.0},
+    )
+
+    assert plan.orders[0].amount == 0.33333333
+
+
+def test_given_legs_replace_fixed_ratio_prices():
+    plan = plan_rebalance(
+        [_config("KRW-BTC")],
+        {"KRW": 1e9, "BTC": 1.0},
+        {"KRW-BTC": 100_000.0},
+        legs={"KRW-BTC": {"sell": 101_000.0, "buy": 99_000.0}},
+    )
+
+    assert plan.orders[0].legs == {"sell": 101_000, "buy": 99_000}
+    assert plan.orders[0].buy_cost == pytest.approx(99_000 * 0.1 * 1.0005)
+
+
+def test_krw_is_assigned_in_config_order():
+    configs = [_config("KRW-BTC"), _config("KRW-ETH"), _config("KRW-XRP")]
+    balances = {"KRW": 15_000, "BTC": 1.0, "ETH": 2.0, "XRP": 0.6}
+    prices = {"KRW-BTC": 100_000.0, "KRW-ETH": 100_000.0, "KRW-XRP": 100_000.0}
+
+    plan = plan_rebalance(configs, balances, prices, fee_rate=0)
+
+    # BTC 9_500 배정 후 남은 5_500 으로 ETH(19_000)는 못 사고 XRP(5_700)도 못 삼
+    assert [order.config.ticker for order in plan.orders] == ["KRW-BTC"]
+    event = plan.skipped["KRW-ETH"]
+    assert event.type == "krw_budget_exceeded"
+    assert event.fields["required"] == pytest.approx(19_000)
+    assert event.fields["available"] == pytest.approx(5_500)
+    assert plan.skipped["KRW-XRP"].type == "krw_budget_exceeded"
+    assert (plan.krw_available, plan.krw_planned) == (15_000, pytest.approx(9_500))
+
+
+def test_skipped_ticker_does_not_block_later_tickers():
+    configs = [_config("KRW-ETH"), _config("KRW-BTC")]
+    balances = {"KRW": 10_000, "BTC": 1.0, "ETH": 2.0}
+    prices = {"KRW-BTC": 100_000.0, "KRW-ETH": 100_000.0}
+
+    plan = plan_rebalance(configs, balances, prices, fee_rate=0)
+
+    assert plan.skipped["KRW-ETH"].type == "krw_budget_exceeded"
+    assert [order.config.ticker for order in plan.orders] == ["KRW-BTC"]
+    assert plan.krw_planned == pytest.approx(9_500)
+
+
+def test_orders_below_min_order_are_skipped():
+    configs = [_config("KRW-BTC"), _config("KRW-ETH")]
+    # BTC 매수 5_000.0 은 최소 금액과 같아 통과, ETH 매수 4_750 은 미달
+    balances = {"KRW": 1e9, "BTC": 0.5, "ETH": 0.5}
+    prices = {"KRW-BTC": 100_000.0, "KRW-ETH": 95_000.0}
+
+    plan = plan_rebalance(
+        configs, balances, prices, legs={"KRW-BTC": {"sell": 101_000, "buy": 100_000}}
+    )
+
+    assert [order.config.ticker for order in plan.orders] == ["KRW-BTC"]
+    event = plan.skipped["KRW-ETH"]
+    assert event.type == "below_min_order"
+    assert event.fields["min_order"] == 5_000
+    assert event.fields["sell_notional"] == pytest.approx(99_750 * 0.05)
+    assert event.fields["buy_notional"] == pytest.approx(90_250 * 0.05)
+
+
+def test_missing_or_zero_price_is_skipped():
+    configs = [_config("KRW-BTC"), _config("KRW-ETH")]
+    balances = {"KRW": 1e9, "BTC": 1.0, "ETH": 1.0}
+
+    plan = plan_rebalance(configs, balances, {"KRW-ETH": None})
+
+    assert plan.orders == []
+    assert {ticker: event.type for ticker, event in plan.skipped.items()} == {
+        "KRW-BTC": "price_missing",
+        "KRW-ETH": "price_missing",
+    }
+    assert plan.krw_planned == 0
+
+
+def test_no_configs_returns_empty_plan():
+    plan = plan_rebalance([], {"KRW": 1_000}, {})
+
+    assert (plan.orders, plan.skipped) == ([], {})
+    assert (plan.krw_available, plan.krw_planned) == (1_000, 0)
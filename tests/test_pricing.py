@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pricing import (
+    PRICING_ATR,
+    LegPricer,
+    average_true_range,
+    leg_prices,
+    snap_price,
+    snap_prices,
+    tick_sizes,
+)
+from rebalance_engine import RebalanceConfig
+from utils.candle_store import CandleStore, now_kst
+
+
+class HourlySource:
+    """high=close+range, low=close-range 인 1시간 캔들을 돌려주는 소스"""
+
+    def __init__(self, close=10_000.0, range_=100.0, hours=48, error=None):
+        self.close, self.range, self.hours, self.error = close, range_, hours, error
+        self.calls = 0
+
+    def fetch(self, ticker, interval, to, count):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        index = pd.date_range(end=now_kst().floor("h"), periods=self.hours, freq="h")
+        if to is not None:
+            index = index[index < to]
+        index = index[-count:]
+        close = np.full(len(index), self.close)
+        return pd.DataFrame(
+            {
+                "open": close,
+                "high": close + self.range,
+                "low": close - self.range,
+                "close": close,
+                "volume": close,
+            },
+            index=index,
+        )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "price, tick",
+    [
+        (0.5, 0.0001),
+        (5, 0.001),
+        (50, 0.01),
+        (999, 0.1),
+        (1_000, 1),
+        (15_000, 10),
+        (150_000, 50),
+        (600_000, 100),
+        (1_500_000, 500),
+        (90_000_000, 1_000),
+    ],
+)
+def test_tick_sizes(price, tick):
+    assert tick_sizes([price])[0] == tick
+
+
+def test_snap_prices_rounds_away_from_the_worse_side():
+    prices = [10_001, 10_010, 0.12345, 123.456]
+    assert snap_prices(prices, "sell").tolist() == [10_010, 10_010, 0.1235, 123.5]
+    assert snap_prices(prices, "buy").tolist() == [10_000, 10_010, 0.1234, 123.4]
+
+
+def test_snap_price_returns_int_above_tick_one():
+    assert snap_price(10_501.0, "sell") == 10_510
+    assert isinstance(snap_price(10_501.0, "sell"), int)
+    assert snap_price(0.30000000000000004, "buy") == 0.3
+
+
+def test_leg_prices_ratio_and_offset():
+    assert leg_prices(10_000, 0.05) == {"sell": 10_500, "buy": 9_500}
+    # 10,000 이상은 호가 단위 10, 미만은 1
+    assert leg_prices(10_000, 0.05, offset=123) == {"sell": 10_130, "buy": 9_877}
+
+
+def test_leg_prices_stays_outside_best_quotes():
+    orderbook = {"orderbook_units": [{"ask_price": 10_100, "bid_price": 9_900}]}
+    # 기준가는 중간값(10,000), 가격 차이가 호가 폭보다 작으면 최우선 호가로 제한
+    assert leg_prices(12_345, 0.001, orderbook=orderbook) == {
+        "sell": 10_100,
+        "buy": 9_900,
+    }
+
+
+def test_average_true_range():
+    high = [11, 12, 13]
+    low = [9, 10, 11]
+    close = [10, 11, 12]
+    # 실제 범위: max(12-10, |12-10|, |10-10|)=2, max(13-11, |13-11|, |11-11|)=2
+    assert average_true_range(high, low, close, period=2) == 2.0
+    assert average_true_range(high, low, close, period=3) is None
+
+
+def _pricer(tmp_path, source, log, clock=None):
+    return LegPricer(
+        CandleStore(str(tmp_path), source), log=log, clock=clock or FakeClock()
+    )
+
+
+ATR_CONFIG = RebalanceConfig(
+    "KRW-BTC", 0.1, 0.05, 1, pricing=PRICING_ATR, atr_multiplier=2.0
+)
+
+
+def test_atr_quote_refreshes_candles_once_per_interval(tmp_path):
+    source, clock, events = HourlySource(), FakeClock(), []
+    pricer = _pricer(tmp_path, source, events.append, clock)
+
+    # 저장된 캔들이 없어도 먼저 받아 ATR(200) * 2 만큼 떨어진 가격을 씀
+    assert pricer.quote(None, ATR_CONFIG, 10_000) == {"sell": 10_400, "buy": 9_600}
+    calls = source.calls
+    pricer.quote(None, ATR_CONFIG, 10_000)
+    assert source.calls == calls
+
+    clock.now += pricer.refresh_seconds
+    pricer.quote(None, ATR_CONFIG, 10_000)
+    assert source.calls == calls + 1
+    assert events == []
+
+
+def test_atr_quote_without_candles_logs_fallback(tmp_path):
+    events = []
+    pricer = _pricer(tmp_path, HourlySource(hours=3), events.append)
+
+    assert pricer.quote(None, ATR_CONFIG, 10_000) == {"sell": 10_500, "buy": 9_500}
+    assert [event.type for event in events] == ["pricing_fallback"]
+    assert "5.0%" in str(events[0])
+
+
+def test_atr_refresh_failure_uses_stored_candles(tmp_path):
+    events = []
+    CandleStore(str(tmp_path), HourlySource()).update("KRW-BTC", "minute60", 2)
+    pricer = _pricer(tmp_path, HourlySource(error=OSError("down")), events.append)
+
+    assert pricer.quote(None, ATR_CONFIG, 10_000) == {"sell": 10_400, "buy": 9_600}
+    assert [event.type for event in events] == ["candle_refresh_failed"]
@@ -0,0 +1,97 @@
+import time
+
+import upbit_api
+from rebalance_engine import RebalanceConfig, place_rebalance_pair
+
+CONFIG = RebalanceConfig("KRW-BTC", 0.1, 0.05, 1)
+LEGS = {"sell": 10_500.0, "buy": 9_500.0}
+
+
+def _place(api, events):
+    return place_rebalance_pair(api, events.append, CONFIG, 10_000.0, 100.0, legs=LEGS)
+
+
+def _types(events):
+    return [event.type for event in events]
+
+
+def _open_orders(exchange):
+    return {
+        order["side"]: order
+        for order in exchange.orders.values()
+        if order["state"] == "wait"
+    }
+
+
+def _states(exchange, side):
+    """side 주문 중 최종 상태(취소/체결)에 이른 주문들의 상태"""
+    return [
+        order["state"]
+        for order in exchange.orders.values()
+        if order["side"] == side and order["state"] != "wait"
+    ]
+
+
+def test_both_legs_are_saved(api, exchange, store):
+    events = []
+    assert _place(api, events)
+    assert {row[1] for row in store.get_pending_orders()} == {"sell", "buy"}
+    assert set(_open_orders(exchange)) == {"ask", "bid"}
+    assert "leg_retry" not in _types(events)
+
+
+def test_failed_leg_is_retried(api, server, exchange, store):
+    server.inject("POST", "/v1/orders", status=500, side="buy")
+    events = []
+
+    assert _place(api, events)
+    assert "leg_retry" in _types(events)
+    assert "leg_rollback" not in _types(events)
+    assert {row[1] for row in store.get_pending_orders()} == {"sell", "buy"}
+    assert server.calls[("POST", "/v1/orders")] == 3
+
+
+def test_leg_failing_twice_rolls_back_placed_leg(api, server, exchange, store):
+    server.inject("POST", "/v1/orders", status=500, side="buy", times=2)
+    events = []
+
+    assert not _place(api, events)
+    assert "leg_rollback" in _types(events)
+    assert _open_orders(exchange) == {}
+    # 접수됐던 매도 주문은 취소 상태로 기록되어 미체결 목록에서 빠짐
+    assert store.get_pending_orders() == []
+    assert _states(exchange, "ask") == ["cancel"]
+
+
+def test_failed_cancel_during_rollback_is_reported(api, server, exchange, store):
+    server.inject("POST", "/v1/orders", status=500, side="buy", times=2)
+    server.inject("DELETE", "/v1/order", status=500)
+    events = []
+
+    assert not _place(api, events)
+    assert "leg_cancel_failed" in _types(events)
+    # 취소하지 못한 매도 주문은 다음 동기화에서 확인하도록 미체결로 남김
+    assert [row[1] for row in store.get_pending_orders()] == ["sell"]
+
+
+def test_late_leg_is_cancelled_when_accepted(api, server, exchange, monkeypatch):
+    monkeypatch.setattr(upbit_api, "ORDER_DEADLINE_SECONDS", 0.2)
+    server.inject("POST", "/v1/orders", delay=0.6, side="buy")
+
+    result = api.rebalancing_orders("KRW-BTC", 10_000.0, 1.0, 0.05, prices=LEGS)
+
+    assert result["sell_uuid"] and result["buy_uuid"] is None
+    # 마감 후 접수된 매수 주문은 응답을 받는 즉시 취소됨
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and not _states(exchange, "bid"):
+        time.sleep(0.05)
+    assert _states(exchange, "bid") == ["cancel"]
+    assert set(_open_orders(exchange)) == {"ask"}
+
+
+def test_status_lookup_error_is_unknown(api, server, exchange):
+    order = exchange.place_limit_order("KRW-BTC", "sell", 10_500.0, 1.0)
+    server.inject("GET", "/v1/order", status=500)
+
+    assert api.check_order_status(order["uuid"]) == "unknown"
+    assert api.check_order_status(order["uuid"]) == "wait"
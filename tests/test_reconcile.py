@@ -0,0 +1,74 @@
+import rebalance_engine
+from rebalance_engine import (
+    INTENT_GRACE_SECONDS,
+    RebalanceConfig,
+    RebalanceEngine,
+    _save_legs,
+    reconcile_intents,
+)
+
+ORDER = ("KRW-BTC", "sell", "uuid-1", 10_500.0, 1.0, "wait")
+
+
+def _placed_count(store):
+    return store.get_ticker_stats()[0][1]
+
+
+def test_save_orders_skips_known_uuids(store):
+    store.save_orders([ORDER])
+    store.save_orders([ORDER, ORDER])
+
+    assert store.count_orders() == 1
+    assert len(store.get_pending_orders()) == 1
+    assert _placed_count(store) == 1
+
+
+def test_engine_save_after_reconcile_recovered_the_same_order(api, exchange, store):
+    # 엔진이 의도를 기록하고 주문을 제출한 직후, 다른 세션이 유예 없이 대조한 경우
+    [intent_id] = store.record_intents([("KRW-BTC", "sell", 10_500.0, 1.0)])
+    order = exchange.place_limit_order("KRW-BTC", "sell", 10_500.0, 1.0)
+    assert reconcile_intents(api, lambda event: None) == 1
+
+    order_info = {
+        "sell_uuid": order["uuid"],
+        "sell_price": 10_500.0,
+        "intent_ids": {"sell": intent_id},
+    }
+    _save_legs("KRW-BTC", order_info, ["sell"], 1.0)
+
+    assert store.count_orders() == 1
+    assert _placed_count(store) == 1
+    assert store.get_open_intents() == []
+
+
+def test_grace_period_leaves_in_flight_intents(api, server, store):
+    store.record_intents([("KRW-BTC", "sell", 10_500.0, 1.0)])
+
+    assert reconcile_intents(api, lambda event: None, INTENT_GRACE_SECONDS) == 0
+    # 제출 중인 엔진이 아직 응답을 받지 못했으므로 의도를 버리지 않음
+    assert len(store.get_open_intents()) == 1
+    assert not server.calls
+
+
+def test_restart_within_grace_period_does_not_place_second_pair(
+    api, exchange, store, monkeypatch
+):
+    # 이전 프로세스가 주문을 보낸 직후, 접수를 기록하기 전에 종료된 경우
+    store.record_intents([("KRW-BTC", "sell", 10_500.0, 1.0)])
+    exchange.place_limit_order("KRW-BTC", "sell", 10_500.0, 1.0)
+    events = []
+    engine = RebalanceEngine(
+        api, [RebalanceConfig("KRW-BTC", 0.1, 0.05, 1)], log=events.append
+    )
+
+    engine.run_once(["KRW-BTC"])
+    assert len(exchange.orders) == 1
+    assert "intent_wait" in [event.type for event in events]
+    assert engine._intent_tickers == {"KRW-BTC"}
+
+    # 유예 시간이 지나면 대조로 주문을 찾아 미체결 주문으로 기다림
+    monkeypatch.setattr(rebalance_engine, "INTENT_GRACE_SECONDS", 0)
+    engine.run_once(["KRW-BTC"])
+    assert len(exchange.orders) == 1
+    assert [row[2] for row in store.get_pending_orders()] == ["paper-0"]
+    assert store.get_open_intents() == []
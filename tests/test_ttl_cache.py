@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.ttl_cache import TTLCache
+
+
+def _blocking_loader(values):
+    """started 를 알린 뒤 release 될 때까지 기다렸다가 values 의 다음 값을 반환하는 로더"""
+    started, release = threading.Event(), threading.Event()
+
+    def loader():
+        started.set()
+        release.wait(5)
+        return values.pop(0)
+
+    return loader, started, release
+
+
+def test_concurrent_callers_share_one_load():
+    cache = TTLCache(60)
+    loader, started, release = _blocking_loader(["a"])
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(cache.get_or_load, "k", loader) for _ in range(4)]
+        started.wait(5)
+        release.set()
+        assert [future.result() for future in futures] == ["a"] * 4
+    assert cache.misses == 1
+
+
+@pytest.mark.parametrize(
+    "invalidate", [lambda c: c.invalidate("k"), TTLCache.invalidate]
+)
+def test_invalidate_during_load_discards_loaded_value(invalidate):
+    cache = TTLCache(60)
+    loader, started, release = _blocking_loader(["stale", "fresh"])
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(cache.get_or_load, "k", loader)
+        started.wait(5)
+        invalidate(cache)
+        release.set()
+        # 로드를 시작한 호출자는 자신이 받은 값을 그대로 반환
+        assert future.result() == "stale"
+
+    assert cache.get("k", None) is None
+    assert cache.get_or_load("k", loader) == "fresh"
+    assert cache.get("k") == "fresh"
+
+
+def test_load_after_invalidate_does_not_join_stale_flight():
+    cache = TTLCache(60)
+    stale_loader, started, release = _blocking_loader(["stale"])
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(cache.get_or_load, "k", stale_loader)
+        started.wait(5)
+        cache.invalidate("k")
+        # 무효화 이후의 호출은 진행 중인 이전 로드를 기다리지 않고 새로 로드
+        assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+        release.set()
+        assert future.result() == "stale"
+    assert cache.get("k") == "fresh"
+
+
+def test_loader_error_is_shared_and_not_cached():
+    cache = TTLCache(60)
+
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", failing)
+    assert cache.get_or_load("k", lambda: 1) == 1
+
+
+def test_expired_entry_is_reloaded():
+    cache = TTLCache(0)
+    assert cache.get_or_load("k", lambda: 1) == 1
+    assert cache.get_or_load("k", lambda: 2) == 2
+
+
+def test_concurrent_coroutines_share_one_async_load():
+    cache = TTLCache(60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "a"
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_load_async("k", loader) for _ in range(4))
+        )
+
+    assert asyncio.run(run()) == ["a"] * 4
+    assert len(calls) == 1
+    assert cache.get("k") == "a"
+
+
+def test_async_load_error_is_shared_and_not_cached():
+    cache = TTLCache(60)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise ValueError("down")
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_load_async("k", loader) for _ in range(2)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(run())
+    assert [type(error) for error in errors] == [ValueError, ValueError]
+    assert cache.get("k", None) is None
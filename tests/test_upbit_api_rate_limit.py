@@ -0,0 +1,96 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from upbit_api import (
+    EXCHANGE_GROUP,
+    ORDER_GROUP,
+    QUOTATION_GROUP,
+    RATE_LIMIT_RETRIES,
+)
+from utils.rate_limiter import RequestScheduler, TokenBucket
+
+
+def test_order_is_retried_after_429(api, server):
+    server.inject("POST", "/v1/orders", status=429)
+
+    order = api.place_limit_order("KRW-BTC", "sell", 11_000, 1.0)
+
+    assert order["uuid"] in server.exchange.orders
+    assert server.calls[("POST", "/v1/orders")] == 2
+
+
+def test_status_lookup_is_retried_after_429(api, server):
+    order = api.place_limit_order("KRW-BTC", "buy", 9_000, 1.0)
+    server.inject("GET", "/v1/order", status=429)
+
+    assert api.check_order_status(order["uuid"]) == "wait"
+    assert server.calls[("GET", "/v1/order")] == 2
+
+
+def test_balances_are_retried_after_429(api, server):
+    server.inject("GET", "/v1/accounts", status=429)
+
+    balances = api.get_balances_by_currency()
+
+    assert balances["KRW"] == 10_000_000
+    assert server.calls[("GET", "/v1/accounts")] == 2
+
+
+def test_order_gives_up_after_retries(api, server):
+    server.inject("POST", "/v1/orders", status=429, times=RATE_LIMIT_RETRIES + 1)
+
+    assert api.place_limit_order("KRW-BTC", "sell", 11_000, 1.0) is None
+    assert server.calls[("POST", "/v1/orders")] == RATE_LIMIT_RETRIES + 1
+    assert not server.exchange.orders
+
+
+def test_stress_against_enforced_limits(make_api, server):
+    # 클라이언트 버킷을 서버 한도보다 넉넉하게 잡아 429 를 유도
+    scheduler = RequestScheduler(
+        {
+            ORDER_GROUP: TokenBucket(40),
+            EXCHANGE_GROUP: TokenBucket(100),
+            QUOTATION_GROUP: TokenBucket(100),
+        }
+    )
+    api = make_api(cache_ttl=0, scheduler=scheduler)
+    orders = 24
+    lookups = 20
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        placed = list(
+            pool.map(
+                lambda i: api.place_limit_order("KRW-BTC", "sell", 11_000 + i, 1.0),
+                range(orders),
+            )
+        )
+        statuses = list(
+            pool.map(lambda o: api.check_order_status(o["uuid"]), placed * 2)
+        )
+        prices = list(
+            pool.map(lambda _: api.get_current_prices(["KRW-BTC"]), range(lookups))
+        )
+    elapsed = time.monotonic() - started
+
+    assert all(order and order["uuid"] for order in placed)
+    assert len(server.exchange.orders) == orders
+    assert statuses == ["wait"] * orders * 2
+    assert all(price == {"KRW-BTC": 10_000.0} for price in prices)
+    # 서버가 실제로 한도를 강제했고, 클라이언트는 429 후 재시도로 모두 성공
+    assert sum(server.rejected.values()) > 0
+    # 주문 그룹(초당 8건)을 지키려면 24건에 최소 2초 가까이 걸림
+    assert elapsed >= (orders - 8) / 8 * 0.9
+
+
+def test_matching_buckets_stay_under_server_limits(api, server):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        placed = list(
+            pool.map(
+                lambda i: api.place_limit_order("KRW-ETH", "buy", 9_000 - i, 1.0),
+                range(12),
+            )
+        )
+
+    assert all(order and order["uuid"] for order in placed)
+    assert server.rejected["order"] <= 2
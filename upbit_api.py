@@ -1,57 +1,361 @@
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
 import pyupbit
+import requests
+
+from pricing import leg_prices
+from utils.rate_limiter import (
+    PRIORITY_ORDER,
+    PRIORITY_QUERY,
+    RequestScheduler,
+    TokenBucket,
+)
+from utils.metrics import timed
+from utils.ttl_cache import TTLCache
+
+# 주문 목록 조회(/v1/orders) 한 페이지당 최대 건수
+ORDER_PAGE_LIMIT = 100
+# 종료된 주문은 최근 N 페이지까지만 조회하고, 나머지는 개별 조회로 처리
+CLOSED_ORDER_MAX_PAGES = 3
+# 잔고/현재가 캐시 유지 시간(초)
+DEFAULT_CACHE_TTL = 3
+BALANCES_CACHE_KEY = "balances"
+PRICE_CACHE_KEY = "price"
+
+API_URL = "https://api.upbit.com"
+REQUEST_TIMEOUT = 10
+REMAINING_REQ_PATTERN = re.compile(r"group=([a-z\-]+); min=([0-9]+); sec=([0-9]+)")
+SIDE_TO_UPBIT = {"sell": "ask", "buy": "bid"}
+
+# Upbit 요청 수 제한 그룹과 초당 허용 요청 수
+ORDER_GROUP = "order"  # 주문 생성/취소
+EXCHANGE_GROUP = "exchange"  # 잔고/주문 조회 등 나머지 Exchange API
+QUOTATION_GROUP = "quotation"  # 현재가 등 Quotation API
+RATE_LIMITS_PER_SEC = {ORDER_GROUP: 8, EXCHANGE_GROUP: 30, QUOTATION_GROUP: 10}
+# 429 응답을 받았을 때 재시도 횟수
+RATE_LIMIT_RETRIES = 2
+# 주문 쌍 제출 시 두 주문의 응답을 함께 기다리는 최대 시간(초)
+ORDER_DEADLINE_SECONDS = 5
+ORDER_POOL_WORKERS = 4
+
+
+def parse_remaining_req(header):
+    """Remaining-Req 헤더("group=order; min=59; sec=7")를 {'group', 'min', 'sec'} 로 바꿉니다."""
+    matched = REMAINING_REQ_PATTERN.search(header or "")
+    if matched is None:
+        return None
+    return {
+        "group": matched.group(1),
+        "min": int(matched.group(2)),
+        "sec": int(matched.group(3)),
+    }
+
+
+def create_request_scheduler():
+    return RequestScheduler(
+        {group: TokenBucket(rate) for group, rate in RATE_LIMITS_PER_SEC.items()}
+    )
 
 
 class UpbitAPI:
-    def __init__(self, access_key, secret_key):
+    def __init__(
+        self,
+        access_key,
+        secret_key,
+        cache_ttl=DEFAULT_CACHE_TTL,
+        scheduler=None,
+        base_url=API_URL,
+    ):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.base_url = base_url.rstrip("/")
+        # JWT 인증 헤더 생성에만 사용
         self.upbit = pyupbit.Upbit(access_key, secret_key)
+        # 모든 요청이 keep-alive 연결을 재사용하도록 세션 하나를 공유
+        self._session = requests.Session()
+        # 잔고/현재가 조회 결과를 UI 와 루프 스레드가 함께 쓰는 캐시
+        self.cache = TTLCache(cache_ttl)
+        # 모든 요청은 이 스케줄러를 거쳐 요청 수 제한을 지킴
+        self.scheduler = scheduler or create_request_scheduler()
+        # 매도/매수 주문을 동시에 제출하기 위한 워커
+        self._order_pool = ThreadPoolExecutor(
+            max_workers=ORDER_POOL_WORKERS, thread_name_prefix="upbit-order"
+        )
+        self._local = threading.local()
+
+    @contextmanager
+    def request_priority(self, priority):
+        """현재 스레드에서 호출하는 조회 요청의 우선순위를 지정합니다."""
+        previous = getattr(self._local, "priority", PRIORITY_QUERY)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def _request(
+        self, group, method, path, params=None, body=None, auth=True, priority=None
+    ):
+        """요청 한도 스케줄러를 거쳐 Upbit REST API 를 호출하고 JSON 응답을 반환합니다.
+
+        pyupbit.Upbit 의 주문/조회 메서드는 429 를 포함한 모든 예외를 삼키고 None 을
+        반환하므로 재시도할 수 없어, 요청은 직접 보내고 서명만 pyupbit 에 맡깁니다.
+        GET/DELETE 는 params 를 쿼리 문자열로, POST 는 body 를 JSON 으로 보냅니다.
+        429 응답이면 버킷을 비우고 재시도하며, 그 밖의 오류 응답은 requests.HTTPError 로
+        올립니다. 정상 응답의 Remaining-Req 헤더로 버킷을 보정합니다.
+        """
+        if priority is None:
+            priority = getattr(self._local, "priority", PRIORITY_QUERY)
+        url = f"{self.base_url}{path}"
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.scheduler.acquire(group, priority)
+            headers = self.upbit._request_headers(params or body) if auth else {}
+            with timed("upbit_request_seconds", method=f"{method} {path}"):
+                response = self._session.request(
+                    method,
+                    url,
+                    params=params,
+                    json=body,
+                    headers=headers,
+                    timeout=REQUEST_TIMEOUT,
+                )
+            if response.status_code == 429:
+                self.scheduler.drain(group)
+                if attempt == RATE_LIMIT_RETRIES:
+                    response.raise_for_status()
+                continue
+            response.raise_for_status()
+            self.scheduler.sync_remaining(
+                group, parse_remaining_req(response.headers.get("Remaining-Req"))
+            )
+            return response.json()
+
+    def _get_balances(self):
+        return self.cache.get_or_load(
+            BALANCES_CACHE_KEY,
+            lambda: self._request(EXCHANGE_GROUP, "GET", "/v1/accounts"),
+        )
+
+    def invalidate_balances(self):
+        """주문 등으로 잔고가 바뀌었을 때 캐시된 잔고를 버립니다."""
+        self.cache.invalidate(BALANCES_CACHE_KEY)
 
     def get_krw_balance(self):
-        balances = self.upbit.get_balances()
-        for balance in balances:
-            if balance["currency"] == "KRW":
-                return float(balance["balance"])
-        return 0
+        return self.get_balances_by_currency().get("KRW", 0)
 
     def get_balance(self, ticker):
         currency = ticker.split("-")[1]
-        balances = self.upbit.get_balances()
-        for balance in balances:
-            if balance["currency"] == currency:
-                return float(balance["balance"])
-        return 0
+        return self.get_balances_by_currency().get(currency, 0)
+
+    def get_balances_by_currency(self):
+        """한 번의 잔고 조회로 {currency: balance} 스냅샷을 반환합니다."""
+        balances = self._get_balances()
+        return {b["currency"]: float(b["balance"]) for b in balances}
+
+    def get_current_price(self, ticker):
+        return self.cache.get_or_load(
+            (PRICE_CACHE_KEY, ticker),
+            lambda: self._fetch_tickers([ticker]).get(ticker),
+        )
+
+    def _fetch_tickers(self, tickers):
+        result = self._request(
+            QUOTATION_GROUP,
+            "GET",
+            "/v1/ticker",
+            params={"markets": ",".join(tickers)},
+            auth=False,
+        )
+        return {item["market"]: item["trade_price"] for item in result}
+
+    def get_current_prices(self, tickers):
+        """여러 티커의 현재가를 조회해 {ticker: price} 로 반환합니다.
+
+        캐시에 없는 티커만 모아 한 번의 요청으로 조회합니다.
+        """
+        prices = {}
+        missing = []
+        for ticker in tickers:
+            price = self.cache.get((PRICE_CACHE_KEY, ticker), None)
+            if price is None:
+                missing.append(ticker)
+            else:
+                prices[ticker] = price
+        if missing:
+            prices.update(self.fetch_current_prices(missing))
+        return prices
+
+    def fetch_current_prices(self, tickers):
+        """캐시를 거치지 않고 tickers 의 현재가를 한 번의 요청으로 조회합니다.
+
+        자체 주기로 조회하는 시세 허브(MarketDataHub)용이며, 결과는 캐시에도 넣습니다.
+        """
+        fetched = self._fetch_tickers(tickers)
+        for ticker, price in fetched.items():
+            self.cache.set((PRICE_CACHE_KEY, ticker), price)
+        return fetched
+
+    def get_orderbook(self, ticker):
+        result = self._request(
+            QUOTATION_GROUP,
+            "GET",
+            "/v1/orderbook",
+            params={"markets": ticker},
+            auth=False,
+        )
+        return result[0] if result else None
 
     def get_tickers(self):
-        balances = self.upbit.get_balances()
+        balances = self._get_balances()
         return [f"KRW-{b['currency']}" for b in balances if b["currency"] != "KRW"]
 
-    def rebalancing_orders(self, ticker, price, amount, ratio):
-        # KRW 마켓은 주문 가격이 반드시 정수여야 함
-        sell_price = int(round(price * (1 + ratio)))
-        buy_price = int(round(price * (1 - ratio)))
-        sell_order = self.upbit.sell_limit_order(ticker, sell_price, amount)
-        print(f"[DEBUG] sell_order 응답: {sell_order}")
-        buy_order = self.upbit.buy_limit_order(ticker, buy_price, amount)
-        print(f"[DEBUG] buy_order 응답: {buy_order}")
-        sell_uuid = sell_order.get("uuid") if isinstance(sell_order, dict) else None
-        buy_uuid = buy_order.get("uuid") if isinstance(buy_order, dict) else None
-        return {
-            "sell_price": sell_price,
-            "buy_price": buy_price,
-            "sell_uuid": sell_uuid,
-            "buy_uuid": buy_uuid,
-            "sell_order_raw": sell_order,
-            "buy_order_raw": buy_order,
+    def place_limit_order(self, ticker, side, price, amount):
+        """지정가 주문 하나를 제출하고 주문 응답(dict) 또는 실패 시 None 을 반환합니다."""
+        body = {
+            "market": ticker,
+            "side": SIDE_TO_UPBIT[side],
+            "volume": str(amount),
+            "price": str(price),
+            "ord_type": "limit",
         }
+        try:
+            order = self._request(
+                ORDER_GROUP, "POST", "/v1/orders", body=body, priority=PRIORITY_ORDER
+            )
+        except requests.RequestException:
+            order = None
+        self.invalidate_balances()
+        return order
+
+    def cancel_order(self, uuid):
+        """주문을 취소하고 취소 요청이 받아들여졌는지 반환합니다."""
+        try:
+            result = self._request(
+                ORDER_GROUP,
+                "DELETE",
+                "/v1/order",
+                params={"uuid": uuid},
+                priority=PRIORITY_ORDER,
+            )
+        except requests.RequestException:
+            result = None
+        self.invalidate_balances()
+        return isinstance(result, dict) and bool(result.get("uuid"))
+
+    def rebalancing_orders(self, ticker, price, amount, ratio, prices=None):
+        """매도/매수 주문을 동시에 제출하고 공통 마감 시간까지 응답을 기다립니다.
+
+        prices({"sell", "buy"})를 주지 않으면 현재가 ± ratio 를 호가 단위에 맞춰 사용합니다.
+        마감 시간 안에 응답하지 않았거나 실패한 주문은 uuid 가 None 으로 반환되며
+        (재시도/취소와 기록은 호출자가 담당), 마감 후 접수된 주문은 자동으로 취소됩니다.
+        """
+        if prices is None:
+            prices = leg_prices(price, ratio)
+        futures = {
+            side: self._order_pool.submit(
+                self.place_limit_order, ticker, side, leg_price, amount
+            )
+            for side, leg_price in prices.items()
+        }
+        wait(futures.values(), timeout=ORDER_DEADLINE_SECONDS)
+
+        result = {}
+        for side, future in futures.items():
+            order = None
+            if not future.done():
+                future.add_done_callback(self._cancel_late_order)
+            elif future.exception() is None:
+                order = future.result()
+            result[f"{side}_price"] = prices[side]
+            result[f"{side}_uuid"] = (
+                order.get("uuid") if isinstance(order, dict) else None
+            )
+            result[f"{side}_order_raw"] = order
+        return result
+
+    def _cancel_late_order(self, future):
+        if future.exception() is None and isinstance(future.result(), dict):
+            uuid = future.result().get("uuid")
+            if uuid:
+                self.cancel_order(uuid)
 
     def check_order_status(self, uuid):
         if not uuid:
-            print("[DEBUG] check_order_status: uuid is None or empty, return 'unknown'")
             return "unknown"
-        order = self.upbit.get_order(uuid)
-        print(f"[DEBUG] check_order_status: get_order({uuid}) => {order}")
+        try:
+            order = self._request(
+                EXCHANGE_GROUP, "GET", "/v1/order", params={"uuid": uuid}
+            )
+        except requests.RequestException:
+            return "unknown"
         if isinstance(order, dict):
-            status = order.get("state", "unknown")
-            print(f"[DEBUG] check_order_status: status={status}")
-            return status
-        print("[DEBUG] check_order_status: order is not dict, return 'unknown'")
+            return order.get("state", "unknown")
         return "unknown"
+
+    def check_order_statuses(self, orders):
+        """여러 주문의 상태를 티커별 주문 목록 조회로 한 번에 확인합니다.
+
+        orders 는 (ticker, uuid) 목록이며, {uuid: status} 를 반환합니다.
+        미체결(wait) 주문과 최근 종료(done/cancel) 주문을 페이지 단위로 조회해
+        대조하고, 목록에서 찾지 못한 주문만 개별 조회합니다.
+        """
+        remaining_by_ticker = defaultdict(set)
+        for ticker, uuid in orders:
+            if uuid:
+                remaining_by_ticker[ticker].add(uuid)
+
+        statuses = {}
+        for ticker, remaining in remaining_by_ticker.items():
+            for state in ("wait", "done", "cancel"):
+                max_pages = None if state == "wait" else CLOSED_ORDER_MAX_PAGES
+                self._match_order_pages(ticker, state, remaining, statuses, max_pages)
+                if not remaining:
+                    break
+            # 목록 조회로 찾지 못한 주문은 개별 조회
+            for uuid in remaining:
+                statuses[uuid] = self.check_order_status(uuid)
+        return statuses
+
+    def _match_order_pages(self, ticker, state, remaining, statuses, max_pages):
+        for page in self._iter_order_pages(ticker, state, max_pages):
+            for order in page:
+                uuid = order.get("uuid")
+                if uuid in remaining:
+                    statuses[uuid] = order.get("state", "unknown")
+                    remaining.discard(uuid)
+            if not remaining:
+                return
+
+    def get_orders(self, ticker, state="wait", max_pages=None):
+        """티커의 state 상태 주문 목록을 최신순으로 최대 max_pages 페이지까지 조회합니다."""
+        return [
+            order
+            for page in self._iter_order_pages(ticker, state, max_pages)
+            for order in page
+        ]
+
+    def _iter_order_pages(self, ticker, state, max_pages):
+        page = 1
+        while max_pages is None or page <= max_pages:
+            result = self._request(
+                EXCHANGE_GROUP,
+                "GET",
+                "/v1/orders",
+                params={
+                    "market": ticker,
+                    "state": state,
+                    "page": page,
+                    "limit": ORDER_PAGE_LIMIT,
+                    "order_by": "desc",
+                },
+            )
+            if not isinstance(result, list):
+                return
+            yield result
+            if len(result) < ORDER_PAGE_LIMIT:
+                return
+            page += 1
@@ -0,0 +1,181 @@
+import argparse
+import os
+from datetime import datetime, timedelta
+from typing import Protocol
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyupbit
+
+from utils.common_utils import load_config
+
+CANDLE_COLUMNS = ["open", "high", "low", "close", "volume"]
+# Upbit 캔들 조회 1회 최대 건수
+FETCH_PAGE_SIZE = 200
+# 저장소의 시각은 pyupbit 캔들 인덱스와 같은 시간대 정보 없는 KST
+KST_OFFSET = timedelta(hours=9)
+
+
+def now_kst() -> pd.Timestamp:
+    return pd.Timestamp.now("Asia/Seoul").tz_localize(None)
+
+
+class CandleSource(Protocol):
+    """to 시각(KST) 이전의 캔들을 최대 count 개 반환하는 데이터 소스 (인덱스도 KST)"""
+
+    def fetch(
+        self, ticker: str, interval: str, to: datetime | None, count: int
+    ) -> pd.DataFrame: ...
+
+
+class PyupbitCandleSource:
+    """pyupbit.get_ohlcv 로 Upbit 에서 캔들을 가져오는 기본 소스
+
+    pyupbit 는 KST 인덱스를 돌려주지만 시간대 없는 to 는 Upbit 가 UTC 로 해석하므로,
+    to 를 UTC 로 바꿔 전달합니다.
+    """
+
+    def fetch(
+        self, ticker: str, interval: str, to: datetime | None, count: int
+    ) -> pd.DataFrame:
+        if to is not None:
+            to = pd.Timestamp(to) - KST_OFFSET
+        df = pyupbit.get_ohlcv(ticker, interval=interval, count=count, to=to)
+        return df if df is not None else pd.DataFrame(columns=CANDLE_COLUMNS)
+
+
+class CandleStore:
+    """티커/간격별 OHLCV 를 Arrow IPC(Feather v2) 파일로 보관하는 로컬 캔들 저장소
+
+    압축하지 않은 Arrow 파일은 메모리 매핑만으로 열 수 있어, load_arrays 는
+    파일을 복사하지 않는 NumPy 배열을 돌려줍니다.
+    """
+
+    def __init__(self, base_folder: str, source: CandleSource | None = None):
+        self.base_folder = base_folder
+        self.source = source or PyupbitCandleSource()
+
+    @classmethod
+    def from_config(cls, conf_file: str = "config.yaml", source=None):
+        config = load_config(conf_file)
+        return cls(os.path.join(config["intermediate_base_folder"], "candles"), source)
+
+    def path(self, ticker: str, interval: str) -> str:
+        return os.path.join(self.base_folder, f"{ticker}_{interval}.arrow")
+
+    def last_timestamp(self, ticker: str, interval: str) -> pd.Timestamp | None:
+        arrays = self.load_arrays(ticker, interval)
+        if arrays is None or not len(arrays["timestamp"]):
+            return None
+        return pd.Timestamp(arrays["timestamp"][-1])
+
+    def update(self, ticker: str, interval: str = "minute1", days_ago: int = 30):
+        """마지막 저장 시각 이후의 캔들만 받아 저장하고, 새로 추가된 건수를 반환합니다.
+
+        마지막으로 저장한 캔들은 받을 당시 아직 만들어지는 중이었을 수 있으므로
+        그 시각부터 다시 받아 덮어씁니다. 저장된 데이터가 없으면 days_ago 일 전부터
+        받습니다. 소스가 더 이전 캔들을 돌려주지 않으면(페이지가 과거로 진행하지
+        않으면) 거기서 멈춥니다.
+        """
+        last = self.last_timestamp(ticker, interval)
+        since = last if last is not None else now_kst() - timedelta(days_ago)
+
+        pages = []
+        to = None
+        while True:
+            page = self.source.fetch(ticker, interval, to, FETCH_PAGE_SIZE)
+            if page is None or page.empty:
+                break
+            earliest = page.index.min()
+            if to is not None and earliest >= to:
+                break
+            pages.append(page)
+            if earliest <= since or len(page) < FETCH_PAGE_SIZE:
+                break
+            to = earliest
+
+        if not pages:
+            return 0
+        new = pd.concat(pages)[CANDLE_COLUMNS]
+        new = new[~new.index.duplicated()].sort_index()
+        new = new[new.index >= since]
+        if new.empty:
+            return 0
+
+        existing = self.load_frame(ticker, interval)
+        combined = (
+            new
+            if existing is None
+            else pd.concat([existing[existing.index < new.index[0]], new])
+        )
+        self._write(ticker, interval, combined)
+        return len(new) if last is None else int((new.index > last).sum())
+
+    def _write(self, ticker: str, interval: str, df: pd.DataFrame):
+        os.makedirs(self.base_folder, exist_ok=True)
+        table = pa.table(
+            {
+                "timestamp": df.index.values.astype("datetime64[ns]"),
+                **{col: df[col].to_numpy(np.float64) for col in CANDLE_COLUMNS},
+            }
+        )
+        path = self.path(ticker, interval)
+        tmp_path = f"{path}.tmp"
+        # 메모리 매핑 중인 독자가 있어도 안전하도록 임시 파일에 쓴 뒤 교체
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+
+    def load_arrays(self, ticker: str, interval: str) -> dict[str, np.ndarray] | None:
+        """저장된 캔들을 메모리 매핑된 읽기 전용 NumPy 배열 딕셔너리로 반환합니다."""
+        path = self.path(ticker, interval)
+        if not os.path.exists(path):
+            return None
+        # 반환한 배열이 매핑을 참조하므로 파일을 명시적으로 닫지 않음
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        return {
+            name: (
+                table.column(name).chunk(0).to_numpy(zero_copy_only=True)
+                if table.column(name).num_chunks == 1
+                else table.column(name).to_numpy()
+            )
+            for name in table.column_names
+        }
+
+    def load_frame(self, ticker: str, interval: str) -> pd.DataFrame | None:
+        arrays = self.load_arrays(ticker, interval)
+        if arrays is None:
+            return None
+        index = pd.DatetimeIndex(arrays.pop("timestamp"))
+        return pd.DataFrame(arrays, index=index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upbit 캔들을 캔들 저장소에 받기")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument(
+        "--ticker", nargs="+", help="config.yaml 의 optimizer.tickers 대신 사용"
+    )
+    parser.add_argument(
+        "--interval", help="config.yaml 의 optimizer.interval 대신 사용"
+    )
+    parser.add_argument(
+        "--days-ago", type=int, help="저장된 캔들이 없을 때 받을 기간(일)"
+    )
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    optimizer = config.get("optimizer", {})
+    interval = args.interval or optimizer.get("interval", "minute1")
+    days_ago = args.days_ago or config.get("days_ago", 30)
+    store = CandleStore.from_config(args.config)
+    for ticker in args.ticker or optimizer.get("tickers", []):
+        added = store.update(ticker, interval, days_ago)
+        print(
+            f"[{ticker}] {interval} 캔들 {added:,}개 추가 -> {store.path(ticker, interval)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -19,3 +19,17 @@ def save_to_json(file_path, data):
 def load_from_json(file_path):
     with open(file_path, 'r') as json_file:
         return json.load(json_file)
+
+
+def append_jsonl(file_path, records):
+    with open(file_path, 'a', encoding='utf-8') as jsonl_file:
+        for record in records:
+            jsonl_file.write(json.dumps(record, default=custom_default, ensure_ascii=False))
+            jsonl_file.write('\n')
+
+
+def load_jsonl(file_path):
+    with open(file_path, 'r', encoding='utf-8') as jsonl_file:
+        for line in jsonl_file:
+            if line.strip():
+                yield json.loads(line)
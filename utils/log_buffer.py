@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+# 심각도 필터에서 사용하는 레벨 이름과 메시지 접두어
+LEVELS = {"INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+_LEVEL_MARKERS = (("[오류]", logging.ERROR), ("[경고]", logging.WARNING))
+
+
+def infer_level(message) -> int:
+    """level 속성이 있으면 그대로 쓰고, 문자열이면 [오류]/[경고] 표시로 심각도를 추정합니다."""
+    level = getattr(message, "level", None)
+    if level is not None:
+        return level
+    message = str(message)
+    for marker, level in _LEVEL_MARKERS:
+        if marker in message:
+            return level
+    return logging.INFO
+
+
+class LogBuffer:
+    """최근 capacity 건만 메모리에 유지하고, 밀려난 로그는 회전 로그 파일에 기록하는 버퍼"""
+
+    def __init__(
+        self,
+        capacity: int,
+        spill_path: str | None = None,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+    ):
+        self.capacity = capacity
+        # 메시지는 구조화된 이벤트일 수 있으므로 화면/파일에 쓸 때만 문자열로 변환
+        self._entries: deque[tuple[float, int, object]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._spill = None
+        if spill_path:
+            os.makedirs(os.path.dirname(spill_path) or ".", exist_ok=True)
+            self._spill = logging.getLogger(f"log_buffer.{spill_path}")
+            self._spill.propagate = False
+            if not self._spill.handlers:
+                handler = RotatingFileHandler(
+                    spill_path,
+                    maxBytes=max_bytes,
+                    backupCount=backup_count,
+                    encoding="utf-8",
+                )
+                handler.setFormatter(
+                    logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+                )
+                self._spill.addHandler(handler)
+                self._spill.setLevel(logging.DEBUG)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def extend(self, messages):
+        now = time.time()
+        new_entries = [(now, infer_level(m), m) for m in messages]
+        with self._lock:
+            overflow = len(self._entries) + len(new_entries) - self.capacity
+            # 밀려날 항목만 앞에서 꺼내므로 비용은 capacity 가 아니라 추가 건수에 비례
+            evicted = [
+                self._entries.popleft()
+                for _ in range(min(max(overflow, 0), len(self._entries)))
+            ]
+            self._entries.extend(new_entries)
+        if overflow > len(evicted):
+            # 한 번에 capacity 보다 많이 들어오면 새 로그 일부도 바로 밀려남
+            evicted += new_entries[: overflow - len(evicted)]
+        self._write_spill(evicted)
+
+    def _write_spill(self, entries):
+        if not self._spill:
+            return
+        for _, level, message in entries:
+            self._spill.log(level, "%s", message)
+
+    def tail(self, limit: int | None = None, min_level: int = logging.INFO):
+        """min_level 이상인 로그를 최신순으로 최대 limit 건 반환합니다."""
+        with self._lock:
+            entries = list(self._entries)
+        result = []
+        for entry in reversed(entries):
+            if entry[1] >= min_level:
+                result.append(entry)
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    def render_text(self, limit: int | None = None, min_level: int = logging.INFO):
+        """tail 결과를 화면에 한 번에 그릴 수 있는 하나의 문자열로 합칩니다."""
+        return "\n".join(str(message) for _, _, message in self.tail(limit, min_level))
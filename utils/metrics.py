@@ -0,0 +1,168 @@
+import bisect
+import copy
+import threading
+import time
+from contextlib import ContextDecorator
+
+# 지연 시간 히스토그램 버킷 경계(초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """고정 버킷에 관측값을 누적하는 히스토그램 (관측 1회는 이진 탐색 한 번)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한으로 근사한 분위수 (마지막 버킷을 넘으면 inf)"""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return 0.0
+        target = q * total
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+
+class Gauge:
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class MetricsRegistry:
+    """이름과 레이블 조합별 히스토그램/게이지를 보관하고 Prometheus 텍스트로 내보내는 저장소"""
+
+    def __init__(self):
+        self._histograms: dict[tuple, Histogram] = {}
+        self._gauges: dict[tuple, Gauge] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        return histogram
+
+    def gauge(self, name: str, **labels) -> Gauge:
+        key = (name, tuple(sorted(labels.items())))
+        gauge = self._gauges.get(key)
+        if gauge is None:
+            with self._lock:
+                gauge = self._gauges.setdefault(key, Gauge())
+        return gauge
+
+    def timed(self, name: str, **labels) -> "timed":
+        return timed(name, registry=self, **labels)
+
+    def _items(self):
+        # 다른 스레드가 새 지표를 등록하는 중에도 안전하게 순회하도록 복사
+        with self._lock:
+            return sorted(self._histograms.items()), sorted(self._gauges.items())
+
+    def snapshot(self):
+        """화면 표시용으로 히스토그램별 건수, 평균, 근사 p50/p95 를 반환합니다."""
+        histograms, gauges = self._items()
+        rows = []
+        for (name, labels), histogram in histograms:
+            count = histogram.count
+            rows.append(
+                {
+                    "metric": name,
+                    "labels": ",".join(f"{k}={v}" for k, v in labels),
+                    "count": count,
+                    "avg_ms": histogram.sum / count * 1000 if count else 0.0,
+                    "p50_ms": histogram.quantile(0.5) * 1000,
+                    "p95_ms": histogram.quantile(0.95) * 1000,
+                }
+            )
+        for (name, labels), gauge in gauges:
+            rows.append(
+                {
+                    "metric": name,
+                    "labels": ",".join(f"{k}={v}" for k, v in labels),
+                    "value": gauge.value,
+                }
+            )
+        return rows
+
+    def render_prometheus(self) -> str:
+        histograms, gauges = self._items()
+        lines = []
+        seen = set()
+        for (name, labels), histogram in histograms:
+            if name not in seen:
+                lines.append(f"# TYPE {name} histogram")
+                seen.add(name)
+            with histogram._lock:
+                counts = list(histogram.counts)
+                total, count = histogram.sum, histogram.count
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = _label_text(labels + (("le", bound),))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{name}_bucket{_label_text(labels + (('le', '+Inf'),))} {count}"
+            )
+            lines.append(f"{name}_sum{_label_text(labels)} {total}")
+            lines.append(f"{name}_count{_label_text(labels)} {count}")
+        for (name, labels), gauge in gauges:
+            if name not in seen:
+                lines.append(f"# TYPE {name} gauge")
+                seen.add(name)
+            lines.append(f"{name}{_label_text(labels)} {gauge.value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        with open(path, "w") as file:
+            file.write(self.render_prometheus())
+
+
+# 프로세스 전체에서 공유하는 기본 저장소
+REGISTRY = MetricsRegistry()
+
+
+class timed(ContextDecorator):
+    """with 블록 또는 데코레이트한 함수의 실행 시간을 히스토그램에 기록합니다."""
+
+    def __init__(self, name: str, registry: MetricsRegistry = REGISTRY, **labels):
+        self.histogram = registry.histogram(name, **labels)
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓸 때 호출마다 시작 시각을 따로 보관하도록 복사본 사용
+        return copy.copy(self)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self._start)
+        return False
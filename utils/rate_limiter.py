@@ -0,0 +1,114 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable
+
+# 숫자가 작을수록 먼저 처리
+PRIORITY_ORDER = 0
+PRIORITY_QUERY = 1
+PRIORITY_UI = 2
+
+
+class TokenBucket:
+    """초당 rate 개씩 채워지는 토큰 버킷 (잠금은 RequestScheduler 가 담당)"""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """토큰을 하나 가져오면 0, 부족하면 다음 토큰까지 남은 시간(초)을 반환합니다."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def sync_remaining(self, remaining: int):
+        """서버가 알려준 초당 잔여 요청 수보다 많은 토큰은 버립니다."""
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+
+    def drain(self):
+        """429 응답 등으로 한도를 넘긴 경우 1초 동안 요청을 멈추도록 토큰을 비웁니다.
+
+        동시에 진행 중이던 요청들이 잇달아 429 를 받아도 대기 시간이 누적되지 않습니다.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, -self.rate)
+
+
+class RequestScheduler:
+    """요청 그룹별 토큰 버킷과 우선순위 대기열로 API 호출 속도를 제한하는 스케줄러
+
+    같은 그룹에서 토큰을 기다리는 요청은 priority 가 작은 순서(같으면 도착 순)로 통과합니다.
+    """
+
+    def __init__(self, buckets: dict[str, TokenBucket]):
+        self.buckets = buckets
+        self._waiters: dict[str, list[tuple[int, int]]] = {
+            group: [] for group in buckets
+        }
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def acquire(self, group: str, priority: int = PRIORITY_QUERY):
+        bucket = self.buckets[group]
+        waiters = self._waiters[group]
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(waiters, ticket)
+            # 새 요청이 더 높은 우선순위일 수 있으므로 대기 중인 요청들이 순서를 다시 확인
+            self._cond.notify_all()
+            try:
+                while True:
+                    if waiters[0] == ticket:
+                        wait_time = bucket.reserve()
+                        if wait_time == 0:
+                            return
+                        self._cond.wait(wait_time)
+                    else:
+                        self._cond.wait()
+            finally:
+                waiters.remove(ticket)
+                heapq.heapify(waiters)
+                self._cond.notify_all()
+
+    def try_acquire(self, group: str) -> bool:
+        """기다리는 요청이 없고 토큰이 남아 있을 때만 바로 토큰을 가져옵니다."""
+        with self._cond:
+            if self._waiters[group]:
+                return False
+            return self.buckets[group].reserve() == 0
+
+    def sync_remaining(self, group: str, remaining_req: dict | None):
+        """Remaining-Req 헤더를 파싱한 {'group', 'min', 'sec'} 로 버킷을 보정합니다."""
+        if not remaining_req or "sec" not in remaining_req:
+            return
+        with self._cond:
+            self.buckets[group].sync_remaining(remaining_req["sec"])
+
+    def drain(self, group: str):
+        with self._cond:
+            self.buckets[group].drain()
+
+    def call(
+        self,
+        group: str,
+        priority: int,
+        fn: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        self.acquire(group, priority)
+        return fn(*args, **kwargs)
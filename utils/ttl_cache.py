@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+_MISSING = object()
+
+
+class _Flight:
+    """진행 중인 로드 하나를 기다리는 호출자들이 공유하는 결과 슬롯"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class TTLCache:
+    """키별 만료 시간(TTL)을 가지는 스레드 안전 캐시
+
+    같은 키를 동시에 요청하면 한 번만 로드하고(single-flight) 나머지는 그 결과를 공유합니다.
+    로드 중에 invalidate() 된 키는 로드 결과를 저장하지 않아, 무효화 이전 값이 되살아나지 않습니다.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._flights: dict[Hashable, _Flight] = {}
+        # get_or_load_async 의 진행 중인 로드 (이벤트 루프의 Future)
+        self._async_flights: dict[Hashable, asyncio.Future] = {}
+        # 무효화 세대: 키별 카운터와 전체 무효화 카운터
+        self._generations: dict[Hashable, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """만료되지 않은 값을 반환하고, 없으면 default 를 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation(key)
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            with self._lock:
+                if self._generation(key) == generation:
+                    self._entries[key] = (time.monotonic() + self.ttl, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                # 무효화 후 시작된 새 로드는 그대로 둠
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    async def get_or_load_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """get_or_load 의 asyncio 버전. loader 는 코루틴을 반환하는 함수입니다.
+
+        같은 이벤트 루프에서 동시에 요청한 코루틴들은 한 번의 로드 결과를 함께 기다리며,
+        기다리는 동안 이벤트 루프를 막지 않습니다.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            flight = self._async_flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = asyncio.get_running_loop().create_future()
+                self._async_flights[key] = flight
+                generation = self._generation(key)
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not is_leader:
+            # 기다리던 코루틴이 취소되어도 공유 결과는 취소하지 않음
+            return await asyncio.shield(flight)
+
+        try:
+            value = await loader()
+            with self._lock:
+                if self._generation(key) == generation:
+                    self._entries[key] = (time.monotonic() + self.ttl, value)
+            flight.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            # 기다리는 코루틴이 없어도 "예외를 읽지 않음" 경고가 나지 않도록 표시
+            flight.exception()
+            raise
+        finally:
+            with self._lock:
+                if self._async_flights.get(key) is flight:
+                    del self._async_flights[key]
+
+    def _generation(self, key: Hashable) -> tuple[int, int]:
+        return self._epoch, self._generations.get(key, 0)
+
+    def invalidate(self, key: Hashable = _MISSING):
+        """key 를 지정하지 않으면 전체를 비웁니다.
+
+        진행 중인 로드는 결과를 저장하지 않으며, 이후 호출은 새로 로드합니다.
+        """
+        with self._lock:
+            if key is _MISSING:
+                self._entries.clear()
+                self._flights.clear()
+                self._async_flights.clear()
+                self._generations.clear()
+                self._epoch += 1
+            else:
+                self._entries.pop(key, None)
+                self._flights.pop(key, None)
+                self._async_flights.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }